@@ -1,16 +1,24 @@
 """Authentication routes matching API spec."""
 
-import logging
-from typing import Annotated
+import asyncio
+from typing import Annotated, Final
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import (
+    get_current_active_user,
+    get_password_reset_service,
+    get_read_user_service,
+    get_refresh_token_service,
+    get_user_service,
+)
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import concurrency_slot
 from app.core.security import (
-    decode_refresh_token,
+    decode_refresh_token_cached,
     generate_tokens,
+    verify_dummy_password,
 )
 from app.models import User, UserStatus
 from app.schemas.user import (
@@ -32,23 +40,87 @@ from app.services.password_reset_service import (
     PasswordResetService,
     UsedTokenError,
 )
-from app.services.user_service import RefreshTokenService, UserService
+from app.services.user_service import RefreshTokenService, UserService, invalidate_user_cache
 
-logger = logging.getLogger(__name__)
+_ACTIVE_STATUS: Final[str] = UserStatus.ACTIVE.value
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+async def _send_password_reset(user_id: str) -> None:
+    """Generate a password reset token for a user and send it.
+
+    Runs as a background task on its own session, since the request session is
+    closed once the response has been sent.
+
+    Args:
+        user_id: User ID
+    """
+    async with AsyncSessionLocal() as session:
+        user = await UserService(session).get_by_id(user_id)
+        if not user:
+            return
+
+        # Generate password reset token
+        _token = await PasswordResetService(session).create_token(user)
+        # TODO: Send email with reset link containing token
+        # In production, integrate with email service (SendGrid, SES, etc.)
+        # reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
+
+
+def _build_auth_response(user: User, access_token: str, refresh_token: str) -> AuthResponse:
+    """Build the login/register response from already-validated server data.
+
+    Uses ``model_construct`` since every value comes from the database or the
+    token generator, so field validation would only repeat work.
+
+    Args:
+        user: Authenticated user
+        access_token: Issued access token
+        refresh_token: Issued refresh token
+
+    Returns:
+        Authentication response with tokens and user data
+    """
+    return AuthResponse.model_construct(
+        accessToken=access_token,
+        refreshToken=refresh_token,
+        user=AuthUserResponse.model_construct(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            avatar=user.avatar,
+            phone=user.phone,
+            status=user.status,
+        ),
+    )
+
+
+async def _update_last_login(user_id: str) -> None:
+    """Update the user's last login timestamp on its own session.
+
+    A separate session lets this run concurrently with writes on the
+    request session (a single connection cannot run two statements at once).
+
+    Args:
+        user_id: User ID
+    """
+    async with AsyncSessionLocal() as session:
+        await UserService(session).update_last_login(user_id)
+
+
 @router.post("/register", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: RegisterRequest,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+    refresh_token_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
 ) -> AuthResponse:
     """Register a new user.
 
     Args:
         user_data: User registration data
-        db: Database session
+        user_service: User service
+        refresh_token_service: Refresh token service
 
     Returns:
         Authentication response with tokens and user data
@@ -56,32 +128,18 @@ async def register(
     Raises:
         HTTPException: If user with email already exists
     """
-    user_service = UserService(db)
-    refresh_token_service = RefreshTokenService(db)
-
     try:
         # Create user
-        user = user_service.create(user_data)
+        user = await user_service.create(user_data)
 
         # Generate tokens
         access_token, refresh_token, expires_at = generate_tokens(user.id, user.email)
 
         # Store refresh token
-        refresh_token_service.create(user.id, refresh_token, expires_at)
+        await refresh_token_service.create(user.id, refresh_token, expires_at)
 
         # Return response
-        return AuthResponse(
-            accessToken=access_token,
-            refreshToken=refresh_token,
-            user=AuthUserResponse(
-                id=user.id,
-                email=user.email,
-                name=user.name,
-                avatar=user.avatar,
-                phone=user.phone,
-                status=user.status,
-            ),
-        )
+        return _build_auth_response(user, access_token, refresh_token)
 
     except ValueError as e:
         raise HTTPException(
@@ -93,40 +151,54 @@ async def register(
 @router.post("/login", response_model=AuthResponse)
 async def login(
     credentials: LoginRequest,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+    refresh_token_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
 ) -> AuthResponse:
     """Login user.
 
     Args:
         credentials: Login credentials
-        db: Database session
+        user_service: User service
+        refresh_token_service: Refresh token service
 
     Returns:
         Authentication response with tokens and user data
 
     Raises:
-        HTTPException: If credentials are invalid or user is not active
+        HTTPException: If credentials are invalid, user is not active, or too many
+            login attempts for the account are already in flight
     """
-    user_service = UserService(db)
-    refresh_token_service = RefreshTokenService(db)
+    # Cap in-flight attempts per account before doing any password hashing
+    async with concurrency_slot(
+        f"login:{credentials.email.lower()}",
+        settings.LOGIN_MAX_CONCURRENT,
+        settings.LOGIN_CONCURRENCY_TTL,
+    ) as acquired:
+        if not acquired:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many concurrent login attempts",
+            )
 
-    # Find user by email
-    user = user_service.get_by_email(credentials.email)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-        )
+        # Find user by email
+        user = await user_service.get_by_email(credentials.email)
+        if not user:
+            # Still pay for a hash verification so missing accounts can't be timed
+            await verify_dummy_password(credentials.password)
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials",
+            )
 
-    # Verify password
-    if not user_service.verify_password(user, credentials.password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-        )
+        # Verify password
+        if not await user_service.verify_password(user, credentials.password):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid credentials",
+            )
 
     # Check if user is active
-    if user.status != UserStatus.ACTIVE.value:
+    if user.status != _ACTIVE_STATUS:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User account is not active",
@@ -135,37 +207,26 @@ async def login(
     # Generate tokens
     access_token, refresh_token, expires_at = generate_tokens(user.id, user.email)
 
-    # Store refresh token
-    refresh_token_service.create(user.id, refresh_token, expires_at)
-
-    # Update last login
-    user_service.update_last_login(user.id)
+    # Store refresh token and update last login concurrently
+    await asyncio.gather(
+        refresh_token_service.create(user.id, refresh_token, expires_at),
+        _update_last_login(user.id),
+    )
 
     # Return response
-    return AuthResponse(
-        accessToken=access_token,
-        refreshToken=refresh_token,
-        user=AuthUserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            avatar=user.avatar,
-            phone=user.phone,
-            status=user.status,
-        ),
-    )
+    return _build_auth_response(user, access_token, refresh_token)
 
 
 @router.post("/refresh", response_model=TokenRefreshResponse)
 async def refresh_token(
     request: RefreshTokenRequest,
-    db: Annotated[Session, Depends(get_db)],
+    refresh_token_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
 ) -> TokenRefreshResponse:
     """Refresh access token using refresh token.
 
     Args:
         request: Refresh token request
-        db: Database session
+        refresh_token_service: Refresh token service
 
     Returns:
         New token pair
@@ -173,11 +234,8 @@ async def refresh_token(
     Raises:
         HTTPException: If refresh token is invalid or expired
     """
-    user_service = UserService(db)
-    refresh_token_service = RefreshTokenService(db)
-
     # Decode refresh token
-    payload = decode_refresh_token(request.refreshToken)
+    payload = decode_refresh_token_cached(request.refreshToken)
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -191,33 +249,32 @@ async def refresh_token(
             detail="Invalid refresh token",
         )
 
-    # Check if refresh token exists in database
-    stored_token = refresh_token_service.get_by_token(request.refreshToken)
-    if not stored_token:
+    # Load the stored token and its user in one query
+    row = await refresh_token_service.get_with_user(request.refreshToken)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token has been revoked",
         )
+    stored_token, user = row
 
-    # Check if token is still valid
-    if not refresh_token_service.is_valid(stored_token):
-        refresh_token_service.delete(request.refreshToken)
+    if user.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Refresh token has expired",
+            detail="Invalid refresh token",
         )
 
-    # Get user
-    user = user_service.get_by_id(user_id)
-    if not user:
+    # Check if token is still valid
+    if not refresh_token_service.is_valid(stored_token):
+        await refresh_token_service.delete(request.refreshToken)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Refresh token has expired",
         )
 
     # Check if user is still active
-    if user.status != UserStatus.ACTIVE.value:
-        refresh_token_service.delete(request.refreshToken)
+    if user.status != _ACTIVE_STATUS:
+        await refresh_token_service.delete(request.refreshToken)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User account is not active",
@@ -227,9 +284,9 @@ async def refresh_token(
     new_access_token, new_refresh_token, expires_at = generate_tokens(user.id, user.email)
 
     # Rotate refresh token (delete old, create new)
-    refresh_token_service.rotate(request.refreshToken, user.id, new_refresh_token, expires_at)
+    await refresh_token_service.rotate(request.refreshToken, user.id, new_refresh_token, expires_at)
 
-    return TokenRefreshResponse(
+    return TokenRefreshResponse.model_construct(
         accessToken=new_access_token,
         refreshToken=new_refresh_token,
     )
@@ -238,42 +295,29 @@ async def refresh_token(
 @router.get("/me", response_model=MeResponse)
 async def get_current_user_info(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
 ) -> MeResponse:
     """Get current authenticated user information.
 
     Args:
         current_user: Current authenticated user
-        db: Database session
+        user_service: User service
 
     Returns:
         User information with roles and permissions
     """
-    user_service = UserService(db)
+    user = current_user
 
-    # Get user with roles loaded
-    user = user_service.get_by_id(current_user.id, with_roles=True)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
+    # Roles and their permission actions, aggregated by the database
+    roles = await user_service.get_roles_with_permissions(user.id)
+    roles_with_permissions = [
+        RoleWithPermissions.model_construct(
+            id=role_id, name=name, label=label, permissions=permissions
         )
+        for role_id, name, label, permissions in roles
+    ]
 
-    # Build roles with permissions
-    roles_with_permissions: list[RoleWithPermissions] = []
-    for user_role in user.roles:
-        role = user_role.role
-        permissions = [rp.permission.action for rp in role.permissions]
-        roles_with_permissions.append(
-            RoleWithPermissions(
-                id=role.id,
-                name=role.name,
-                label=role.label,
-                permissions=permissions,
-            )
-        )
-
-    return MeResponse(
+    return MeResponse.model_construct(
         id=user.id,
         email=user.email,
         name=user.name,
@@ -289,55 +333,49 @@ async def get_current_user_info(
 @router.post("/logout", response_model=LogoutResponse)
 async def logout(
     current_user: Annotated[User, Depends(get_current_active_user)],
-    db: Annotated[Session, Depends(get_db)],
+    refresh_token_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
 ) -> LogoutResponse:
     """Logout user by invalidating all refresh tokens.
 
     Args:
         current_user: Current authenticated user
-        db: Database session
+        refresh_token_service: Refresh token service
 
     Returns:
         Success message
     """
-    refresh_token_service = RefreshTokenService(db)
-
     # Delete all refresh tokens for the user
-    refresh_token_service.delete_all_for_user(current_user.id)
+    await refresh_token_service.delete_all_for_user(current_user.id)
+    invalidate_user_cache(current_user.id)
 
-    return LogoutResponse(message="Successfully logged out")
+    return LogoutResponse.model_construct(message="Successfully logged out")
 
 
 @router.post("/forgot-password")
 async def forgot_password(
     request: ForgotPasswordRequest,
-    db: Annotated[Session, Depends(get_db)],
+    background_tasks: BackgroundTasks,
+    user_service: Annotated[UserService, Depends(get_read_user_service)],
 ) -> dict[str, str]:
     """Request password reset email.
 
     This endpoint always returns success to prevent email enumeration attacks.
-    If the email exists, a password reset token is generated.
+    If the email exists, a password reset token is generated and sent after the
+    response, so the response time doesn't depend on whether the account exists.
 
     Args:
         request: Forgot password request with email
-        db: Database session
+        background_tasks: Tasks run after the response is sent
+        user_service: User service
 
     Returns:
         Success message (always returns success for security)
     """
-    user_service = UserService(db)
-    reset_service = PasswordResetService(db)
-
     # Check if user exists (but don't reveal this to the client)
-    user = user_service.get_by_email(request.email)
+    user = await user_service.get_by_email(request.email)
 
     if user:
-        # Generate password reset token
-        _token = reset_service.create_token(user)
-        # TODO: Send email with reset link containing token
-        # In production, integrate with email service (SendGrid, SES, etc.)
-        # reset_url = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-        logger.info("Password reset token generated for user %s", user.email)
+        background_tasks.add_task(_send_password_reset, user.id)
 
     # Always return success to prevent email enumeration
     return {"message": "If the email exists, a password reset link has been sent"}
@@ -346,7 +384,8 @@ async def forgot_password(
 @router.post("/reset-password")
 async def reset_password(
     request: ResetPasswordRequest,
-    db: Annotated[Session, Depends(get_db)],
+    refresh_token_service: Annotated[RefreshTokenService, Depends(get_refresh_token_service)],
+    reset_service: Annotated[PasswordResetService, Depends(get_password_reset_service)],
 ) -> dict[str, str]:
     """Reset password using reset token.
 
@@ -355,7 +394,8 @@ async def reset_password(
 
     Args:
         request: Reset password request with token and new password
-        db: Database session
+        refresh_token_service: Refresh token service
+        reset_service: Password reset service
 
     Returns:
         Success message
@@ -363,17 +403,13 @@ async def reset_password(
     Raises:
         HTTPException: If token is invalid, expired, or already used
     """
-    reset_service = PasswordResetService(db)
-    refresh_token_service = RefreshTokenService(db)
-
     try:
         # Validate token and reset password
-        user = reset_service.reset_password(request.token, request.password)
+        user = await reset_service.reset_password(request.token, request.password)
 
         # Invalidate all existing refresh tokens for security
-        refresh_token_service.delete_all_for_user(user.id)
+        await refresh_token_service.delete_all_for_user(user.id)
 
-        logger.info("Password reset completed for user %s", user.email)
         return {"message": "Password has been reset successfully"}
 
     except InvalidTokenError:
@@ -1,20 +1,39 @@
 """Calendar event management routes matching API spec."""
 
+from collections import defaultdict
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.api.deps import get_current_active_user
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.responses import ORJSONResponse
 from app.models import CalendarEvent, EventAttendee, User
 from app.models.base import generate_cuid
 from app.schemas.user import UserBasicResponse
 
 router = APIRouter(prefix="/calendar", tags=["Calendar"])
 
+# list_events body when no events match
+_EMPTY_EVENT_LIST_JSON = b'{"data":[]}'
+
+# EventUpdate field -> CalendarEvent attribute
+_FIELD_MAP = {
+    "title": "title",
+    "description": "description",
+    "startTime": "start_at",
+    "endTime": "end_at",
+    "location": "location",
+    "isAllDay": "all_day",
+    "color": "color",
+}
+
 
 # ============== Schemas ==============
 class EventCreate(BaseModel):
@@ -22,6 +41,7 @@ class EventCreate(BaseModel):
     description: str | None = None
     startTime: datetime
     endTime: datetime
+    type: str = "meeting"  # meeting, task, reminder, holiday
     location: str | None = None
     isAllDay: bool = False
     color: str | None = None
@@ -48,7 +68,7 @@ class AddAttendee(BaseModel):
 
 
 class AttendeeResponse(BaseModel):
-    id: str
+    id: str  # attendee's user ID (attendees are keyed by event and user)
     user: UserBasicResponse
     status: str
 
@@ -86,215 +106,304 @@ class BatchDeleteResponse(BaseModel):
 
 
 # ============== Helper ==============
-def _build_event_response(event: CalendarEvent) -> EventResponse:
-    attendees = []
-    if event.attendees:
-        for att in event.attendees:
-            attendees.append(
-                AttendeeResponse(
-                    id=att.id,
-                    user=UserBasicResponse(
-                        id=att.user.id,
-                        email=att.user.email,
-                        name=att.user.name,
-                        avatar=att.user.avatar,
-                    ),
-                    status=att.status,
-                )
-            )
+def _event_load_options() -> list[ORMOption]:
+    """Loader options for rendering events with their attendees.
+
+    Attendees come from a separate IN query so event rows aren't repeated once
+    per attendee. The organizer isn't loaded: every query here is scoped to the
+    current user's events, and routes render the organizer from current_user.
+    """
+    options: list[ORMOption] = [
+        selectinload(CalendarEvent.attendees).selectinload(EventAttendee.user),
+    ]
+    if settings.DEBUG or settings.ENVIRONMENT == "test":
+        # Fail loudly on accidental lazy loads in _build_event_response
+        options.append(raiseload("*"))
+    return options
+
+
+def _user_basic(user: User) -> dict[str, Any]:
+    """Build the UserBasicResponse payload as a plain dict."""
+    return {"id": user.id, "email": user.email, "name": user.name, "avatar": user.avatar}
+
+
+def _build_event_response(
+    event: CalendarEvent, organizer_user: User | None = None
+) -> dict[str, Any]:
+    """Build the EventResponse payload as a plain dict for ORJSONResponse.
+
+    Args:
+        event: Calendar event with attendees loaded
+        organizer_user: Organizer already in hand (the current user); avoids
+            loading ``event.owner``
+
+    Returns:
+        Event response payload
+    """
+    return {
+        "id": event.id,
+        "title": event.title,
+        "description": event.description,
+        "startTime": event.start_at,
+        "endTime": event.end_at,
+        "location": event.location,
+        "isAllDay": event.all_day,
+        "color": event.color,
+        "organizer": _user_basic(organizer_user or event.owner),
+        "attendees": [
+            {"id": att.user_id, "user": _user_basic(att.user), "status": att.status}
+            for att in event.attendees
+        ],
+        "created_at": event.created_at,
+        "updated_at": event.updated_at,
+    }
 
-    return EventResponse(
-        id=event.id,
-        title=event.title,
-        description=event.description,
-        startTime=event.start_time,
-        endTime=event.end_time,
-        location=event.location,
-        isAllDay=event.is_all_day,
-        color=event.color,
-        organizer=UserBasicResponse(
-            id=event.organizer.id,
-            email=event.organizer.email,
-            name=event.organizer.name,
-            avatar=event.organizer.avatar,
-        ),
-        attendees=attendees,
-        created_at=event.created_at,
-        updated_at=event.updated_at,
+
+def _get_owned_event(db: Session, event_id: str, user_id: str) -> CalendarEvent | None:
+    """Load an event owned by the user, with attendees eager-loaded."""
+    return (
+        db.query(CalendarEvent)
+        .filter(CalendarEvent.id == event_id, CalendarEvent.owner_id == user_id)
+        .options(*_event_load_options())
+        .first()
     )
 
 
+def _update_owned_event(
+    db: Session, event_id: str, user_id: str, values: dict[str, Any]
+) -> CalendarEvent | None:
+    """Update an event owned by the user and load it for the response.
+
+    Issues a single UPDATE ... RETURNING (ownership check included) instead of
+    loading the event and letting the ORM flush attribute changes.
+
+    Args:
+        db: Database session
+        event_id: Event ID
+        user_id: ID of the user who must own the event
+        values: Column attribute values to set
+
+    Returns:
+        Updated event with attendees loaded, or None if not found
+    """
+    if not values:
+        return _get_owned_event(db, event_id, user_id)
+    return db.scalars(
+        update(CalendarEvent)
+        .where(CalendarEvent.id == event_id, CalendarEvent.owner_id == user_id)
+        .values(**values)
+        .returning(CalendarEvent)
+        .options(*_event_load_options())
+    ).first()
+
+
 # ============== Routes ==============
 @router.get("/events", response_model=EventListResponse)
-async def list_events(
+def list_events(
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     start: datetime | None = None,
     end: datetime | None = None,
-) -> EventListResponse:
-    """Get calendar events with optional date range filter."""
-    query = db.query(CalendarEvent).filter(CalendarEvent.organizer_id == current_user.id)
-    query = query.options(
-        joinedload(CalendarEvent.organizer),
-        joinedload(CalendarEvent.attendees).joinedload(EventAttendee.user),
-    )
+) -> Response:
+    """Get calendar events with optional date range filter.
+
+    Selects only the rendered columns with Core queries (events, then all
+    attendees, then their distinct users, each in one query) and builds the
+    payload as plain dicts, so no ORM objects or Pydantic models are created
+    per row.
+    """
+    query = select(
+        CalendarEvent.id,
+        CalendarEvent.title,
+        CalendarEvent.description,
+        CalendarEvent.start_at,
+        CalendarEvent.end_at,
+        CalendarEvent.location,
+        CalendarEvent.all_day,
+        CalendarEvent.color,
+        CalendarEvent.created_at,
+        CalendarEvent.updated_at,
+    ).where(CalendarEvent.owner_id == current_user.id)
 
     if start:
-        query = query.filter(CalendarEvent.start_time >= start)
+        query = query.where(CalendarEvent.start_at >= start)
     if end:
-        query = query.filter(CalendarEvent.end_time <= end)
+        query = query.where(CalendarEvent.end_at <= end)
+
+    # The owner filter and start range are both index conditions on
+    # (owner_id, start_at), so only the owner's events in range are read; end is
+    # checked on those rows. Postgres may still sort them (a bitmap scan over a
+    # small range is usually cheaper than an ordered index scan)
+    rows = db.execute(query.order_by(CalendarEvent.start_at)).all()
+
+    if not rows:
+        # Blank calendars are common; skip the attendee queries and serialization
+        return Response(content=_EMPTY_EVENT_LIST_JSON, media_type="application/json")
+
+    attendees_by_event: defaultdict[str, list[dict[str, Any]]] = defaultdict(list)
+    attendee_rows = db.execute(
+        select(
+            EventAttendee.event_id,
+            EventAttendee.status,
+            EventAttendee.user_id,
+        ).where(EventAttendee.event_id.in_([row.id for row in rows]))
+    ).all()
+
+    # The same people tend to attend many events in a range: fetch each user
+    # once instead of repeating their columns on every attendee row
+    user_ids = {att.user_id for att in attendee_rows}
+    users = (
+        {
+            user.id: {
+                "id": user.id,
+                "email": user.email,
+                "name": user.name,
+                "avatar": user.avatar,
+            }
+            for user in db.execute(
+                select(User.id, User.email, User.name, User.avatar).where(User.id.in_(user_ids))
+            )
+        }
+        if user_ids
+        else {}
+    )
 
-    events = query.order_by(CalendarEvent.start_time).all()
+    for att in attendee_rows:
+        user = users.get(att.user_id)
+        if user is not None:
+            attendees_by_event[att.event_id].append(
+                {"id": att.user_id, "user": user, "status": att.status}
+            )
 
-    return EventListResponse(data=[_build_event_response(e) for e in events])
+    # Every listed event is organized by the current user
+    organizer = _user_basic(current_user)
+    events = [
+        {
+            "id": row.id,
+            "title": row.title,
+            "description": row.description,
+            "startTime": row.start_at,
+            "endTime": row.end_at,
+            "location": row.location,
+            "isAllDay": row.all_day,
+            "color": row.color,
+            "organizer": organizer,
+            "attendees": attendees_by_event.get(row.id, []),
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        }
+        for row in rows
+    ]
+
+    return ORJSONResponse({"data": events})
 
 
 @router.get("/events/{event_id}", response_model=EventResponse)
-async def get_event(
+def get_event(
     event_id: str,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> EventResponse:
+) -> ORJSONResponse:
     """Get event by ID."""
     event = (
         db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event_id, CalendarEvent.organizer_id == current_user.id)
-        .options(
-            joinedload(CalendarEvent.organizer),
-            joinedload(CalendarEvent.attendees).joinedload(EventAttendee.user),
-        )
+        .filter(CalendarEvent.id == event_id, CalendarEvent.owner_id == current_user.id)
+        .options(*_event_load_options())
         .first()
     )
 
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
 
-    return _build_event_response(event)
+    return ORJSONResponse(_build_event_response(event, organizer_user=current_user))
 
 
 @router.post("/events", response_model=EventResponse, status_code=status.HTTP_201_CREATED)
-async def create_event(
+def create_event(
     event_data: EventCreate,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> EventResponse:
+) -> ORJSONResponse:
     """Create a new calendar event."""
     event = CalendarEvent(
         id=generate_cuid(),
         title=event_data.title,
         description=event_data.description,
-        start_time=event_data.startTime,
-        end_time=event_data.endTime,
+        start_at=event_data.startTime,
+        end_at=event_data.endTime,
+        type=event_data.type,
         location=event_data.location,
-        is_all_day=event_data.isAllDay,
+        all_day=event_data.isAllDay,
         color=event_data.color,
-        organizer_id=current_user.id,
+        owner_id=current_user.id,
+        attendees=[],
     )
 
     db.add(event)
+    db.flush()
+    response = _build_event_response(event, organizer_user=current_user)
     db.commit()
 
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event.id)
-        .options(
-            joinedload(CalendarEvent.organizer),
-            joinedload(CalendarEvent.attendees).joinedload(EventAttendee.user),
-        )
-        .first()
-    )
-    return _build_event_response(event)
+    return ORJSONResponse(response, status_code=status.HTTP_201_CREATED)
 
 
 @router.put("/events/{event_id}", response_model=EventResponse)
-async def update_event(
+def update_event(
     event_id: str,
     event_data: EventUpdate,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> EventResponse:
+) -> ORJSONResponse:
     """Update event information."""
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event_id, CalendarEvent.organizer_id == current_user.id)
-        .first()
-    )
+    values = {
+        _FIELD_MAP[key]: value
+        for key, value in event_data.model_dump(exclude_unset=True).items()
+        if value is not None
+    }
+    event = _update_owned_event(db, event_id, current_user.id, values)
 
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
 
-    update_dict = event_data.model_dump(exclude_unset=True)
-    field_mapping = {
-        "startTime": "start_time",
-        "endTime": "end_time",
-        "isAllDay": "is_all_day",
-    }
-
-    for key, value in update_dict.items():
-        if value is not None:
-            db_field = field_mapping.get(key, key)
-            setattr(event, db_field, value)
-
+    response = _build_event_response(event, organizer_user=current_user)
     db.commit()
 
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event.id)
-        .options(
-            joinedload(CalendarEvent.organizer),
-            joinedload(CalendarEvent.attendees).joinedload(EventAttendee.user),
-        )
-        .first()
-    )
-    return _build_event_response(event)
+    return ORJSONResponse(response)
 
 
 @router.patch("/events/{event_id}/reschedule", response_model=EventResponse)
-async def reschedule_event(
+def reschedule_event(
     event_id: str,
     reschedule_data: EventReschedule,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> EventResponse:
+) -> ORJSONResponse:
     """Reschedule event time."""
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event_id, CalendarEvent.organizer_id == current_user.id)
-        .first()
+    event = _update_owned_event(
+        db,
+        event_id,
+        current_user.id,
+        {"start_at": reschedule_data.startTime, "end_at": reschedule_data.endTime},
     )
 
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
 
-    event.start_time = reschedule_data.startTime
-    event.end_time = reschedule_data.endTime
+    response = _build_event_response(event, organizer_user=current_user)
     db.commit()
 
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event.id)
-        .options(
-            joinedload(CalendarEvent.organizer),
-            joinedload(CalendarEvent.attendees).joinedload(EventAttendee.user),
-        )
-        .first()
-    )
-    return _build_event_response(event)
+    return ORJSONResponse(response)
 
 
 @router.post("/events/{event_id}/attendees", response_model=EventResponse)
-async def add_attendee(
+def add_attendee(
     event_id: str,
     attendee_data: AddAttendee,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> EventResponse:
+) -> ORJSONResponse:
     """Add attendee to event."""
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event_id, CalendarEvent.organizer_id == current_user.id)
-        .first()
-    )
+    event = _get_owned_event(db, event_id, current_user.id)
 
     if not event:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
@@ -304,49 +413,42 @@ async def add_attendee(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    # Check if already attendee
-    existing = (
-        db.query(EventAttendee)
-        .filter(EventAttendee.event_id == event_id, EventAttendee.user_id == attendee_data.userId)
-        .first()
-    )
+    # Check if already attendee (attendees are already loaded with the event)
+    existing = next((a for a in event.attendees if a.user_id == attendee_data.userId), None)
 
     if existing:
         existing.status = attendee_data.status
     else:
-        attendee = EventAttendee(
-            id=generate_cuid(),
-            event_id=event_id,
-            user_id=attendee_data.userId,
-            status=attendee_data.status,
+        event.attendees.append(
+            EventAttendee(
+                user_id=attendee_data.userId,
+                status=attendee_data.status,
+                user=user,
+            )
         )
-        db.add(attendee)
 
+    db.flush()
+    response = _build_event_response(event, organizer_user=current_user)
     db.commit()
 
-    event = (
-        db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event.id)
-        .options(
-            joinedload(CalendarEvent.organizer),
-            joinedload(CalendarEvent.attendees).joinedload(EventAttendee.user),
-        )
-        .first()
-    )
-    return _build_event_response(event)
+    return ORJSONResponse(response)
 
 
 @router.delete("/events/{event_id}/attendees/{attendee_id}")
-async def remove_attendee(
+def remove_attendee(
     event_id: str,
     attendee_id: str,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> dict[str, str]:
-    """Remove attendee from event."""
+) -> ORJSONResponse:
+    """Remove attendee from event.
+
+    Attendees are keyed by (event, user), so ``attendee_id`` is the attendee's
+    user ID, as returned in the attendee's ``id`` field.
+    """
     event = (
         db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event_id, CalendarEvent.organizer_id == current_user.id)
+        .filter(CalendarEvent.id == event_id, CalendarEvent.owner_id == current_user.id)
         .first()
     )
 
@@ -355,7 +457,7 @@ async def remove_attendee(
 
     attendee = (
         db.query(EventAttendee)
-        .filter(EventAttendee.id == attendee_id, EventAttendee.event_id == event_id)
+        .filter(EventAttendee.user_id == attendee_id, EventAttendee.event_id == event_id)
         .first()
     )
 
@@ -365,42 +467,46 @@ async def remove_attendee(
     db.delete(attendee)
     db.commit()
 
-    return {"message": "Attendee removed successfully"}
+    return ORJSONResponse({"message": "Attendee removed successfully"})
 
 
 @router.post("/events/batch-delete", response_model=BatchDeleteResponse)
-async def batch_delete_events(
+def batch_delete_events(
     delete_data: BatchDeleteRequest,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> BatchDeleteResponse:
+) -> ORJSONResponse:
     """Batch delete events."""
-    deleted = (
-        db.query(CalendarEvent)
-        .filter(
-            CalendarEvent.id.in_(delete_data.ids),
-            CalendarEvent.organizer_id == current_user.id,
+    deleted_ids: list[str] = []
+    if delete_data.ids:
+        deleted_ids = list(
+            db.scalars(
+                delete(CalendarEvent)
+                .where(
+                    CalendarEvent.id.in_(delete_data.ids),
+                    CalendarEvent.owner_id == current_user.id,
+                )
+                .returning(CalendarEvent.id)
+            )
         )
-        .delete(synchronize_session=False)
-    )
-    db.commit()
+        db.commit()
 
-    return BatchDeleteResponse(
-        message=f"Successfully deleted {deleted} events",
-        deleted_count=deleted,
+    deleted = len(deleted_ids)
+    return ORJSONResponse(
+        {"message": f"Successfully deleted {deleted} events", "deleted_count": deleted}
     )
 
 
 @router.delete("/events/{event_id}")
-async def delete_event(
+def delete_event(
     event_id: str,
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> dict[str, str]:
+) -> ORJSONResponse:
     """Delete event."""
     event = (
         db.query(CalendarEvent)
-        .filter(CalendarEvent.id == event_id, CalendarEvent.organizer_id == current_user.id)
+        .filter(CalendarEvent.id == event_id, CalendarEvent.owner_id == current_user.id)
         .first()
     )
 
@@ -410,4 +516,4 @@ async def delete_event(
     db.delete(event)
     db.commit()
 
-    return {"message": "Event successfully deleted", "id": event_id}
+    return ORJSONResponse({"message": "Event successfully deleted", "id": event_id})
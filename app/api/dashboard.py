@@ -4,13 +4,15 @@ import random
 from datetime import datetime, timedelta
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
+import orjson
+from fastapi import APIRouter, Depends, Response
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_active_user
 from app.core.database import get_db
+from app.core.responses import ORJSONResponse
 from app.models import (
     ActivityLog,
     Document,
@@ -21,6 +23,14 @@ from app.models import (
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# Overview stats key -> counted model
+_OVERVIEW_COUNTS = (
+    ("users", User),
+    ("documents", Document),
+    ("files", File),
+    ("teams", Team),
+)
+
 
 # ============== Schemas ==============
 class StatsResponse(BaseModel):
@@ -123,238 +133,248 @@ class OverviewResponse(BaseModel):
     stats: dict[str, int]
 
 
+# ============== Mock data ==============
+# Value ranges for generated series (same bounds as the inclusive randint calls)
+_VISIT_DAYS = 7
+_VISITS_RANGE = range(500, 2001)
+_PAGE_VIEWS_RANGE = range(1500, 5001)
+_SALES_MONTHS = ("Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_SALES_ORDERS_RANGE = range(100, 501)
+_MOCK_ROWS = 5  # rows in the mock orders/activities lists
+_ORDER_STATUSES = ("completed", "pending", "processing", "cancelled")
+_ACTIVITY_ACTIONS = ("created", "updated", "deleted", "viewed")
+_ACTIVITY_TARGETS = ("document", "file", "user", "team")
+
+# Mock payloads that never change: serialized once at import so the routes
+# only copy bytes.
+_PRODUCTS = [
+    {"id": "1", "name": "Product A", "sales": 1234, "revenue": 12340.00},
+    {"id": "2", "name": "Product B", "sales": 987, "revenue": 9870.00},
+    {"id": "3", "name": "Product C", "sales": 756, "revenue": 7560.00},
+    {"id": "4", "name": "Product D", "sales": 543, "revenue": 5430.00},
+    {"id": "5", "name": "Product E", "sales": 321, "revenue": 3210.00},
+]
+
+_PIE_DATA = [
+    {"name": "Documents", "value": 35, "color": "#4F46E5"},
+    {"name": "Files", "value": 25, "color": "#10B981"},
+    {"name": "Images", "value": 20, "color": "#F59E0B"},
+    {"name": "Videos", "value": 12, "color": "#EF4444"},
+    {"name": "Others", "value": 8, "color": "#6B7280"},
+]
+
+_TASKS = [
+    {
+        "id": "1",
+        "title": "Review documentation",
+        "status": "completed",
+        "priority": "high",
+        "dueDate": "2024-12-10",
+    },
+    {
+        "id": "2",
+        "title": "Update API endpoints",
+        "status": "in_progress",
+        "priority": "medium",
+        "dueDate": "2024-12-15",
+    },
+    {
+        "id": "3",
+        "title": "Fix authentication bug",
+        "status": "pending",
+        "priority": "high",
+        "dueDate": "2024-12-08",
+    },
+    {
+        "id": "4",
+        "title": "Write unit tests",
+        "status": "pending",
+        "priority": "low",
+        "dueDate": "2024-12-20",
+    },
+]
+
+_TASK_STATS = {
+    "total": len(_TASKS),
+    "completed": sum(1 for t in _TASKS if t["status"] == "completed"),
+    "in_progress": sum(1 for t in _TASKS if t["status"] == "in_progress"),
+    "pending": sum(1 for t in _TASKS if t["status"] == "pending"),
+}
+
+_PRODUCTS_JSON = orjson.dumps({"data": _PRODUCTS})
+_PIE_JSON = orjson.dumps({"data": _PIE_DATA})
+_TASKS_JSON = orjson.dumps({"data": _TASKS, "stats": _TASK_STATS})
+
+
 # ============== Routes ==============
 @router.get("/stats", response_model=StatsResponse)
-async def get_stats(
+def get_stats(
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> StatsResponse:
+) -> ORJSONResponse:
     """Get dashboard statistics."""
     total_users = db.query(func.count(User.id)).scalar() or 0
 
     # Mock data for demo purposes
-    return StatsResponse(
-        totalUsers=total_users,
-        totalRevenue=125680.50,
-        totalOrders=1234,
-        conversionRate=3.24,
-        userGrowth=12.5,
-        revenueGrowth=8.3,
-        orderGrowth=15.2,
+    return ORJSONResponse(
+        {
+            "totalUsers": total_users,
+            "totalRevenue": 125680.50,
+            "totalOrders": 1234,
+            "conversionRate": 3.24,
+            "userGrowth": 12.5,
+            "revenueGrowth": 8.3,
+            "orderGrowth": 15.2,
+        }
     )
 
 
 @router.get("/visits", response_model=VisitsResponse)
 async def get_visits(
-    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> VisitsResponse:
+) -> ORJSONResponse:
     """Get visit trends (7 days)."""
-    data = []
     today = datetime.now()
+    dates = [
+        (today - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+        for days_ago in range(_VISIT_DAYS - 1, -1, -1)
+    ]
+    # Draw each column in one call rather than per row
+    visits = random.choices(_VISITS_RANGE, k=_VISIT_DAYS)
+    page_views = random.choices(_PAGE_VIEWS_RANGE, k=_VISIT_DAYS)
 
-    for i in range(7):
-        date = today - timedelta(days=6 - i)
-        data.append(
-            VisitData(
-                date=date.strftime("%Y-%m-%d"),
-                visits=random.randint(500, 2000),
-                pageViews=random.randint(1500, 5000),
-            )
-        )
+    data = [
+        {"date": date, "visits": v, "pageViews": pv}
+        for date, v, pv in zip(dates, visits, page_views, strict=True)
+    ]
 
-    return VisitsResponse(data=data)
+    return ORJSONResponse({"data": data})
 
 
 @router.get("/sales", response_model=SalesResponse)
 async def get_sales(
-    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> SalesResponse:
+) -> ORJSONResponse:
     """Get sales trends (6 months)."""
-    months = ["Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-    data = []
-
-    for month in months:
-        data.append(
-            SalesData(
-                month=month,
-                sales=round(random.uniform(10000, 50000), 2),
-                orders=random.randint(100, 500),
-            )
-        )
+    orders = random.choices(_SALES_ORDERS_RANGE, k=len(_SALES_MONTHS))
 
-    return SalesResponse(data=data)
+    data = [
+        {"month": month, "sales": round(random.uniform(10000, 50000), 2), "orders": count}
+        for month, count in zip(_SALES_MONTHS, orders, strict=True)
+    ]
+
+    return ORJSONResponse({"data": data})
 
 
 @router.get("/products", response_model=ProductsResponse)
 async def get_products(
-    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> ProductsResponse:
+) -> Response:
     """Get top products."""
-    products = [
-        ProductData(id="1", name="Product A", sales=1234, revenue=12340.00),
-        ProductData(id="2", name="Product B", sales=987, revenue=9870.00),
-        ProductData(id="3", name="Product C", sales=756, revenue=7560.00),
-        ProductData(id="4", name="Product D", sales=543, revenue=5430.00),
-        ProductData(id="5", name="Product E", sales=321, revenue=3210.00),
-    ]
-
-    return ProductsResponse(data=products)
+    return Response(content=_PRODUCTS_JSON, media_type="application/json")
 
 
 @router.get("/orders", response_model=OrdersResponse)
 async def get_orders(
-    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> OrdersResponse:
+) -> ORJSONResponse:
     """Get recent orders."""
-    statuses = ["completed", "pending", "processing", "cancelled"]
-    orders = []
-
-    for i in range(5):
-        orders.append(
-            OrderData(
-                id=f"ORD-{1000 + i}",
-                customer=f"Customer {i + 1}",
-                amount=round(random.uniform(50, 500), 2),
-                status=random.choice(statuses),
-                date=(datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d"),
-            )
-        )
+    now = datetime.now()
+    statuses = random.choices(_ORDER_STATUSES, k=_MOCK_ROWS)
+
+    orders = [
+        {
+            "id": f"ORD-{1000 + i}",
+            "customer": f"Customer {i + 1}",
+            "amount": round(random.uniform(50, 500), 2),
+            "status": order_status,
+            "date": (now - timedelta(days=i)).strftime("%Y-%m-%d"),
+        }
+        for i, order_status in enumerate(statuses)
+    ]
 
-    return OrdersResponse(data=orders)
+    return ORJSONResponse({"data": orders})
 
 
 @router.get("/activities", response_model=ActivitiesResponse)
-async def get_activities(
+def get_activities(
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> ActivitiesResponse:
+) -> ORJSONResponse:
     """Get recent activities."""
     # Try to get real activity logs
     activities = db.query(ActivityLog).order_by(ActivityLog.created_at.desc()).limit(10).all()
 
     if activities:
         data = [
-            ActivityData(
-                id=a.id,
-                user=a.user_id,
-                action=a.action,
-                target=a.entity_type,
-                timestamp=a.created_at,
-            )
+            {
+                "id": a.id,
+                "user": a.user_id,
+                "action": a.action,
+                "target": a.entity_type,
+                "timestamp": a.created_at,
+            }
             for a in activities
         ]
     else:
         # Mock data
-        actions = ["created", "updated", "deleted", "viewed"]
-        targets = ["document", "file", "user", "team"]
-        data = []
-
-        for i in range(5):
-            data.append(
-                ActivityData(
-                    id=f"act_{i}",
-                    user=current_user.name,
-                    action=random.choice(actions),
-                    target=random.choice(targets),
-                    timestamp=datetime.now() - timedelta(hours=i),
-                )
-            )
+        now = datetime.now()
+        actions = random.choices(_ACTIVITY_ACTIONS, k=_MOCK_ROWS)
+        targets = random.choices(_ACTIVITY_TARGETS, k=_MOCK_ROWS)
+        data = [
+            {
+                "id": f"act_{i}",
+                "user": current_user.name,
+                "action": action,
+                "target": target,
+                "timestamp": now - timedelta(hours=i),
+            }
+            for i, (action, target) in enumerate(zip(actions, targets, strict=True))
+        ]
 
-    return ActivitiesResponse(data=data)
+    return ORJSONResponse({"data": data})
 
 
 @router.get("/pie", response_model=PieResponse)
 async def get_pie_data(
-    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> PieResponse:
+) -> Response:
     """Get pie chart data (category distribution)."""
-    data = [
-        PieData(name="Documents", value=35, color="#4F46E5"),
-        PieData(name="Files", value=25, color="#10B981"),
-        PieData(name="Images", value=20, color="#F59E0B"),
-        PieData(name="Videos", value=12, color="#EF4444"),
-        PieData(name="Others", value=8, color="#6B7280"),
-    ]
-
-    return PieResponse(data=data)
+    return Response(content=_PIE_JSON, media_type="application/json")
 
 
 @router.get("/tasks", response_model=TasksResponse)
 async def get_tasks(
-    db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> TasksResponse:
+) -> Response:
     """Get task list and statistics."""
-    # Mock task data
-    tasks = [
-        TaskData(
-            id="1",
-            title="Review documentation",
-            status="completed",
-            priority="high",
-            dueDate="2024-12-10",
-        ),
-        TaskData(
-            id="2",
-            title="Update API endpoints",
-            status="in_progress",
-            priority="medium",
-            dueDate="2024-12-15",
-        ),
-        TaskData(
-            id="3",
-            title="Fix authentication bug",
-            status="pending",
-            priority="high",
-            dueDate="2024-12-08",
-        ),
-        TaskData(
-            id="4",
-            title="Write unit tests",
-            status="pending",
-            priority="low",
-            dueDate="2024-12-20",
-        ),
-    ]
-
-    stats = {
-        "total": len(tasks),
-        "completed": sum(1 for t in tasks if t.status == "completed"),
-        "in_progress": sum(1 for t in tasks if t.status == "in_progress"),
-        "pending": sum(1 for t in tasks if t.status == "pending"),
-    }
-
-    return TasksResponse(data=tasks, stats=stats)
+    return Response(content=_TASKS_JSON, media_type="application/json")
 
 
 @router.get("/overview", response_model=OverviewResponse)
-async def get_overview(
+def get_overview(
     db: Annotated[Session, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> OverviewResponse:
+) -> ORJSONResponse:
     """Get system overview."""
-    # Get real counts from database
-    user_count = db.query(func.count(User.id)).scalar() or 0
-    document_count = db.query(func.count(Document.id)).scalar() or 0
-    file_count = db.query(func.count(File.id)).scalar() or 0
-    team_count = db.query(func.count(Team.id)).scalar() or 0
-
-    return OverviewResponse(
-        system=SystemInfo(
-            cpu=round(random.uniform(20, 60), 1),
-            memory=round(random.uniform(40, 80), 1),
-            disk=round(random.uniform(30, 70), 1),
-            uptime=random.randint(86400, 864000),  # 1-10 days in seconds
-        ),
-        stats={
-            "users": user_count,
-            "documents": document_count,
-            "files": file_count,
-            "teams": team_count,
-        },
+    # Get real counts from database in a single round-trip
+    counts = db.execute(
+        select(
+            *(
+                select(func.count()).select_from(model).scalar_subquery().label(name)
+                for name, model in _OVERVIEW_COUNTS
+            )
+        )
+    ).one()
+
+    return ORJSONResponse(
+        {
+            "system": {
+                "cpu": round(random.uniform(20, 60), 1),
+                "memory": round(random.uniform(40, 80), 1),
+                "disk": round(random.uniform(30, 70), 1),
+                "uptime": random.randint(86400, 864000),  # 1-10 days in seconds
+            },
+            "stats": dict(counts._mapping),
+        }
     )
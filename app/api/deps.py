@@ -1,29 +1,127 @@
 """API dependencies for authentication and authorization."""
 
-from typing import Annotated
+from collections.abc import Iterable
+from typing import Annotated, Final
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_async_db, get_read_db
 from app.core.security import decode_access_token
 from app.models import User, UserStatus
-from app.services.user_service import UserService
+from app.services.password_reset_service import PasswordResetService
+from app.services.user_service import (
+    RefreshTokenService,
+    UserService,
+    cache_token_user,
+    get_cached_token_user,
+)
 
 # Security scheme for JWT bearer token
 security = HTTPBearer()
 
+_ACTIVE_STATUS: Final[str] = UserStatus.ACTIVE.value
 
-def get_current_user(
+
+class PermissionSet:
+    """A user's permissions, pre-split for wildcard matching.
+
+    Built once when permissions are loaded, so each check is at most three set
+    lookups instead of re-parsing every permission string.
+    """
+
+    __slots__ = ("allow_all", "exact", "wildcard_resources")
+
+    def __init__(self, permissions: Iterable[str]) -> None:
+        """Initialize from permission action strings.
+
+        Args:
+            permissions: Permission strings (e.g. "users:read", "users:*", "*")
+        """
+        permissions = frozenset(permissions)
+        self.allow_all = "*" in permissions
+        self.exact = permissions
+        self.wildcard_resources = frozenset(p[:-2] for p in permissions if p.endswith(":*"))
+
+    def allows(self, required: str) -> bool:
+        """Check whether the permissions grant the required permission.
+
+        Args:
+            required: Required permission string
+
+        Returns:
+            True if granted, False otherwise
+        """
+        if self.allow_all or required in self.exact:
+            return True
+        resource, sep, _ = required.partition(":")
+        return bool(sep) and resource in self.wildcard_resources
+
+
+async def get_user_service(db: Annotated[AsyncSession, Depends(get_async_db)]) -> UserService:
+    """Get the user service bound to the request's database session.
+
+    Args:
+        db: Database session
+
+    Returns:
+        User service shared by all dependencies of the request
+    """
+    return UserService(db)
+
+
+async def get_read_user_service(
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> UserService:
+    """Get a user service bound to a read replica session.
+
+    Args:
+        db: Read replica database session
+
+    Returns:
+        User service for read-only lookups
+    """
+    return UserService(db)
+
+
+async def get_refresh_token_service(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> RefreshTokenService:
+    """Get the refresh token service bound to the request's database session.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Refresh token service
+    """
+    return RefreshTokenService(db)
+
+
+async def get_password_reset_service(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+) -> PasswordResetService:
+    """Get the password reset service bound to the request's database session.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Password reset service
+    """
+    return PasswordResetService(db)
+
+
+async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
 ) -> User:
     """Get current authenticated user from JWT token.
 
     Args:
         credentials: HTTP bearer token credentials
-        db: Database session
+        user_service: User service
 
     Returns:
         Current authenticated user
@@ -32,6 +130,12 @@ def get_current_user(
         HTTPException: If token is invalid or user not found
     """
     token = credentials.credentials
+
+    # Recently authenticated tokens skip the signature check and user query
+    cached_user = get_cached_token_user(token)
+    if cached_user is not None:
+        return cached_user
+
     payload = decode_access_token(token)
 
     if payload is None:
@@ -49,8 +153,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user_service = UserService(db)
-    user = user_service.get_by_id(user_id)
+    user = await user_service.get_by_id(user_id)
 
     if user is None:
         raise HTTPException(
@@ -59,14 +162,18 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cache_token_user(token, user, payload["exp"])
     return user
 
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
     """Get current active user.
 
+    Declared ``async`` so FastAPI runs it inline on the event loop instead of
+    dispatching a trivial status check to the threadpool on every request.
+
     Args:
         current_user: Current authenticated user
 
@@ -76,7 +183,7 @@ def get_current_active_user(
     Raises:
         HTTPException: If user is inactive or suspended
     """
-    if current_user.status != UserStatus.ACTIVE.value:
+    if current_user.status != _ACTIVE_STATUS:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is not active",
@@ -84,6 +191,25 @@ def get_current_active_user(
     return current_user
 
 
+async def get_current_user_permissions(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
+) -> PermissionSet:
+    """Get the permissions granted to the current user through their roles.
+
+    Resolved with a single query and cached by FastAPI for the rest of the
+    request, so several permission checks on one route share the lookup.
+
+    Args:
+        current_user: Current authenticated user
+        user_service: User service
+
+    Returns:
+        Permission set for wildcard-aware checks
+    """
+    return PermissionSet(await user_service.get_permission_actions(current_user.id))
+
+
 def check_permission(required_permission: str):
     """Create a dependency that checks if user has a specific permission.
 
@@ -99,15 +225,15 @@ def check_permission(required_permission: str):
         Dependency function that checks permission
     """
 
-    def permission_checker(
+    async def permission_checker(
         current_user: Annotated[User, Depends(get_current_active_user)],
-        db: Annotated[Session, Depends(get_db)],
+        user_permissions: Annotated[PermissionSet, Depends(get_current_user_permissions)],
     ) -> User:
         """Check if user has the required permission.
 
         Args:
             current_user: Current authenticated user
-            db: Database session
+            user_permissions: Current user's permission actions
 
         Returns:
             Current user if permission check passes
@@ -115,23 +241,6 @@ def check_permission(required_permission: str):
         Raises:
             HTTPException: If user doesn't have required permission
         """
-        user_service = UserService(db)
-        user = user_service.get_by_id(current_user.id, with_roles=True)
-
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
-            )
-
-        # Collect all permissions from user's roles
-        user_permissions: set[str] = set()
-        for user_role in user.roles:
-            role = user_role.role
-            for role_permission in role.permissions:
-                user_permissions.add(role_permission.permission.action)
-
-        # Check if user has the required permission
         if has_permission(user_permissions, required_permission):
             return current_user
 
@@ -143,31 +252,19 @@ def check_permission(required_permission: str):
     return permission_checker
 
 
-def has_permission(user_permissions: set[str], required: str) -> bool:
+def has_permission(user_permissions: PermissionSet | set[str], required: str) -> bool:
     """Check if user has the required permission using wildcard matching.
 
     Args:
-        user_permissions: Set of user's permission strings
+        user_permissions: User's permissions, ideally pre-built as a PermissionSet
         required: Required permission string
 
     Returns:
         True if user has permission, False otherwise
     """
-    # Exact match
-    if required in user_permissions:
-        return True
-
-    # Check for full wildcard
-    if "*" in user_permissions:
-        return True
-
-    # Check for resource wildcard (e.g., "users:*" for "users:read")
-    if ":" in required:
-        resource, _ = required.split(":", 1)
-        if f"{resource}:*" in user_permissions:
-            return True
-
-    return False
+    if not isinstance(user_permissions, PermissionSet):
+        user_permissions = PermissionSet(user_permissions)
+    return user_permissions.allows(required)
 
 
 # Common permission dependencies
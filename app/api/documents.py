@@ -1,13 +1,20 @@
 """Document management routes matching API spec."""
 
-import math
-from typing import Annotated
+from typing import Annotated, Any, NoReturn
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.redis import (
+    get_cached_response,
+    invalidate_cached_responses,
+    response_cache_index,
+    response_cache_key,
+    set_cached_response,
+)
+from app.core.responses import dump_json, etag_response, minimal_response
 from app.models import User
 from app.schemas.document import (
     BatchDeleteRequest,
@@ -22,61 +29,149 @@ from app.schemas.document import (
     DocumentUnshare,
     DocumentUpdate,
 )
-from app.schemas.user import PaginationMeta, UserBasicResponse
 from app.services.document_service import DocumentService
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
+# Most tag names a list request may filter on
+_MAX_TAG_FILTERS = 20
+
+
+async def _invalidate_document_lists(*user_ids: str | None) -> None:
+    """Drop cached document lists of the given users after a write.
 
-def _build_document_response(document) -> DocumentResponse:
-    """Build document response from model."""
-    tags = [dt.tag.name for dt in document.tags] if document.tags else []
-    return DocumentResponse(
-        id=document.id,
-        title=document.title,
-        content=document.content,
-        folderId=document.folder,
-        tags=tags,
-        author=UserBasicResponse(
-            id=document.owner.id,
-            email=document.owner.email,
-            name=document.owner.name,
-            avatar=document.owner.avatar,
-        ),
-        created_at=document.created_at,
-        updated_at=document.updated_at,
+    Args:
+        user_ids: Users whose lists may have changed; None entries are ignored
+    """
+    await invalidate_cached_responses(
+        *(response_cache_index("documents", user_id) for user_id in user_ids if user_id)
+    )
+
+
+def _document_payload(document, owner: User | None = None) -> dict[str, Any]:
+    """Build the DocumentResponse payload as a plain dict.
+
+    Routes return the dict as is: FastAPI validates it against the route's
+    ``response_model`` once, so no intermediate model is built per response.
+
+    Args:
+        document: Document with tags loaded
+        owner: Document owner when already at hand (skips loading document.owner)
+
+    Returns:
+        Document response payload
+    """
+    owner = owner or document.owner
+    return {
+        "id": document.id,
+        "title": document.title,
+        "content": document.content,
+        "folderId": document.folder,
+        "tags": [dt.tag.name for dt in document.tags],
+        "author": {
+            "id": owner.id,
+            "email": owner.email,
+            "name": owner.name,
+            "avatar": owner.avatar,
+        },
+        "created_at": document.created_at,
+        "updated_at": document.updated_at,
+    }
+
+
+def _parse_tag_filter(tags: str | None) -> list[str] | None:
+    """Parse the comma-separated tag filter of a list request.
+
+    Blank and repeated names are dropped, keeping the order of first use.
+
+    Args:
+        tags: Raw ``tags`` query parameter
+
+    Returns:
+        Distinct tag names, or None when no tag filter was given
+
+    Raises:
+        HTTPException: If more than _MAX_TAG_FILTERS distinct tags are given
+    """
+    if not tags:
+        return None
+    tag_list = list(dict.fromkeys(name for name in tags.split(",") if name))
+    if len(tag_list) > _MAX_TAG_FILTERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {_MAX_TAG_FILTERS} tags can be filtered on",
+        )
+    return tag_list or None
+
+
+async def _raise_not_owned(
+    document_service: DocumentService, document_id: str, action: str
+) -> NoReturn:
+    """Raise 404 or 403 after an owner-scoped write matched no document.
+
+    Only runs on the failure path, so successful writes skip the ownership query.
+
+    Args:
+        document_service: Document service
+        document_id: Document ID
+        action: Attempted action, used in the 403 message
+
+    Raises:
+        HTTPException: 404 if the document does not exist, 403 otherwise
+    """
+    if await document_service.get_owner_id(document_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=f"Only document owner can {action}",
     )
 
 
 @router.get("", response_model=DocumentListResponse)
 async def list_documents(
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     folderId: str | None = None,
     tags: str | None = None,
     search: str | None = None,
-) -> DocumentListResponse:
+) -> Response:
     """Get paginated document list.
 
+    Non-empty pages are cached briefly in Redis, keyed on the user and query.
+
     Args:
+        request: Incoming request
         db: Database session
         current_user: Current authenticated user
         page: Page number
         limit: Items per page
         folderId: Filter by folder ID
-        tags: Filter by tags (comma-separated)
+        tags: Filter by tags (comma-separated, at most _MAX_TAG_FILTERS)
         search: Search in title
 
     Returns:
         Paginated document list
+
+    Raises:
+        HTTPException: If too many tags are given
     """
-    document_service = DocumentService(db)
+    tag_list = _parse_tag_filter(tags)
 
-    tag_list = tags.split(",") if tags else None
+    cache_index = response_cache_index("documents", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
 
-    documents, total = document_service.get_list(
+    document_service = DocumentService(db)
+
+    documents, total = await document_service.get_list(
         user_id=current_user.id,
         page=page,
         limit=limit,
@@ -84,24 +179,33 @@ async def list_documents(
         tags=tag_list,
         search=search,
     )
-
-    return DocumentListResponse(
-        data=[_build_document_response(doc) for doc in documents],
-        meta=PaginationMeta(
-            total=total,
-            page=page,
-            limit=limit,
-            totalPages=math.ceil(total / limit) if total > 0 else 1,
-        ),
+    owners = await document_service.get_owners(documents, known=current_user)
+
+    # Plain dicts encoded by orjson; no response models are built per row
+    body = dump_json(
+        {
+            "data": [_document_payload(doc, owner=owners[doc.owner_id]) for doc in documents],
+            "meta": {
+                "total": total,
+                "page": page,
+                "limit": limit,
+                "totalPages": (total + limit - 1) // limit or 1,
+            },
+        }
     )
 
+    # Empty pages are cheap to serve and not worth the cache entry
+    if documents:
+        await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
+
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     document_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> DocumentResponse:
+) -> dict[str, Any]:
     """Get document by ID.
 
     Args:
@@ -117,22 +221,22 @@ async def get_document(
     """
     document_service = DocumentService(db)
 
-    if not document_service.can_access(document_id, current_user.id):
+    if not await document_service.can_access(document_id, current_user.id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Document not found",
         )
 
-    document = document_service.get_by_id(document_id)
-    return _build_document_response(document)
+    document = await document_service.get_by_id(document_id)
+    return _document_payload(document)
 
 
 @router.post("", response_model=DocumentResponse, status_code=status.HTTP_201_CREATED)
 async def create_document(
     document_data: DocumentCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> DocumentResponse:
+) -> dict[str, Any]:
     """Create a new document.
 
     Args:
@@ -144,18 +248,19 @@ async def create_document(
         Created document
     """
     document_service = DocumentService(db)
-    document = document_service.create(document_data, current_user.id)
+    document = await document_service.create(document_data, current_user.id)
+    await _invalidate_document_lists(current_user.id)
 
-    return _build_document_response(document)
+    return _document_payload(document)
 
 
 @router.put("/{document_id}", response_model=DocumentResponse)
 async def update_document(
     document_id: str,
     document_data: DocumentUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> DocumentResponse:
+) -> dict[str, Any]:
     """Update document content.
 
     Args:
@@ -172,30 +277,22 @@ async def update_document(
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can update",
-        )
-
-    document = document_service.update(document_id, document_data)
+    document = await document_service.update(document_id, current_user.id, document_data)
 
     if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
+        await _raise_not_owned(document_service, document_id, "update")
 
-    return _build_document_response(document)
+    await _invalidate_document_lists(current_user.id)
+    return _document_payload(document, owner=current_user)
 
 
 @router.patch("/{document_id}/rename", response_model=DocumentResponse)
 async def rename_document(
     document_id: str,
     rename_data: DocumentRename,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> DocumentResponse:
+) -> dict[str, Any]:
     """Rename document.
 
     Args:
@@ -212,30 +309,22 @@ async def rename_document(
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can rename",
-        )
-
-    document = document_service.rename(document_id, rename_data.title)
+    document = await document_service.rename(document_id, current_user.id, rename_data.title)
 
     if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
+        await _raise_not_owned(document_service, document_id, "rename")
 
-    return _build_document_response(document)
+    await _invalidate_document_lists(current_user.id)
+    return _document_payload(document, owner=current_user)
 
 
 @router.post("/{document_id}/move", response_model=DocumentResponse)
 async def move_document(
     document_id: str,
     move_data: DocumentMove,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> DocumentResponse:
+) -> dict[str, Any]:
     """Move document to folder.
 
     Args:
@@ -252,30 +341,22 @@ async def move_document(
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can move",
-        )
-
-    document = document_service.move(document_id, move_data.folderId)
+    document = await document_service.move(document_id, current_user.id, move_data.folderId)
 
     if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
+        await _raise_not_owned(document_service, document_id, "move")
 
-    return _build_document_response(document)
+    await _invalidate_document_lists(current_user.id)
+    return _document_payload(document, owner=current_user)
 
 
 @router.post("/{document_id}/tags", response_model=DocumentResponse)
 async def update_document_tags(
     document_id: str,
     tags_data: DocumentTagsUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> DocumentResponse:
+) -> dict[str, Any]:
     """Update document tags.
 
     Args:
@@ -292,116 +373,113 @@ async def update_document_tags(
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can update tags",
-        )
-
-    document = document_service.update_tags(document_id, tags_data.tags)
+    document = await document_service.update_tags(document_id, current_user.id, tags_data.tags)
 
     if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
+        await _raise_not_owned(document_service, document_id, "update tags")
 
-    return _build_document_response(document)
+    await _invalidate_document_lists(current_user.id)
+    return _document_payload(document, owner=current_user)
 
 
-@router.post("/{document_id}/share")
+@router.post("/{document_id}/share", response_model=dict[str, str])
 async def share_document(
     document_id: str,
     share_data: DocumentShare,
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> dict[str, str]:
+) -> Response:
     """Share document with user or team.
 
     Args:
         document_id: Document ID
         share_data: Share data
+        request: Incoming request
         db: Database session
         current_user: Current authenticated user
 
     Returns:
-        Success message
+        Success message, or an empty 204 for ``Prefer: return=minimal``
 
     Raises:
         HTTPException: If document not found or not owner
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can share",
-        )
-
-    share = document_service.share(
+    share = await document_service.share(
         document_id,
+        current_user.id,
         user_id=share_data.userId,
         team_id=share_data.teamId,
         permission=share_data.permission,
     )
 
     if not share:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
+        await _raise_not_owned(document_service, document_id, "share")
 
-    return {"message": "Document shared successfully"}
+    await _invalidate_document_lists(current_user.id, share_data.userId)
+    return minimal_response(request, {"message": "Document shared successfully"})
 
 
-@router.post("/{document_id}/unshare")
+@router.post("/{document_id}/unshare", response_model=dict[str, str])
 async def unshare_document(
     document_id: str,
     unshare_data: DocumentUnshare,
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> dict[str, str]:
+) -> Response:
     """Remove share from document.
 
     Args:
         document_id: Document ID
         unshare_data: Unshare data
+        request: Incoming request
         db: Database session
         current_user: Current authenticated user
 
     Returns:
-        Success message
+        Success message, or an empty 204 for ``Prefer: return=minimal``
 
     Raises:
         HTTPException: If document not found or not owner
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can unshare",
-        )
-
-    unshared = document_service.unshare(
+    unshared = await document_service.unshare(
         document_id,
+        current_user.id,
         user_id=unshare_data.userId,
         team_id=unshare_data.teamId,
     )
 
     if not unshared:
+        # Nothing deleted: tell a missing share apart from a foreign document
+        owner_id = await document_service.get_owner_id(document_id)
+        if owner_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Document not found",
+            )
+        if owner_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only document owner can unshare",
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Share not found",
         )
 
-    return {"message": "Document unshared successfully"}
+    await _invalidate_document_lists(current_user.id, unshare_data.userId)
+    return minimal_response(request, {"message": "Document unshared successfully"})
 
 
 @router.post("/batch-delete", response_model=BatchDeleteResponse)
 async def batch_delete_documents(
     delete_data: BatchDeleteRequest,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> BatchDeleteResponse:
     """Batch delete documents.
@@ -415,7 +493,8 @@ async def batch_delete_documents(
         Delete result
     """
     document_service = DocumentService(db)
-    deleted_count = document_service.batch_delete(delete_data.ids, current_user.id)
+    deleted_count = await document_service.batch_delete(delete_data.ids, current_user.id)
+    await _invalidate_document_lists(current_user.id)
 
     return BatchDeleteResponse(
         message=f"Successfully deleted {deleted_count} documents",
@@ -423,39 +502,35 @@ async def batch_delete_documents(
     )
 
 
-@router.delete("/{document_id}")
+@router.delete("/{document_id}", response_model=dict[str, str])
 async def delete_document(
     document_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> dict[str, str]:
+) -> Response:
     """Delete document.
 
     Args:
         document_id: Document ID
+        request: Incoming request
         db: Database session
         current_user: Current authenticated user
 
     Returns:
-        Success message
+        Success message, or an empty 204 for ``Prefer: return=minimal``
 
     Raises:
         HTTPException: If document not found or not owner
     """
     document_service = DocumentService(db)
 
-    if not document_service.is_owner(document_id, current_user.id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only document owner can delete",
-        )
-
-    deleted = document_service.delete(document_id)
+    deleted = await document_service.delete(document_id, current_user.id)
 
     if not deleted:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Document not found",
-        )
+        await _raise_not_owned(document_service, document_id, "delete")
 
-    return {"message": "Document successfully deleted", "id": document_id}
+    await _invalidate_document_lists(current_user.id)
+    return minimal_response(
+        request, {"message": "Document successfully deleted", "id": document_id}
+    )
@@ -1,20 +1,46 @@
 """File management routes matching API spec."""
 
-import math
+import base64
+import binascii
+import re
 import secrets
 from datetime import UTC, datetime, timedelta
-from typing import Annotated
-
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from typing import Annotated, Any
+
+from cachetools import TTLCache
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from pydantic import BaseModel, Field
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import ColumnElement, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.redis import (
+    adjust_storage_used,
+    get_cached_response,
+    get_storage_used,
+    invalidate_cached_responses,
+    response_cache_index,
+    response_cache_key,
+    set_cached_response,
+    set_storage_used,
+)
+from app.core.responses import ORJSONResponse, dump_json, etag_response, minimal_response
 from app.models import File, FileAccessLog, FileShare, Team, TeamMember, User
-from app.models.base import generate_cuid
-from app.schemas.user import PaginationMeta, UserBasicResponse
+from app.models.base import generate_cuid, is_cuid
+from app.schemas.user import UserBasicResponse
 
 router = APIRouter(prefix="/files", tags=["Files"])
 
@@ -89,9 +115,23 @@ class FileResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class FileListMeta(BaseModel):
+    limit: int
+    hasMore: bool
+    nextCursor: str | None = None
+    # Only on page-addressed requests (no cursor)
+    total: int | None = None
+    page: int | None = None
+    totalPages: int | None = None
+
+
 class FileListResponse(BaseModel):
     data: list[FileResponse]
-    meta: PaginationMeta
+    meta: FileListMeta
+
+
+class FileCountResponse(BaseModel):
+    total: int
 
 
 class StorageInfo(BaseModel):
@@ -110,68 +150,389 @@ class BatchDeleteResponse(BaseModel):
 
 
 # ============== Helper ==============
-def _build_file_response(file: File) -> FileResponse:
-    return FileResponse(
-        id=file.id,
-        name=file.name,
-        path=file.path,
-        mimeType=file.mime_type,
-        size=file.size,
-        thumbnail=file.thumbnail,
-        folderId=file.folder_id,
-        isFavorite=file.is_favorite,
-        owner=UserBasicResponse(
-            id=file.owner.id,
-            email=file.owner.email,
-            name=file.owner.name,
-            avatar=file.owner.avatar,
-        ),
-        created_at=file.created_at,
-        updated_at=file.updated_at,
-    )
+def _file_payload(file: File, owner: User | None = None) -> dict[str, Any]:
+    """Build the FileResponse payload as a plain dict.
+
+    Routes return the dict as is: FastAPI validates it against the route's
+    ``response_model`` once, so no intermediate model is built per response.
+
+    Args:
+        file: File to serialize
+        owner: Owner already in hand (the current user); avoids loading ``file.owner``
+
+    Returns:
+        File response payload
+    """
+    owner = owner or file.owner
+    return {
+        "id": file.id,
+        "name": file.name,
+        "path": file.path,
+        "mimeType": file.mime_type,
+        "size": file.size,
+        "thumbnail": file.thumbnail,
+        "folderId": file.folder_id,
+        "isFavorite": file.is_favorite,
+        "owner": {
+            "id": owner.id,
+            "email": owner.email,
+            "name": owner.name,
+            "avatar": owner.avatar,
+        },
+        "created_at": file.created_at,
+        "updated_at": file.updated_at,
+    }
+
+
+def _share_url_prefix(request: Request) -> str:
+    """Share link prefix; a share URL is this prefix followed by the token.
+
+    Uses the configured ``PUBLIC_BASE_URL`` when set, which is also correct
+    behind proxies that rewrite the Host header.
+
+    Args:
+        request: Incoming request, used when no public base URL is configured
+
+    Returns:
+        Share link prefix ending with a slash
+    """
+    base_url = settings.PUBLIC_BASE_URL or str(request.base_url)
+    return f"{base_url.rstrip('/')}{settings.API_PREFIX}/files/shared/"
+
+
+def _share_payload(share: FileShare, url_prefix: str) -> dict[str, Any]:
+    """Build the FileShareResponse payload as a plain dict.
+
+    Args:
+        share: File share to serialize
+        url_prefix: Share link prefix from _share_url_prefix
+
+    Returns:
+        File share response payload
+    """
+    return {
+        "id": share.id,
+        "shareToken": share.share_token,
+        "shareUrl": url_prefix + share.share_token,
+        "permission": share.permission,
+        "expiresAt": share.expires_at,
+        "accessCount": share.access_count,
+        "maxAccessCount": share.max_access_count,
+        "isRevoked": share.is_revoked,
+        "createdAt": share.created_at,
+    }
+
+
+def _encode_cursor(timestamp: datetime, row_id: str) -> str:
+    """Encode the sort key of a page's last row as an opaque pagination cursor.
+
+    Args:
+        timestamp: Sort timestamp of the last row (e.g. ``updated_at``)
+        row_id: ID of the last row, breaking timestamp ties
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a pagination cursor back into its ``(timestamp, id)`` sort key.
+
+    Args:
+        cursor: Cursor returned as ``meta.nextCursor``
+
+    Returns:
+        Tuple of (timestamp, id)
+
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from None
+
+
+# Top-level media types; ``type=image`` etc. becomes a prefix match on "image/"
+_MIME_TOP_LEVEL_TYPES = frozenset({"application", "audio", "font", "image", "text", "video"})
+
+# Shorthands for common subtypes, matched exactly
+_MIME_TYPE_ALIASES = {"pdf": "application/pdf"}
+
+# Random bytes per share token: 144 bits, encoded as 24 URL-safe characters
+_SHARE_TOKEN_BYTES = 18
+
+# Shape of current (24 chars) and earlier (43 chars) share tokens; anything
+# else is rejected before the lookup
+_SHARE_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_-]{24,43}")
+
+# Share token -> ((id, expires_at, team_id, shared_with_id, permission), rendered
+# file) for repeated share-link visits. Only column values are kept; the loaded
+# FileShare stays with the request. Revocation and the access limit are still
+# enforced by the counting UPDATE; file changes may show up to the TTL late.
+# Only touched from the event loop, so no lock.
+_shared_files: TTLCache[
+    str, tuple[tuple[str, datetime | None, str | None, str | None, str], dict[str, Any]]
+] = TTLCache(maxsize=10_000, ttl=30)
+
+
+def _mime_type_filter(mime_type: str) -> ColumnElement[bool]:
+    """Criterion for the ``type`` filter of list and count.
+
+    Top-level types, full MIME types (e.g. ``application/pdf``, which also
+    matches values carrying parameters) and known aliases become an anchored
+    prefix or exact match, which the ``(owner_id, mime_type)`` index can serve.
+    Anything else falls back to a substring ILIKE, backed by the trigram index
+    on ``mime_type``.
+
+    Args:
+        mime_type: Value of the ``type`` query parameter
+
+    Returns:
+        Filter criterion on File.mime_type
+    """
+    normalized = mime_type.lower()
+    if normalized in _MIME_TOP_LEVEL_TYPES:
+        return File.mime_type.like(f"{normalized}/%")
+    if normalized in _MIME_TYPE_ALIASES:
+        return File.mime_type == _MIME_TYPE_ALIASES[normalized]
+    if "/" in normalized:
+        return File.mime_type.startswith(normalized, autoescape=True)
+    return File.mime_type.ilike(f"%{mime_type}%")
+
+
+def _file_filters(
+    owner_id: str, folder_id: str | None, mime_type: str | None
+) -> list[ColumnElement[bool]]:
+    """Owner and optional folder/type criteria shared by list and count."""
+    filters = [File.owner_id == owner_id]
+    if folder_id:
+        filters.append(File.folder_id == folder_id)
+    if mime_type:
+        filters.append(_mime_type_filter(mime_type))
+    return filters
+
+
+def _list_load_options() -> list[ORMOption]:
+    """Loader options for list queries.
+
+    Listed rows are rendered without relationships (the owner is always the
+    current user), so in debug and test runs any lazy load fails loudly.
+    """
+    if settings.DEBUG or settings.ENVIRONMENT == "test":
+        return [raiseload("*")]
+    return []
+
+
+async def _get_owned_file(db: AsyncSession, file_id: str, owner_id: str) -> File | None:
+    """Get a file by ID if it belongs to the given user.
+
+    Args:
+        db: Database session
+        file_id: File ID
+        owner_id: User who must own the file
+
+    Returns:
+        File or None if not found or owned by someone else
+    """
+    if not is_cuid(file_id):
+        return None
+    # Primary key lookup: served from the identity map if already loaded
+    file = await db.get(File, file_id)
+    if file is None or file.owner_id != owner_id:
+        return None
+    return file
+
+
+async def _owns_file(db: AsyncSession, file_id: str, owner_id: str) -> bool:
+    """Check that a file exists and belongs to the given user.
+
+    For routes that only need the ownership check; no File row is loaded.
+
+    Args:
+        db: Database session
+        file_id: File ID
+        owner_id: User who must own the file
+
+    Returns:
+        True if the file exists and is owned by the user
+    """
+    if not is_cuid(file_id):
+        return False
+    owned_id = await db.scalar(select(File.id).where(File.id == file_id, File.owner_id == owner_id))
+    return owned_id is not None
+
+
+async def _log_file_access(
+    file_id: str,
+    share_id: str,
+    user_id: str | None,
+    ip_address: str | None,
+    user_agent: str | None,
+) -> None:
+    """Record a shared-file view.
+
+    Runs as a background task on its own session, since the request session is
+    closed once the response has been sent. A failed insert loses one log entry.
+
+    Args:
+        file_id: Viewed file ID
+        share_id: Share the file was accessed through
+        user_id: Viewing user, if authenticated
+        ip_address: Client IP address
+        user_agent: Client User-Agent header
+    """
+    async with AsyncSessionLocal() as session:
+        # Core insert: the row is never read back, so skip the unit of work
+        await session.execute(
+            insert(FileAccessLog).values(
+                id=generate_cuid(),
+                file_id=file_id,
+                share_id=share_id,
+                user_id=user_id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                action="view",
+            )
+        )
+        await session.commit()
 
 
 # ============== Routes ==============
 @router.get("", response_model=FileListResponse)
 async def list_files(
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-    page: int = Query(1, ge=1),
+    cursor: str | None = None,
+    page: int | None = Query(None, ge=1),
     limit: int = Query(10, ge=1, le=100),
     folderId: str | None = None,
     type: str | None = None,
-) -> FileListResponse:
-    """Get paginated file list."""
-    query = db.query(File).filter(File.owner_id == current_user.id)
-    query = query.options(joinedload(File.owner))
-
-    if folderId:
-        query = query.filter(File.folder_id == folderId)
-    if type:
-        query = query.filter(File.mime_type.ilike(f"%{type}%"))
-
-    total = query.count()
-    offset = (page - 1) * limit
-    files = query.order_by(File.updated_at.desc()).offset(offset).limit(limit).all()
-
-    return FileListResponse(
-        data=[_build_file_response(f) for f in files],
-        meta=PaginationMeta(
-            total=total,
-            page=page,
-            limit=limit,
-            totalPages=math.ceil(total / limit) if total > 0 else 1,
-        ),
+) -> Response:
+    """Get file list, newest first.
+
+    Pages are addressed either by ``cursor`` (the previous page's
+    ``meta.nextCursor``) or, as in the shared API spec, by ``page``. Cursor pages
+    are an index seek on ``(owner_id, updated_at, id)`` regardless of depth and
+    carry no total. Page-addressed requests (the default when no cursor is
+    given) also return ``total``/``page``/``totalPages``, counting only when the
+    page itself doesn't reveal the total, plus a ``nextCursor`` to continue
+    with. Non-empty pages are cached briefly in Redis.
+
+    Raises:
+        HTTPException: If both ``cursor`` and ``page`` are given, or the cursor
+            is malformed
+    """
+    if cursor and page is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or page, not both",
+        )
+
+    cache_index = response_cache_index("files", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
+    filters = _file_filters(current_user.id, folderId, type)
+    query = select(File).order_by(File.updated_at.desc(), File.id.desc())
+
+    offset = 0
+    if cursor:
+        cursor_updated_at, cursor_id = _decode_cursor(cursor)
+        query = query.where(tuple_(File.updated_at, File.id) < tuple_(cursor_updated_at, cursor_id))
+    else:
+        page = page or 1
+        offset = (page - 1) * limit
+
+    # Fetch one extra row to learn whether another page exists
+    files = (
+        await db.scalars(
+            query.where(*filters).offset(offset).limit(limit + 1).options(*_list_load_options())
+        )
+    ).all()
+    has_more = len(files) > limit
+    files = files[:limit]
+
+    meta: dict[str, Any] = {
+        "limit": limit,
+        "hasMore": has_more,
+        "nextCursor": (_encode_cursor(files[-1].updated_at, files[-1].id) if has_more else None),
+    }
+    if page is not None:
+        if not has_more and (files or page == 1):
+            # The last page (or an empty first page) already tells the total
+            total = offset + len(files)
+        else:
+            total = (await db.scalar(select(func.count()).select_from(File).where(*filters))) or 0
+        meta["total"] = total
+        meta["page"] = page
+        meta["totalPages"] = (total + limit - 1) // limit or 1
+
+    # Plain dicts encoded by orjson; no response models are built per row
+    body = dump_json({"data": [_file_payload(f, owner=current_user) for f in files], "meta": meta})
+
+    # Empty pages are cheap to serve and not worth the cache entry
+    if files:
+        await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
+
+
+@router.get("/count", response_model=FileCountResponse)
+async def count_files(
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    folderId: str | None = None,
+    type: str | None = None,
+) -> Response:
+    """Count files matching the list filters.
+
+    The count scans every matching row, so cursor-paged lists leave it out and
+    clients fetch it here instead; it is cached in Redis alongside the file list
+    pages (per user and filters).
+    """
+    cache_index = response_cache_index("files", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
+    total = await db.scalar(
+        select(func.count())
+        .select_from(File)
+        .where(*_file_filters(current_user.id, folderId, type))
     )
+    body = dump_json({"total": total or 0})
+    await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
 
 
 @router.get("/storage", response_model=StorageInfo)
 async def get_storage(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> StorageInfo:
-    """Get storage usage information."""
-    used = db.query(func.sum(File.size)).filter(File.owner_id == current_user.id).scalar() or 0
+    """Get storage usage information.
+
+    Usage comes from a per-user Redis counter kept up to date by file writes;
+    ``SUM(size)`` only runs when the counter is missing.
+    """
+    used = await get_storage_used(current_user.id)
+    if used is None:
+        # SUM(bigint) comes back as numeric (Decimal) on PostgreSQL
+        used = int(
+            await db.scalar(select(func.sum(File.size)).where(File.owner_id == current_user.id))
+            or 0
+        )
+        await set_storage_used(current_user.id, used)
     total = 10 * 1024 * 1024 * 1024  # 10GB default quota
     percentage = (used / total) * 100 if total > 0 else 0
 
@@ -180,7 +541,7 @@ async def get_storage(
 
 @router.get("/storage-info", response_model=StorageInfo)
 async def get_storage_info(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> StorageInfo:
     """Get storage information (alias)."""
@@ -190,31 +551,26 @@ async def get_storage_info(
 @router.get("/{file_id}", response_model=FileResponse)
 async def get_file(
     file_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileResponse:
+) -> dict[str, Any]:
     """Get file by ID."""
-    file = (
-        db.query(File)
-        .filter(File.id == file_id, File.owner_id == current_user.id)
-        .options(joinedload(File.owner))
-        .first()
-    )
+    file = await _get_owned_file(db, file_id, current_user.id)
 
     if not file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    return _build_file_response(file)
+    return _file_payload(file, owner=current_user)
 
 
 @router.get("/{file_id}/download-url")
 async def get_download_url(
     file_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Generate file download URL."""
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
+    file = await _get_owned_file(db, file_id, current_user.id)
 
     if not file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
@@ -227,9 +583,9 @@ async def get_download_url(
 @router.post("/upload", response_model=FileResponse, status_code=status.HTTP_201_CREATED)
 async def upload_file(
     file_data: FileCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileResponse:
+) -> dict[str, Any]:
     """Upload a file (metadata only, actual upload handled separately)."""
     file = File(
         id=generate_cuid(),
@@ -242,101 +598,123 @@ async def upload_file(
     )
 
     db.add(file)
-    db.commit()
-    db.refresh(file)
+    await db.flush()
+    response = _file_payload(file, owner=current_user)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
+    await adjust_storage_used(current_user.id, file_data.size)
 
-    file = db.query(File).filter(File.id == file.id).options(joinedload(File.owner)).first()
-    return _build_file_response(file)
+    return response
 
 
 @router.patch("/{file_id}/rename", response_model=FileResponse)
 async def rename_file(
     file_id: str,
     rename_data: FileRename,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileResponse:
+) -> dict[str, Any]:
     """Rename file."""
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
+    file = await _get_owned_file(db, file_id, current_user.id)
 
     if not file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
     file.name = rename_data.name
-    db.commit()
+    await db.flush()
+    response = _file_payload(file, owner=current_user)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
 
-    file = db.query(File).filter(File.id == file.id).options(joinedload(File.owner)).first()
-    return _build_file_response(file)
+    return response
 
 
 @router.post("/{file_id}/move", response_model=FileResponse)
 async def move_file(
     file_id: str,
     move_data: FileMove,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileResponse:
+) -> dict[str, Any]:
     """Move file to folder."""
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
+    file = await _get_owned_file(db, file_id, current_user.id)
 
     if not file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
     file.folder_id = move_data.folderId
-    db.commit()
+    await db.flush()
+    response = _file_payload(file, owner=current_user)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
 
-    file = db.query(File).filter(File.id == file.id).options(joinedload(File.owner)).first()
-    return _build_file_response(file)
+    return response
 
 
 @router.post("/{file_id}/copy", response_model=FileResponse, status_code=status.HTTP_201_CREATED)
 async def copy_file(
     file_id: str,
     copy_data: FileCopy,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileResponse:
-    """Copy file."""
-    original = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
+) -> dict[str, Any]:
+    """Copy file.
 
-    if not original:
+    The copy is inserted straight from the source row with INSERT ... SELECT,
+    scoped to the owner, so the source is never loaded into Python.
+    """
+    if not is_cuid(file_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    new_file = File(
-        id=generate_cuid(),
-        name=copy_data.name or f"{original.name} (copy)",
-        path=original.path,
-        mime_type=original.mime_type,
-        size=original.size,
-        thumbnail=original.thumbnail,
-        folder_id=copy_data.folderId or original.folder_id,
-        owner_id=current_user.id,
+    source = select(
+        literal(generate_cuid()),
+        literal(copy_data.name) if copy_data.name else File.name.concat(" (copy)"),
+        File.path,
+        File.mime_type,
+        File.size,
+        File.thumbnail,
+        literal(copy_data.folderId) if copy_data.folderId else File.folder_id,
+        File.owner_id,
+    ).where(File.id == file_id, File.owner_id == current_user.id)
+    new_file = await db.scalar(
+        insert(File)
+        .from_select(
+            ["id", "name", "path", "mime_type", "size", "thumbnail", "folder_id", "owner_id"],
+            source,
+        )
+        .returning(File)
     )
 
-    db.add(new_file)
-    db.commit()
+    if not new_file:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    response = _file_payload(new_file, owner=current_user)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
+    await adjust_storage_used(current_user.id, response["size"])
 
-    new_file = db.query(File).filter(File.id == new_file.id).options(joinedload(File.owner)).first()
-    return _build_file_response(new_file)
+    return response
 
 
 @router.patch("/{file_id}/favorite", response_model=FileResponse)
 async def toggle_favorite(
     file_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileResponse:
+) -> dict[str, Any]:
     """Toggle file favorite status."""
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
+    file = await _get_owned_file(db, file_id, current_user.id)
 
     if not file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
     file.is_favorite = not file.is_favorite
-    db.commit()
+    await db.flush()
+    response = _file_payload(file, owner=current_user)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
 
-    file = db.query(File).filter(File.id == file.id).options(joinedload(File.owner)).first()
-    return _build_file_response(file)
+    return response
 
 
 @router.post(
@@ -346,9 +724,9 @@ async def share_file(
     file_id: str,
     share_data: ShareFileData,
     request: Request,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> FileShareResponse:
+) -> dict[str, Any]:
     """
     Share file with user or team.
 
@@ -360,8 +738,7 @@ async def share_file(
     - Validate team membership if sharing with team
     """
     # Verify file ownership
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
-    if not file:
+    if not await _owns_file(db, file_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
     # Validate share data
@@ -373,7 +750,7 @@ async def share_file(
 
     # Validate user exists
     if share_data.userId:
-        target_user = db.query(User).filter(User.id == share_data.userId).first()
+        target_user = await db.get(User, share_data.userId)
         if not target_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Target user not found"
@@ -381,18 +758,18 @@ async def share_file(
 
     # Validate team exists and membership
     if share_data.teamId:
-        team = db.query(Team).filter(Team.id == share_data.teamId).first()
+        team = await db.get(Team, share_data.teamId)
         if not team:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Team not found")
 
         # Verify current user is team member or owner
         is_member = (
-            db.query(TeamMember)
-            .filter(
-                TeamMember.team_id == share_data.teamId,
-                TeamMember.user_id == current_user.id,
+            await db.scalar(
+                select(TeamMember.user_id).where(
+                    TeamMember.team_id == share_data.teamId,
+                    TeamMember.user_id == current_user.id,
+                )
             )
-            .first()
             is not None
         )
         is_owner = team.owner_id == current_user.id
@@ -403,17 +780,13 @@ async def share_file(
                 detail="You must be a team member to share with this team",
             )
 
-    # Check if share already exists
-    existing_share = (
-        db.query(FileShare)
-        .filter(
-            FileShare.file_id == file_id,
-            FileShare.shared_with_id == share_data.userId if share_data.userId else False,
-            FileShare.team_id == share_data.teamId if share_data.teamId else False,
-            ~FileShare.is_revoked,
-        )
-        .first()
-    )
+    # Check if share already exists for the requested user and/or team
+    share_conditions = [FileShare.file_id == file_id, ~FileShare.is_revoked]
+    if share_data.userId:
+        share_conditions.append(FileShare.shared_with_id == share_data.userId)
+    if share_data.teamId:
+        share_conditions.append(FileShare.team_id == share_data.teamId)
+    existing_share = await db.scalar(select(FileShare.id).where(*share_conditions).limit(1))
 
     if existing_share:
         raise HTTPException(
@@ -422,7 +795,7 @@ async def share_file(
         )
 
     # Generate unique share token
-    share_token = secrets.token_urlsafe(32)
+    share_token = secrets.token_urlsafe(_SHARE_TOKEN_BYTES)
 
     # Calculate expiration
     expires_at = None
@@ -430,45 +803,36 @@ async def share_file(
         expires_at = datetime.now(UTC) + timedelta(days=share_data.expiresInDays)
 
     # Create file share
-    file_share = FileShare(
-        id=generate_cuid(),
-        file_id=file_id,
-        shared_with_id=share_data.userId,
-        team_id=share_data.teamId,
-        permission=share_data.permission,
-        share_token=share_token,
-        expires_at=expires_at,
-        max_access_count=share_data.maxAccessCount,
-    )
+    # Single INSERT ... RETURNING also yields the server defaults (count, timestamps)
+    file_share = (
+        await db.execute(
+            insert(FileShare)
+            .values(
+                id=generate_cuid(),
+                file_id=file_id,
+                shared_with_id=share_data.userId,
+                team_id=share_data.teamId,
+                permission=share_data.permission,
+                share_token=share_token,
+                expires_at=expires_at,
+                max_access_count=share_data.maxAccessCount,
+            )
+            .returning(FileShare)
+        )
+    ).scalar_one()
+    await db.commit()
 
-    db.add(file_share)
-    db.commit()
-    db.refresh(file_share)
-
-    # Generate share URL
-    base_url = str(request.base_url).rstrip("/")
-    share_url = f"{base_url}/api/files/shared/{share_token}"
-
-    return FileShareResponse(
-        id=file_share.id,
-        shareToken=file_share.share_token,
-        shareUrl=share_url,
-        permission=file_share.permission,
-        expiresAt=file_share.expires_at,
-        accessCount=file_share.access_count,
-        maxAccessCount=file_share.max_access_count,
-        isRevoked=file_share.is_revoked,
-        createdAt=file_share.created_at,
-    )
+    return _share_payload(file_share, _share_url_prefix(request))
 
 
 @router.get("/shared/{share_token}", response_model=FileResponse)
 async def access_shared_file(
     share_token: str,
     request: Request,
-    db: Annotated[Session, Depends(get_db)],
+    background_tasks: BackgroundTasks,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User | None, Depends(get_current_active_user)] = None,
-) -> FileResponse:
+) -> dict[str, Any]:
     """
     Access file via share token.
 
@@ -479,36 +843,47 @@ async def access_shared_file(
     - Log access
     - Verify permissions
     """
-    # Find share by token
-    file_share = (
-        db.query(FileShare)
-        .filter(FileShare.share_token == share_token, ~FileShare.is_revoked)
-        .options(joinedload(FileShare.file).joinedload(File.owner))
-        .first()
-    )
-
-    if not file_share:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found or revoked"
+    # Find share by token (share and rendered file are cached briefly per process)
+    cached = _shared_files.get(share_token)
+    if cached is None:
+        if not _SHARE_TOKEN_PATTERN.fullmatch(share_token):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found or revoked"
+            )
+        file_share = await db.scalar(
+            select(FileShare)
+            .where(FileShare.share_token == share_token, ~FileShare.is_revoked)
+            .options(joinedload(FileShare.file).joinedload(File.owner))
+        )
+        if not file_share:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found or revoked"
+            )
+        cached = _shared_files[share_token] = (
+            (
+                file_share.id,
+                file_share.expires_at,
+                file_share.team_id,
+                file_share.shared_with_id,
+                file_share.permission,
+            ),
+            _file_payload(file_share.file),
         )
+    (share_id, expires_at, team_id, shared_with_id, _permission), payload = cached
 
     # Check expiration
-    if file_share.expires_at and file_share.expires_at < datetime.now(UTC):
+    if expires_at and expires_at < datetime.now(UTC):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Share link expired")
 
-    # Check access count limit
-    if file_share.max_access_count and file_share.access_count >= file_share.max_access_count:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access limit reached")
-
     # Validate team membership if shared with team
-    if file_share.team_id and current_user:
+    if team_id and current_user:
         is_member = (
-            db.query(TeamMember)
-            .filter(
-                TeamMember.team_id == file_share.team_id,
-                TeamMember.user_id == current_user.id,
+            await db.scalar(
+                select(TeamMember.user_id).where(
+                    TeamMember.team_id == team_id,
+                    TeamMember.user_id == current_user.id,
+                )
             )
-            .first()
             is not None
         )
         if not is_member:
@@ -518,89 +893,101 @@ async def access_shared_file(
             )
 
     # Validate user access if shared with specific user
-    if file_share.shared_with_id and current_user:
-        if file_share.shared_with_id != current_user.id:
+    if shared_with_id and current_user:
+        if shared_with_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="This file is not shared with you",
             )
 
-    # Increment access count
-    file_share.access_count += 1
-    db.commit()
+    # Count the view atomically; revocation and the access limit are checked
+    # against the current row, so a cached share can never bypass them
+    counted = await db.scalar(
+        update(FileShare)
+        .where(
+            FileShare.id == share_id,
+            ~FileShare.is_revoked,
+            or_(
+                func.coalesce(FileShare.max_access_count, 0) == 0,
+                FileShare.access_count < FileShare.max_access_count,
+            ),
+        )
+        .values(access_count=FileShare.access_count + 1)
+        .returning(FileShare.id),
+        execution_options={"synchronize_session": False},
+    )
+    await db.commit()
+
+    if counted is None:
+        _shared_files.pop(share_token, None)
+        is_revoked = await db.scalar(select(FileShare.is_revoked).where(FileShare.id == share_id))
+        if is_revoked is None or is_revoked:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Share link not found or revoked"
+            )
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access limit reached")
 
-    # Log access
-    access_log = FileAccessLog(
-        id=generate_cuid(),
-        file_id=file_share.file_id,
-        share_id=file_share.id,
+    # Log access after the response has been sent
+    background_tasks.add_task(
+        _log_file_access,
+        file_id=payload["id"],
+        share_id=share_id,
         user_id=current_user.id if current_user else None,
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent"),
-        action="view",
     )
-    db.add(access_log)
-    db.commit()
 
-    return _build_file_response(file_share.file)
+    return payload
 
 
 @router.get("/{file_id}/shares", response_model=list[FileShareResponse])
 async def list_file_shares(
     file_id: str,
     request: Request,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> list[FileShareResponse]:
-    """List all shares for a file (owner only)."""
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
-    if not file:
+) -> ORJSONResponse:
+    """List all shares for a file (owner only).
+
+    Share payloads are trusted database values, so the list is encoded
+    directly with orjson; ``response_model`` only documents the schema.
+    """
+    if not await _owns_file(db, file_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    shares = db.query(FileShare).filter(FileShare.file_id == file_id).all()
-
-    base_url = str(request.base_url).rstrip("/")
-    return [
-        FileShareResponse(
-            id=share.id,
-            shareToken=share.share_token,
-            shareUrl=f"{base_url}/api/files/shared/{share.share_token}",
-            permission=share.permission,
-            expiresAt=share.expires_at,
-            accessCount=share.access_count,
-            maxAccessCount=share.max_access_count,
-            isRevoked=share.is_revoked,
-            createdAt=share.created_at,
+    shares = (
+        await db.scalars(
+            select(FileShare).where(FileShare.file_id == file_id).options(*_list_load_options())
         )
-        for share in shares
-    ]
+    ).all()
+
+    url_prefix = _share_url_prefix(request)
+    return ORJSONResponse([_share_payload(share, url_prefix) for share in shares])
 
 
 @router.post("/{file_id}/revoke-share")
 async def revoke_share(
     file_id: str,
     revoke_data: RevokeShareRequest,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Revoke a file share (owner only)."""
     # Verify file ownership
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
-    if not file:
+    if not await _owns_file(db, file_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
     # Find and revoke share
-    file_share = (
-        db.query(FileShare)
-        .filter(FileShare.id == revoke_data.shareId, FileShare.file_id == file_id)
-        .first()
+    file_share = await db.scalar(
+        select(FileShare).where(FileShare.id == revoke_data.shareId, FileShare.file_id == file_id)
     )
 
     if not file_share:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Share not found")
 
     file_share.is_revoked = True
-    db.commit()
+    await db.commit()
+    _shared_files.pop(file_share.share_token, None)
 
     return {"message": "Share revoked successfully", "shareId": revoke_data.shareId}
 
@@ -608,77 +995,129 @@ async def revoke_share(
 @router.get("/{file_id}/access-logs")
 async def get_file_access_logs(
     file_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-    page: int = Query(1, ge=1),
+    cursor: str | None = None,
     limit: int = Query(20, ge=1, le=100),
-) -> dict:
-    """Get access logs for a file (owner only)."""
+    includeTotal: bool = False,
+) -> ORJSONResponse:
+    """Get access logs for a file (owner only), newest first.
+
+    Uses keyset pagination like the file list: pass ``meta.nextCursor`` back as
+    ``cursor`` for the next page. The total is only counted on request. The page
+    is serialized with orjson rather than ``jsonable_encoder``.
+    """
     # Verify file ownership
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
-    if not file:
+    if not await _owns_file(db, file_id, current_user.id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    query = db.query(FileAccessLog).filter(FileAccessLog.file_id == file_id)
-    total = query.count()
-    offset = (page - 1) * limit
-
-    logs = query.order_by(FileAccessLog.accessed_at.desc()).offset(offset).limit(limit).all()
+    filters = [FileAccessLog.file_id == file_id]
+    if cursor:
+        cursor_accessed_at, cursor_id = _decode_cursor(cursor)
+        filters.append(
+            tuple_(FileAccessLog.accessed_at, FileAccessLog.id)
+            < tuple_(cursor_accessed_at, cursor_id)
+        )
 
-    return {
-        "data": [
-            {
-                "id": log.id,
-                "action": log.action,
-                "userId": log.user_id,
-                "ipAddress": log.ip_address,
-                "userAgent": log.user_agent,
-                "accessedAt": log.accessed_at,
-            }
-            for log in logs
-        ],
-        "meta": {
-            "total": total,
-            "page": page,
-            "limit": limit,
-            "totalPages": math.ceil(total / limit) if total > 0 else 1,
-        },
+    # Fetch one extra row to learn whether another page exists
+    logs = (
+        await db.scalars(
+            select(FileAccessLog)
+            .where(*filters)
+            .order_by(FileAccessLog.accessed_at.desc(), FileAccessLog.id.desc())
+            .limit(limit + 1)
+        )
+    ).all()
+    has_more = len(logs) > limit
+    logs = logs[:limit]
+
+    meta: dict[str, Any] = {
+        "limit": limit,
+        "hasMore": has_more,
+        "nextCursor": (_encode_cursor(logs[-1].accessed_at, logs[-1].id) if has_more else None),
     }
+    if includeTotal:
+        meta["total"] = await db.scalar(
+            select(func.count()).select_from(FileAccessLog).where(FileAccessLog.file_id == file_id)
+        )
+
+    return ORJSONResponse(
+        {
+            "data": [
+                {
+                    "id": log.id,
+                    "action": log.action,
+                    "userId": log.user_id,
+                    "ipAddress": log.ip_address,
+                    "userAgent": log.user_agent,
+                    "accessedAt": log.accessed_at,
+                }
+                for log in logs
+            ],
+            "meta": meta,
+        }
+    )
 
 
 @router.post("/batch-delete", response_model=BatchDeleteResponse)
 async def batch_delete_files(
     delete_data: BatchDeleteRequest,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> BatchDeleteResponse:
-    """Batch delete files."""
-    deleted = (
-        db.query(File)
-        .filter(File.id.in_(delete_data.ids), File.owner_id == current_user.id)
-        .delete(synchronize_session=False)
-    )
-    db.commit()
+    """Batch delete files.
 
+    One DELETE removes the files; their shares and access logs go with them
+    through the ON DELETE CASCADE foreign keys in the same statement.
+    """
+    sizes = (
+        await db.scalars(
+            delete(File)
+            .where(File.id.in_(delete_data.ids), File.owner_id == current_user.id)
+            .returning(File.size),
+            execution_options={"synchronize_session": False},
+        )
+    ).all()
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
+    await adjust_storage_used(current_user.id, -sum(sizes))
+
+    deleted = len(sizes)
     return BatchDeleteResponse(
         message=f"Successfully deleted {deleted} files",
         deleted_count=deleted,
     )
 
 
-@router.delete("/{file_id}")
+@router.delete("/{file_id}", response_model=dict[str, str])
 async def delete_file(
     file_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> dict[str, str]:
-    """Delete file."""
-    file = db.query(File).filter(File.id == file_id, File.owner_id == current_user.id).first()
+) -> Response:
+    """Delete file.
 
-    if not file:
+    A single owner-scoped DELETE ... RETURNING hands back the freed size for
+    the storage counter; shares and access logs go with the file through
+    their ON DELETE CASCADE foreign keys. Sends an empty 204 instead of the
+    message when the client sends ``Prefer: return=minimal``.
+    """
+    if not is_cuid(file_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    size = await db.scalar(
+        delete(File)
+        .where(File.id == file_id, File.owner_id == current_user.id)
+        .returning(File.size),
+        execution_options={"synchronize_session": False},
+    )
+
+    if size is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    db.delete(file)
-    db.commit()
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
+    await adjust_storage_used(current_user.id, -size)
 
-    return {"message": "File successfully deleted", "id": file_id}
+    return minimal_response(request, {"message": "File successfully deleted", "id": file_id})
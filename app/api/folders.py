@@ -1,16 +1,21 @@
 """Folder management routes matching API spec."""
 
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.redis import invalidate_cached_responses, reset_storage_used, response_cache_index
 from app.models import Folder, User
-from app.models.base import generate_cuid
+from app.models.base import generate_cuid, is_cuid
 from app.schemas.user import UserBasicResponse
 
 router = APIRouter(prefix="/folders", tags=["Folders"])
@@ -52,57 +57,81 @@ class FolderTreeResponse(BaseModel):
 
 
 # ============== Helper ==============
-def _build_folder_response(folder: Folder) -> FolderResponse:
+def _build_folder_response(folder: Folder, owner: User | None = None) -> FolderResponse:
+    owner = owner or folder.owner
     return FolderResponse(
         id=folder.id,
         name=folder.name,
         parentId=folder.parent_id,
         owner=UserBasicResponse(
-            id=folder.owner.id,
-            email=folder.owner.email,
-            name=folder.owner.name,
-            avatar=folder.owner.avatar,
+            id=owner.id,
+            email=owner.email,
+            name=owner.name,
+            avatar=owner.avatar,
         ),
         created_at=folder.created_at,
         updated_at=folder.updated_at,
     )
 
 
-def _build_folder_tree(folders: list[Folder], parent_id: str | None = None) -> list[FolderTreeNode]:
-    """Build folder tree recursively."""
-    nodes = []
+def _build_folder_tree(folders: Sequence[Folder]) -> list[FolderTreeNode]:
+    """Build folder tree in linear time.
+
+    Nodes are created once and indexed by ID, then each one is attached to its
+    parent's children; siblings keep the order of ``folders``.
+    """
+    nodes = {folder.id: FolderTreeNode(id=folder.id, name=folder.name) for folder in folders}
+    roots = []
     for folder in folders:
-        if folder.parent_id == parent_id:
-            children = _build_folder_tree(folders, folder.id)
-            nodes.append(FolderTreeNode(id=folder.id, name=folder.name, children=children))
-    return nodes
+        node = nodes[folder.id]
+        if folder.parent_id is None:
+            roots.append(node)
+        elif parent := nodes.get(folder.parent_id):
+            parent.children.append(node)
+    return roots
+
+
+async def _get_owned_folder(db: AsyncSession, folder_id: str, owner_id: str) -> Folder | None:
+    """Get a folder by ID if it belongs to the given user.
+
+    Args:
+        db: Database session
+        folder_id: Folder ID
+        owner_id: User who must own the folder
+
+    Returns:
+        Folder or None if not found or owned by someone else
+    """
+    if not is_cuid(folder_id):
+        return None
+    return await db.scalar(
+        select(Folder).where(Folder.id == folder_id, Folder.owner_id == owner_id)
+    )
 
 
 # ============== Routes ==============
 @router.get("", response_model=FolderListResponse)
 async def list_folders(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> FolderListResponse:
     """Get all folders for current user."""
-    folders = (
-        db.query(Folder)
-        .filter(Folder.owner_id == current_user.id)
-        .options(joinedload(Folder.owner))
-        .order_by(Folder.name)
-        .all()
-    )
+    query = select(Folder).where(Folder.owner_id == current_user.id).order_by(Folder.name)
+    if settings.DEBUG or settings.ENVIRONMENT == "test":
+        # The owner is rendered from current_user; fail loudly on lazy loads
+        query = query.options(raiseload("*"))
+    folders = (await db.scalars(query)).all()
 
-    return FolderListResponse(data=[_build_folder_response(f) for f in folders])
+    return FolderListResponse(data=[_build_folder_response(f, owner=current_user) for f in folders])
 
 
 @router.get("/tree", response_model=FolderTreeResponse)
 async def get_folder_tree(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> FolderTreeResponse:
     """Get folder tree structure."""
-    folders = db.query(Folder).filter(Folder.owner_id == current_user.id).all()
+    folders = (await db.scalars(select(Folder).where(Folder.owner_id == current_user.id))).all()
     tree = _build_folder_tree(folders)
 
     return FolderTreeResponse(data=tree)
@@ -111,38 +140,29 @@ async def get_folder_tree(
 @router.get("/{folder_id}", response_model=FolderResponse)
 async def get_folder(
     folder_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> FolderResponse:
     """Get folder by ID."""
-    folder = (
-        db.query(Folder)
-        .filter(Folder.id == folder_id, Folder.owner_id == current_user.id)
-        .options(joinedload(Folder.owner))
-        .first()
-    )
+    folder = await _get_owned_folder(db, folder_id, current_user.id)
 
     if not folder:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found")
 
-    return _build_folder_response(folder)
+    return _build_folder_response(folder, owner=current_user)
 
 
 @router.post("", response_model=FolderResponse, status_code=status.HTTP_201_CREATED)
 async def create_folder(
     folder_data: FolderCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> FolderResponse:
     """Create a new folder."""
     # Validate parent folder if provided and build path
     parent_path = ""
     if folder_data.parentId:
-        parent = (
-            db.query(Folder)
-            .filter(Folder.id == folder_data.parentId, Folder.owner_id == current_user.id)
-            .first()
-        )
+        parent = await _get_owned_folder(db, folder_data.parentId, current_user.id)
         if not parent:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Parent folder not found"
@@ -162,26 +182,23 @@ async def create_folder(
     )
 
     db.add(folder)
-    db.commit()
-    db.refresh(folder)
+    # Flushing fetches the server timestamps; the owner is the current user
+    await db.flush()
+    response = _build_folder_response(folder, owner=current_user)
+    await db.commit()
 
-    folder = (
-        db.query(Folder).filter(Folder.id == folder.id).options(joinedload(Folder.owner)).first()
-    )
-    return _build_folder_response(folder)
+    return response
 
 
 @router.patch("/{folder_id}", response_model=FolderResponse)
 async def update_folder(
     folder_id: str,
     folder_data: FolderUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> FolderResponse:
     """Update folder."""
-    folder = (
-        db.query(Folder).filter(Folder.id == folder_id, Folder.owner_id == current_user.id).first()
-    )
+    folder = await _get_owned_folder(db, folder_id, current_user.id)
 
     if not folder:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found")
@@ -189,29 +206,31 @@ async def update_folder(
     if folder_data.name:
         folder.name = folder_data.name
 
-    db.commit()
+    await db.flush()
+    response = _build_folder_response(folder, owner=current_user)
+    await db.commit()
 
-    folder = (
-        db.query(Folder).filter(Folder.id == folder.id).options(joinedload(Folder.owner)).first()
-    )
-    return _build_folder_response(folder)
+    return response
 
 
 @router.delete("/{folder_id}")
 async def delete_folder(
     folder_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Delete folder."""
-    folder = (
-        db.query(Folder).filter(Folder.id == folder_id, Folder.owner_id == current_user.id).first()
-    )
+    folder = await _get_owned_folder(db, folder_id, current_user.id)
 
     if not folder:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Folder not found")
 
-    db.delete(folder)
-    db.commit()
+    # Subfolders and files are removed by the ORM cascade
+    await db.delete(folder)
+    await db.commit()
+
+    # Files in the folder were deleted with it
+    await invalidate_cached_responses(response_cache_index("files", current_user.id))
+    await reset_storage_used(current_user.id)
 
     return {"message": "Folder successfully deleted", "id": folder_id}
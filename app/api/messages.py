@@ -1,20 +1,53 @@
 """Message and conversation management routes matching API spec."""
 
 from datetime import UTC, datetime
-from typing import Annotated
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, raiseload, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.redis import (
+    get_cached_response,
+    invalidate_cached_responses,
+    response_cache_index,
+    response_cache_key,
+    set_cached_response,
+)
+from app.core.responses import dump_json, etag_response
 from app.models import Conversation, ConversationParticipant, Message, User
 from app.models.base import generate_cuid
 from app.schemas.user import UserBasicResponse
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
 
+# Known (conversation_id, user_id) memberships, so sending to a conversation
+# skips the participant lookup. Only positive results are cached, and leaving
+# a conversation drops the entry in this process; other workers may accept
+# messages from a former participant until the TTL expires. Only touched
+# from the event loop, so no lock is needed.
+_memberships: TTLCache[tuple[str, str], bool] = TTLCache(maxsize=10_000, ttl=60)
+
 
 # ============== Schemas ==============
 class MessageCreate(BaseModel):
@@ -53,163 +86,348 @@ class MessageListResponse(BaseModel):
 
 
 # ============== Helper ==============
-def _build_message_response(message: Message) -> MessageResponse:
-    return MessageResponse(
-        id=message.id,
-        content=message.content,
-        sender=UserBasicResponse(
-            id=message.sender.id,
-            email=message.sender.email,
-            name=message.sender.name,
-            avatar=message.sender.avatar,
-        ),
-        isRead=message.is_read,
-        created_at=message.created_at,
+def _debug_raiseload(options: list[ORMOption]) -> list[ORMOption]:
+    """Append ``raiseload("*")`` in debug and test runs.
+
+    Responses only touch the relationships loaded by ``options``, so any other
+    lazy load is an N+1 regression and should fail loudly.
+    """
+    if settings.DEBUG or settings.ENVIRONMENT == "test":
+        options.append(raiseload("*"))
+    return options
+
+
+async def _is_participant(db: AsyncSession, conversation_id: str, user_id: str) -> bool:
+    """Whether a user participates in a conversation.
+
+    Args:
+        db: Database session
+        conversation_id: Conversation ID
+        user_id: User ID
+
+    Returns:
+        True if the user is a participant
+    """
+    key = (conversation_id, user_id)
+    if key in _memberships:
+        return True
+
+    found = await db.scalar(
+        select(literal(1))
+        .where(
+            ConversationParticipant.conversation_id == conversation_id,
+            ConversationParticipant.user_id == user_id,
+        )
+        .limit(1)
     )
+    if found is None:
+        return False
+    _memberships[key] = True
+    return True
 
 
-def _build_conversation_response(
-    conversation: Conversation, current_user_id: str, db: Session
-) -> ConversationResponse:
-    participants = []
-    for p in conversation.participants:
-        participants.append(
-            UserBasicResponse(
-                id=p.user.id,
-                email=p.user.email,
-                name=p.user.name,
-                avatar=p.user.avatar,
-            )
+async def _create_conversation(db: AsyncSession, user_ids: list[str]) -> str:
+    """Create a conversation with its participants in a single statement.
+
+    The conversation insert is a data-modifying CTE feeding one multi-row
+    participant insert, so the round-trips don't grow with the participants.
+
+    Args:
+        db: Database session
+        user_ids: IDs of the participating users
+
+    Returns:
+        ID of the new conversation
+    """
+    conversation_id = generate_cuid()
+    created = (
+        insert(Conversation).values(id=conversation_id).returning(Conversation.id).cte("created")
+    )
+    await db.execute(
+        insert(ConversationParticipant)
+        .from_select(
+            ["conversation_id", "user_id"],
+            union_all(*(select(created.c.id, literal(user_id)) for user_id in user_ids)),
         )
+        .add_cte(created)
+    )
+    return conversation_id
+
+
+def _message_load_options() -> list[ORMOption]:
+    """Loader options for rendering messages with their sender."""
+    return _debug_raiseload([selectinload(Message.sender)])
+
+
+def _is_read(
+    sender_id: str, created_at: datetime, viewer_id: str, last_read_at: datetime | None
+) -> bool:
+    """Whether a message counts as read for the viewing participant.
+
+    Read state is tracked per participant (``last_read_at``), not per message:
+    a message is read once the viewer has read the conversation past it, and
+    the viewer's own messages are always read.
+    """
+    if sender_id == viewer_id:
+        return True
+    return last_read_at is not None and created_at <= last_read_at
+
+
+def _user_basic(user: User) -> dict[str, Any]:
+    """Build the UserBasicResponse payload as a plain dict."""
+    return {"id": user.id, "email": user.email, "name": user.name, "avatar": user.avatar}
+
+
+def _message_payload(
+    message: Message, is_read: bool, senders: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Build the MessageResponse payload as a plain dict, sharing sender payloads.
+
+    Args:
+        message: Message with its sender loaded
+        is_read: Whether the viewer has read the message
+        senders: Sender payloads already built for this response, by user ID;
+            filled in as new senders are seen
+
+    Returns:
+        Message response payload
+    """
+    sender = senders.get(message.sender_id)
+    if sender is None:
+        sender = senders[message.sender_id] = _user_basic(message.sender)
+    return {
+        "id": message.id,
+        "content": message.content,
+        "sender": sender,
+        "isRead": is_read,
+        "created_at": message.created_at,
+    }
+
+
+def _user_json() -> ColumnElement[Any]:
+    """JSON object of a user's UserBasicResponse fields, built by Postgres."""
+    return func.json_build_object(
+        "id", User.id, "email", User.email, "name", User.name, "avatar", User.avatar, type_=JSON
+    )
+
+
+def _conversation_list_query(user_id: str) -> Select[Any]:
+    """One row per conversation of a user, ready to render.
+
+    Participants are aggregated to JSON and the latest message (with its
+    sender) comes from a LATERAL subquery, so the whole list is a single
+    statement regardless of how many conversations the user has.
 
-    # Get last message
+    Args:
+        user_id: Current user ID
+
+    Returns:
+        Query selecting the conversations, newest activity first
+    """
+    participants = (
+        select(
+            func.coalesce(
+                func.json_agg(aggregate_order_by(_user_json(), ConversationParticipant.joined_at)),
+                text("'[]'::json"),
+                type_=JSON,
+            )
+        )
+        .select_from(ConversationParticipant)
+        .join(User, User.id == ConversationParticipant.user_id)
+        .where(ConversationParticipant.conversation_id == Conversation.id)
+        .correlate(Conversation)
+        .scalar_subquery()
+    )
     last_message = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation.id)
-        .options(joinedload(Message.sender))
+        select(
+            Message.id,
+            Message.content,
+            Message.sender_id,
+            Message.created_at,
+            _user_json().label("sender"),
+        )
+        .join(User, User.id == Message.sender_id)
+        .where(Message.conversation_id == Conversation.id)
         .order_by(Message.created_at.desc())
-        .first()
+        .limit(1)
+        .lateral("last_message")
     )
-
-    # Get unread count
-    unread_count = (
-        db.query(Message)
-        .filter(
-            Message.conversation_id == conversation.id,
-            Message.sender_id != current_user_id,
-            Message.is_read.is_(False),
+    membership = aliased(ConversationParticipant)
+
+    return (
+        select(
+            Conversation.id,
+            Conversation.created_at,
+            Conversation.updated_at,
+            participants.label("participants"),
+            membership.unread_count,
+            membership.last_read_at,
+            last_message.c.id.label("message_id"),
+            last_message.c.content.label("message_content"),
+            last_message.c.sender_id.label("message_sender_id"),
+            last_message.c.created_at.label("message_created_at"),
+            last_message.c.sender.label("message_sender"),
         )
-        .count()
-    )
-
-    return ConversationResponse(
-        id=conversation.id,
-        participants=participants,
-        lastMessage=_build_message_response(last_message) if last_message else None,
-        unreadCount=unread_count,
-        created_at=conversation.created_at,
-        updated_at=conversation.updated_at,
+        .join(
+            membership,
+            (membership.conversation_id == Conversation.id) & (membership.user_id == user_id),
+        )
+        .outerjoin(last_message, true())
+        .order_by(Conversation.updated_at.desc())
     )
 
 
 # ============== Routes ==============
 @router.get("/conversations", response_model=ConversationListResponse)
 async def list_conversations(
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> ConversationListResponse:
-    """Get all conversations for current user."""
-    conversations = (
-        db.query(Conversation)
-        .join(ConversationParticipant)
-        .filter(ConversationParticipant.user_id == current_user.id)
-        .options(joinedload(Conversation.participants).joinedload(ConversationParticipant.user))
-        .order_by(Conversation.updated_at.desc())
-        .all()
-    )
+) -> Response:
+    """Get all conversations for current user.
+
+    The list is built in a single statement (see _conversation_list_query) and
+    rendered from plain dicts; unread counts are kept up to date by
+    send_message and mark_conversation_read. Responses are cached in Redis per
+    user and carry an ETag, so unchanged polls get an empty 304.
+    """
+    cache_index = response_cache_index("messages", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
+    rows = await db.execute(_conversation_list_query(current_user.id))
+
+    data = []
+    for row in rows:
+        last_message = None
+        if row.message_id is not None:
+            last_message = {
+                "id": row.message_id,
+                "content": row.message_content,
+                "sender": row.message_sender,
+                "isRead": _is_read(
+                    row.message_sender_id,
+                    row.message_created_at,
+                    current_user.id,
+                    row.last_read_at,
+                ),
+                "created_at": row.message_created_at,
+            }
+        data.append(
+            {
+                "id": row.id,
+                "participants": row.participants,
+                "lastMessage": last_message,
+                "unreadCount": row.unread_count,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+            }
+        )
 
-    return ConversationListResponse(
-        data=[_build_conversation_response(c, current_user.id, db) for c in conversations]
-    )
+    body = dump_json({"data": data})
+    await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
 
 
 @router.get("/conversations/{conversation_id}", response_model=MessageListResponse)
 async def get_conversation_messages(
     conversation_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     limit: int = Query(50, ge=1, le=100),
-) -> MessageListResponse:
-    """Get messages in a conversation."""
+) -> Response:
+    """Get messages in a conversation.
+
+    Cached per user like the conversation list; entries are only written after
+    the participant check and are dropped when the user leaves.
+    """
+    cache_index = response_cache_index("messages", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     # Verify user is participant
-    participant = (
-        db.query(ConversationParticipant)
-        .filter(
-            ConversationParticipant.conversation_id == conversation_id,
-            ConversationParticipant.user_id == current_user.id,
-        )
-        .first()
-    )
+    participant = await db.get(ConversationParticipant, (conversation_id, current_user.id))
 
     if not participant:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+    _memberships[(conversation_id, current_user.id)] = True
 
     messages = (
-        db.query(Message)
-        .filter(Message.conversation_id == conversation_id)
-        .options(joinedload(Message.sender))
-        .order_by(Message.created_at.desc())
-        .limit(limit)
-        .all()
+        await db.scalars(
+            select(Message)
+            .where(Message.conversation_id == conversation_id)
+            .options(*_message_load_options())
+            .order_by(Message.created_at.desc())
+            .limit(limit)
+        )
+    ).all()
+
+    # A conversation has few senders; build each one's payload once
+    senders: dict[str, dict[str, Any]] = {}
+    body = dump_json(
+        {
+            "data": [
+                _message_payload(
+                    m,
+                    _is_read(m.sender_id, m.created_at, current_user.id, participant.last_read_at),
+                    senders,
+                )
+                for m in reversed(messages)
+            ]
+        }
     )
-
-    return MessageListResponse(data=[_build_message_response(m) for m in reversed(messages)])
+    await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
 
 
 @router.post("/send", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
 async def send_message(
     message_data: MessageCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> MessageResponse:
-    """Send a message."""
+    """Send a message.
+
+    Runs in at most three statements: the lookup of an existing conversation
+    with the recipient, one insert of the new conversation with both
+    participants, and one insert of the message that also bumps the
+    conversation timestamp and the other participants' unread counts.
+    """
     conversation_id = message_data.conversationId
 
     # Create new conversation if needed
     if not conversation_id and message_data.recipientId:
         # Check if conversation already exists between users
-        existing = (
-            db.query(Conversation)
-            .join(ConversationParticipant)
-            .filter(ConversationParticipant.user_id == current_user.id)
-            .filter(
-                Conversation.id.in_(
-                    db.query(ConversationParticipant.conversation_id).filter(
+        conversation_id = await db.scalar(
+            select(ConversationParticipant.conversation_id)
+            .where(ConversationParticipant.user_id == current_user.id)
+            .where(
+                ConversationParticipant.conversation_id.in_(
+                    select(ConversationParticipant.conversation_id).where(
                         ConversationParticipant.user_id == message_data.recipientId
                     )
                 )
             )
-            .first()
+            .limit(1)
         )
 
-        if existing:
-            conversation_id = existing.id
-        else:
-            # Create new conversation
-            conversation = Conversation(id=generate_cuid())
-            db.add(conversation)
-            db.flush()
-
-            # Add participants
-            db.add(
-                ConversationParticipant(conversation_id=conversation.id, user_id=current_user.id)
+        if not conversation_id:
+            conversation_id = await _create_conversation(
+                db, [current_user.id, message_data.recipientId]
             )
-            db.add(
-                ConversationParticipant(
-                    conversation_id=conversation.id, user_id=message_data.recipientId
-                )
+
+    elif conversation_id:
+        # Verify user is participant
+        if not await _is_participant(db, conversation_id, current_user.id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not a participant in this conversation",
             )
-            conversation_id = conversation.id
 
     if not conversation_id:
         raise HTTPException(
@@ -217,76 +435,89 @@ async def send_message(
             detail="Either conversationId or recipientId is required",
         )
 
-    # Verify user is participant
-    participant = (
-        db.query(ConversationParticipant)
-        .filter(
+    # Update conversation timestamp; now() is the transaction timestamp, so it
+    # matches the message's server-side created_at exactly
+    touched = (
+        update(Conversation)
+        .where(Conversation.id == conversation_id)
+        .values(updated_at=func.now())
+        .returning(Conversation.id)
+        .cte("touched")
+    )
+    # The message is unread for every other participant
+    notified = (
+        update(ConversationParticipant)
+        .where(
             ConversationParticipant.conversation_id == conversation_id,
-            ConversationParticipant.user_id == current_user.id,
+            ConversationParticipant.user_id != current_user.id,
         )
-        .first()
+        .values(unread_count=ConversationParticipant.unread_count + 1)
+        .returning(ConversationParticipant.user_id)
+        .cte("notified")
     )
 
-    if not participant:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Not a participant in this conversation"
-        )
-
     # Create message
-    message = Message(
-        id=generate_cuid(),
-        conversation_id=conversation_id,
-        sender_id=current_user.id,
-        content=message_data.content,
+    message_id = generate_cuid()
+    created_at, notified_ids = (
+        await db.execute(
+            insert(Message)
+            .values(
+                id=message_id,
+                conversation_id=conversation_id,
+                sender_id=current_user.id,
+                content=message_data.content,
+            )
+            .returning(
+                Message.created_at,
+                select(func.array_agg(notified.c.user_id)).scalar_subquery(),
+            )
+            .add_cte(touched, notified)
+        )
+    ).one()
+    await db.commit()
+
+    # Every participant's conversation list and history changed
+    await invalidate_cached_responses(
+        *(
+            response_cache_index("messages", user_id)
+            for user_id in [current_user.id, *(notified_ids or [])]
+        )
     )
 
-    db.add(message)
-
-    # Update conversation timestamp
-    conversation = db.query(Conversation).filter(Conversation.id == conversation_id).first()
-    if conversation:
-        from datetime import datetime
-
-        conversation.updated_at = datetime.now(UTC)
-
-    db.commit()
-
-    message = (
-        db.query(Message)
-        .filter(Message.id == message.id)
-        .options(joinedload(Message.sender))
-        .first()
+    # The sender is the current user, so nothing needs to be loaded back
+    return MessageResponse.model_construct(
+        id=message_id,
+        content=message_data.content,
+        sender=UserBasicResponse.model_construct(**_user_basic(current_user)),
+        isRead=True,
+        created_at=created_at,
     )
-    return _build_message_response(message)
 
 
 @router.put("/conversations/{conversation_id}/read")
 async def mark_conversation_read(
     conversation_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Mark all messages in conversation as read."""
-    # Verify user is participant
-    participant = (
-        db.query(ConversationParticipant)
-        .filter(
+    # Mark messages as read; no row means the user is not a participant
+    marked = await db.scalar(
+        update(ConversationParticipant)
+        .where(
             ConversationParticipant.conversation_id == conversation_id,
             ConversationParticipant.user_id == current_user.id,
         )
-        .first()
+        .values(last_read_at=datetime.now(UTC), unread_count=0)
+        .returning(ConversationParticipant.conversation_id)
+        .execution_options(synchronize_session=False)
     )
 
-    if not participant:
+    if marked is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
 
-    # Mark messages as read
-    db.query(Message).filter(
-        Message.conversation_id == conversation_id,
-        Message.sender_id != current_user.id,
-        Message.is_read.is_(False),
-    ).update({"is_read": True}, synchronize_session=False)
-    db.commit()
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("messages", current_user.id))
 
     return {"message": "Messages marked as read"}
 
@@ -294,23 +525,32 @@ async def mark_conversation_read(
 @router.delete("/conversations/{conversation_id}")
 async def delete_conversation(
     conversation_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Delete conversation (removes user from participants)."""
-    participant = (
-        db.query(ConversationParticipant)
-        .filter(
-            ConversationParticipant.conversation_id == conversation_id,
-            ConversationParticipant.user_id == current_user.id,
+    participant_ids = (
+        await db.scalars(
+            select(ConversationParticipant.user_id).where(
+                ConversationParticipant.conversation_id == conversation_id
+            )
         )
-        .first()
-    )
+    ).all()
 
-    if not participant:
+    if current_user.id not in participant_ids:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
 
-    db.delete(participant)
-    db.commit()
+    await db.execute(
+        delete(ConversationParticipant).where(
+            ConversationParticipant.conversation_id == conversation_id,
+            ConversationParticipant.user_id == current_user.id,
+        )
+    )
+    await db.commit()
+    _memberships.pop((conversation_id, current_user.id), None)
+    # The others' participant lists no longer include the user
+    await invalidate_cached_responses(
+        *(response_cache_index("messages", user_id) for user_id in participant_ids)
+    )
 
     return {"message": "Conversation deleted successfully", "id": conversation_id}
@@ -1,14 +1,23 @@
 """Notification management routes matching API spec."""
 
-from datetime import datetime
-from typing import Annotated
+from datetime import UTC, datetime
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import false, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.core.redis import (
+    get_cached_response,
+    invalidate_cached_responses,
+    response_cache_index,
+    response_cache_key,
+    set_cached_response,
+)
+from app.core.responses import dump_json, etag_response
 from app.models import Notification, User
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
@@ -36,85 +45,121 @@ class UnreadCountResponse(BaseModel):
 
 
 # ============== Helper ==============
+def _notification_payload(notification: Notification) -> dict[str, Any]:
+    """Build the NotificationResponse payload as a plain dict."""
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "message": notification.content,
+        "isRead": notification.read,
+        "payload": notification.payload,
+        "created_at": notification.created_at,
+    }
+
+
 def _build_notification_response(notification: Notification) -> NotificationResponse:
-    return NotificationResponse(
-        id=notification.id,
-        type=notification.type,
-        title=notification.title,
-        message=notification.message,
-        isRead=notification.is_read,
-        payload=notification.payload,
-        created_at=notification.created_at,
-    )
+    # Values come from the loaded row, so skip re-validating them
+    return NotificationResponse.model_construct(**_notification_payload(notification))
 
 
 # ============== Routes ==============
 @router.get("", response_model=NotificationListResponse)
 async def list_notifications(
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     limit: int = Query(20, ge=1, le=100),
-) -> NotificationListResponse:
-    """Get notifications for current user."""
+) -> Response:
+    """Get notifications for current user.
+
+    Responses are cached in Redis per user and carry an ETag. Notifications
+    created by other services show up once the cached entry expires.
+    """
+    cache_index = response_cache_index("notifications", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
     notifications = (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+        await db.scalars(
+            select(Notification)
+            .where(Notification.user_id == current_user.id)
+            .order_by(Notification.created_at.desc())
+            .limit(limit)
+        )
+    ).all()
 
-    return NotificationListResponse(data=[_build_notification_response(n) for n in notifications])
+    body = dump_json({"data": [_notification_payload(n) for n in notifications]})
+    await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
 
 
 @router.get("/unread-count", response_model=UnreadCountResponse)
 async def get_unread_count(
-    db: Annotated[Session, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
-) -> UnreadCountResponse:
-    """Get unread notification count."""
-    count = (
-        db.query(Notification)
-        .filter(Notification.user_id == current_user.id, Notification.is_read.is_(False))
-        .count()
+) -> Response:
+    """Get unread notification count.
+
+    A plain aggregate (not ``Query.count()``'s subquery), answered from the
+    partial index on unread notifications, and cached like the list.
+    """
+    cache_index = response_cache_index("notifications", current_user.id)
+    cache_key = response_cache_key(cache_index, request)
+    cached = await get_cached_response(cache_key)
+    if cached is not None:
+        return etag_response(request, cached)
+
+    count = await db.scalar(
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.user_id == current_user.id, Notification.read == false())
     )
 
-    return UnreadCountResponse(count=count)
+    body = dump_json({"count": count or 0})
+    await set_cached_response(cache_key, cache_index, body)
+    return etag_response(request, body)
 
 
 @router.put("/{notification_id}/read", response_model=NotificationResponse)
 async def mark_as_read(
     notification_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> NotificationResponse:
     """Mark notification as read."""
-    notification = (
-        db.query(Notification)
-        .filter(Notification.id == notification_id, Notification.user_id == current_user.id)
-        .first()
+    notification = await db.scalar(
+        update(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == current_user.id)
+        .values(read=True, read_at=datetime.now(UTC))
+        .returning(Notification)
     )
 
     if not notification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
 
-    notification.is_read = True
-    db.commit()
-    db.refresh(notification)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("notifications", current_user.id))
 
     return _build_notification_response(notification)
 
 
 @router.put("/read-all")
 async def mark_all_as_read(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Mark all notifications as read."""
-    db.query(Notification).filter(
-        Notification.user_id == current_user.id, Notification.is_read.is_(False)
-    ).update({"is_read": True}, synchronize_session=False)
-    db.commit()
+    await db.execute(
+        update(Notification)
+        .where(Notification.user_id == current_user.id, Notification.read == false())
+        .values(read=True, read_at=datetime.now(UTC))
+    )
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("notifications", current_user.id))
 
     return {"message": "All notifications marked as read"}
 
@@ -122,20 +167,21 @@ async def mark_all_as_read(
 @router.delete("/{notification_id}")
 async def delete_notification(
     notification_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Delete notification."""
-    notification = (
-        db.query(Notification)
-        .filter(Notification.id == notification_id, Notification.user_id == current_user.id)
-        .first()
+    notification = await db.scalar(
+        select(Notification).where(
+            Notification.id == notification_id, Notification.user_id == current_user.id
+        )
     )
 
     if not notification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
 
-    db.delete(notification)
-    db.commit()
+    await db.delete(notification)
+    await db.commit()
+    await invalidate_cached_responses(response_cache_index("notifications", current_user.id))
 
     return {"message": "Notification deleted successfully", "id": notification_id}
@@ -3,10 +3,10 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.models import User
 from app.schemas.role import (
     PermissionCreate,
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/permissions", tags=["Permissions"])
 
 @router.get("", response_model=PermissionListResponse)
 async def list_permissions(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> PermissionListResponse:
     """Get all permissions.
@@ -33,15 +33,17 @@ async def list_permissions(
         List of all permissions
     """
     permission_service = PermissionService(db)
-    permissions = permission_service.get_all()
+    permissions = await permission_service.get_all()
 
-    return PermissionListResponse(data=[PermissionResponse.from_orm_model(p) for p in permissions])
+    return PermissionListResponse.model_construct(
+        data=[PermissionResponse.from_orm_model(p) for p in permissions]
+    )
 
 
 @router.get("/{permission_id}", response_model=PermissionResponse)
 async def get_permission(
     permission_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> PermissionResponse:
     """Get permission by ID.
@@ -58,7 +60,7 @@ async def get_permission(
         HTTPException: If permission not found
     """
     permission_service = PermissionService(db)
-    permission = permission_service.get_by_id(permission_id)
+    permission = await permission_service.get_by_id(permission_id)
 
     if not permission:
         raise HTTPException(
@@ -72,7 +74,7 @@ async def get_permission(
 @router.post("", response_model=PermissionResponse, status_code=status.HTTP_201_CREATED)
 async def create_permission(
     permission_data: PermissionCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> PermissionResponse:
     """Create a new permission.
@@ -91,7 +93,7 @@ async def create_permission(
     permission_service = PermissionService(db)
 
     try:
-        permission = permission_service.create(permission_data)
+        permission = await permission_service.create(permission_data)
         return PermissionResponse.from_orm_model(permission)
     except ValueError as e:
         raise HTTPException(
@@ -103,7 +105,7 @@ async def create_permission(
 @router.delete("/{permission_id}")
 async def delete_permission(
     permission_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Delete permission.
@@ -120,7 +122,7 @@ async def delete_permission(
         HTTPException: If permission not found
     """
     permission_service = PermissionService(db)
-    deleted = permission_service.delete(permission_id)
+    deleted = await permission_service.delete(permission_id)
 
     if not deleted:
         raise HTTPException(
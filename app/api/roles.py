@@ -3,11 +3,11 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_active_user
-from app.core.database import get_db
-from app.models import User
+from app.core.database import get_async_db
+from app.models import Role, User
 from app.schemas.role import (
     PermissionResponse,
     RoleCreate,
@@ -21,9 +21,30 @@ from app.services.role_service import RoleService
 router = APIRouter(prefix="/roles", tags=["Roles"])
 
 
+def _build_role_response(role: Role, user_count: int) -> RoleWithPermissionsResponse:
+    """Build a role response from a loaded role without re-validating it.
+
+    Args:
+        role: Role with its permissions loaded
+        user_count: Number of users with the role
+
+    Returns:
+        Role data with permissions
+    """
+    return RoleWithPermissionsResponse.model_construct(
+        id=role.id,
+        name=role.name,
+        label=role.label,
+        description=role.description,
+        created_at=role.created_at,
+        permissions=[PermissionResponse.from_orm_model(rp.permission) for rp in role.permissions],
+        userCount=user_count,
+    )
+
+
 @router.get("", response_model=RoleListResponse)
 async def list_roles(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> RoleListResponse:
     """Get all roles with permissions and user count.
@@ -36,31 +57,17 @@ async def list_roles(
         List of all roles
     """
     role_service = RoleService(db)
-    roles = role_service.get_all(with_permissions=True)
-
-    role_responses = []
-    for role in roles:
-        permissions = [PermissionResponse.from_orm_model(rp.permission) for rp in role.permissions]
-        user_count = role_service.get_user_count(role.id)
-        role_responses.append(
-            RoleWithPermissionsResponse(
-                id=role.id,
-                name=role.name,
-                label=role.label,
-                description=role.description,
-                created_at=role.created_at,
-                permissions=permissions,
-                userCount=user_count,
-            )
-        )
+    roles = await role_service.get_all_with_user_counts()
 
-    return RoleListResponse(data=role_responses)
+    return RoleListResponse.model_construct(
+        data=[_build_role_response(role, user_count) for role, user_count in roles]
+    )
 
 
 @router.get("/{role_id}", response_model=RoleWithPermissionsResponse)
 async def get_role(
     role_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> RoleWithPermissionsResponse:
     """Get role by ID with permissions.
@@ -77,32 +84,22 @@ async def get_role(
         HTTPException: If role not found
     """
     role_service = RoleService(db)
-    role = role_service.get_by_id(role_id, with_permissions=True)
+    row = await role_service.get_by_id_with_user_count(role_id)
 
-    if not role:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Role not found",
         )
 
-    permissions = [PermissionResponse.from_orm_model(rp.permission) for rp in role.permissions]
-    user_count = role_service.get_user_count(role.id)
-
-    return RoleWithPermissionsResponse(
-        id=role.id,
-        name=role.name,
-        label=role.label,
-        description=role.description,
-        created_at=role.created_at,
-        permissions=permissions,
-        userCount=user_count,
-    )
+    role, user_count = row
+    return _build_role_response(role, user_count)
 
 
 @router.post("", response_model=RoleWithPermissionsResponse, status_code=status.HTTP_201_CREATED)
 async def create_role(
     role_data: RoleCreate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> RoleWithPermissionsResponse:
     """Create a new role.
@@ -121,8 +118,8 @@ async def create_role(
     role_service = RoleService(db)
 
     try:
-        role = role_service.create(role_data)
-        return RoleWithPermissionsResponse(
+        role = await role_service.create(role_data)
+        return RoleWithPermissionsResponse.model_construct(
             id=role.id,
             name=role.name,
             label=role.label,
@@ -142,7 +139,7 @@ async def create_role(
 async def update_role(
     role_id: str,
     role_data: RoleUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> RoleWithPermissionsResponse:
     """Update role information.
@@ -160,7 +157,7 @@ async def update_role(
         HTTPException: If role not found
     """
     role_service = RoleService(db)
-    role = role_service.update(role_id, role_data)
+    role = await role_service.update(role_id, role_data)
 
     if not role:
         raise HTTPException(
@@ -168,27 +165,24 @@ async def update_role(
             detail="Role not found",
         )
 
-    # Reload with permissions
-    role = role_service.get_by_id(role_id, with_permissions=True)
-    permissions = [PermissionResponse.from_orm_model(rp.permission) for rp in role.permissions]
-    user_count = role_service.get_user_count(role.id)
+    # Reload with permissions and user count (the role may be gone by now)
+    row = await role_service.get_by_id_with_user_count(role_id)
 
-    return RoleWithPermissionsResponse(
-        id=role.id,
-        name=role.name,
-        label=role.label,
-        description=role.description,
-        created_at=role.created_at,
-        permissions=permissions,
-        userCount=user_count,
-    )
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Role not found",
+        )
+
+    role, user_count = row
+    return _build_role_response(role, user_count)
 
 
 @router.post("/{role_id}/permissions", response_model=RoleWithPermissionsResponse)
 async def assign_permissions(
     role_id: str,
     permission_data: RolePermissionAssign,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> RoleWithPermissionsResponse:
     """Assign permissions to a role.
@@ -206,7 +200,7 @@ async def assign_permissions(
         HTTPException: If role not found
     """
     role_service = RoleService(db)
-    role = role_service.assign_permissions(role_id, permission_data.permissionIds)
+    role = await role_service.assign_permissions(role_id, permission_data.permissionIds)
 
     if not role:
         raise HTTPException(
@@ -214,24 +208,15 @@ async def assign_permissions(
             detail="Role not found",
         )
 
-    permissions = [PermissionResponse.from_orm_model(rp.permission) for rp in role.permissions]
-    user_count = role_service.get_user_count(role.id)
+    user_count = await role_service.get_user_count(role.id)
 
-    return RoleWithPermissionsResponse(
-        id=role.id,
-        name=role.name,
-        label=role.label,
-        description=role.description,
-        created_at=role.created_at,
-        permissions=permissions,
-        userCount=user_count,
-    )
+    return _build_role_response(role, user_count)
 
 
 @router.delete("/{role_id}")
 async def delete_role(
     role_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Delete role.
@@ -248,7 +233,7 @@ async def delete_role(
         HTTPException: If role not found
     """
     role_service = RoleService(db)
-    deleted = role_service.delete(role_id)
+    deleted = await role_service.delete(role_id)
 
     if not deleted:
         raise HTTPException(
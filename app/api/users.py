@@ -1,12 +1,10 @@
 """User management routes matching API spec."""
 
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
 
-from app.api.deps import get_current_active_user
-from app.core.database import get_db
+from app.api.deps import get_current_active_user, get_user_service
 from app.models import User
 from app.schemas.user import (
     BatchDeleteRequest,
@@ -24,9 +22,48 @@ from app.services.user_service import UserService
 router = APIRouter(prefix="/users", tags=["Users"])
 
 
+def _user_fields(user: User) -> dict[str, Any]:
+    """Collect UserResponse fields from a user row.
+
+    Responses are built with ``model_construct``: the values come straight from
+    the database, so re-validating them per field would only repeat work.
+
+    Args:
+        user: User model
+
+    Returns:
+        UserResponse field values
+    """
+    return {
+        "id": user.id,
+        "email": user.email,
+        "username": user.username,
+        "name": user.name,
+        "avatar": user.avatar,
+        "phone": user.phone,
+        "status": user.status,
+        "department": user.department,
+        "position": user.position,
+        "created_at": user.created_at,
+        "updated_at": user.updated_at,
+    }
+
+
+def _build_user_response(user: User) -> UserResponse:
+    """Build a UserResponse without re-validating database values.
+
+    Args:
+        user: User model
+
+    Returns:
+        User response
+    """
+    return UserResponse.model_construct(**_user_fields(user))
+
+
 @router.get("", response_model=UserListResponse)
 async def list_users(
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Items per page"),
@@ -39,7 +76,7 @@ async def list_users(
     """Get user list with pagination, search, and filtering.
 
     Args:
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
         page: Page number (1-indexed)
         limit: Number of users per page
@@ -50,10 +87,8 @@ async def list_users(
     Returns:
         Paginated list of users
     """
-    user_service = UserService(db)
-
     # Get users with filtering
-    users, total = user_service.get_all(
+    users, total = await user_service.get_all(
         page=page,
         limit=limit,
         search=search,
@@ -64,9 +99,9 @@ async def list_users(
     # Calculate pagination metadata
     pagination = user_service.calculate_pagination(total, page, limit)
 
-    return UserListResponse(
-        data=[UserResponse.model_validate(user) for user in users],
-        meta=PaginationMeta(
+    return UserListResponse.model_construct(
+        data=[_build_user_response(user) for user in users],
+        meta=PaginationMeta.model_construct(
             total=pagination["total"],
             page=pagination["page"],
             limit=pagination["limit"],
@@ -78,14 +113,14 @@ async def list_users(
 @router.get("/{user_id}", response_model=UserDetailResponse)
 async def get_user(
     user_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> UserDetailResponse:
     """Get user by ID with roles and teams.
 
     Args:
         user_id: User ID
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
 
     Returns:
@@ -94,8 +129,7 @@ async def get_user(
     Raises:
         HTTPException: If user not found
     """
-    user_service = UserService(db)
-    user = user_service.get_by_id(user_id, with_roles=True)
+    user = await user_service.get_by_id(user_id, with_roles=True, with_teams=True)
 
     if not user:
         raise HTTPException(
@@ -106,10 +140,13 @@ async def get_user(
     # Build response with roles
     from app.schemas.user import RoleBasic, TeamBasic
 
-    roles = [RoleBasic(id=ur.role.id, name=ur.role.name, label=ur.role.label) for ur in user.roles]
+    roles = [
+        RoleBasic.model_construct(id=ur.role.id, name=ur.role.name, label=ur.role.label)
+        for ur in user.roles
+    ]
 
     teams = [
-        TeamBasic(
+        TeamBasic.model_construct(
             id=tm.team.id,
             name=tm.team.name,
             role=tm.role.name if tm.role else None,
@@ -117,34 +154,20 @@ async def get_user(
         for tm in user.teams
     ]
 
-    return UserDetailResponse(
-        id=user.id,
-        email=user.email,
-        username=user.username,
-        name=user.name,
-        avatar=user.avatar,
-        phone=user.phone,
-        status=user.status,
-        department=user.department,
-        position=user.position,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-        roles=roles,
-        teams=teams,
-    )
+    return UserDetailResponse.model_construct(**_user_fields(user), roles=roles, teams=teams)
 
 
 @router.post("", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user_data: UserCreate,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> UserResponse:
     """Create a new user.
 
     Args:
         user_data: User creation data
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
 
     Returns:
@@ -153,11 +176,9 @@ async def create_user(
     Raises:
         HTTPException: If user with email already exists
     """
-    user_service = UserService(db)
-
     try:
-        user = user_service.create(user_data)
-        return UserResponse.model_validate(user)
+        user = await user_service.create(user_data)
+        return _build_user_response(user)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -169,7 +190,7 @@ async def create_user(
 async def update_user(
     user_id: str,
     user_data: UserUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> UserResponse:
     """Update user information.
@@ -177,7 +198,7 @@ async def update_user(
     Args:
         user_id: User ID
         user_data: User update data
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
 
     Returns:
@@ -186,8 +207,7 @@ async def update_user(
     Raises:
         HTTPException: If user not found
     """
-    user_service = UserService(db)
-    user = user_service.update(user_id, user_data)
+    user = await user_service.update(user_id, user_data)
 
     if not user:
         raise HTTPException(
@@ -195,14 +215,14 @@ async def update_user(
             detail="User not found",
         )
 
-    return UserResponse.model_validate(user)
+    return _build_user_response(user)
 
 
 @router.patch("/{user_id}/status", response_model=UserResponse)
 async def update_user_status(
     user_id: str,
     status_data: UserStatusUpdate,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> UserResponse:
     """Update user status (ACTIVE/INACTIVE/SUSPENDED).
@@ -210,7 +230,7 @@ async def update_user_status(
     Args:
         user_id: User ID
         status_data: New status
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
 
     Returns:
@@ -226,8 +246,7 @@ async def update_user_status(
             detail="Cannot change your own status",
         )
 
-    user_service = UserService(db)
-    user = user_service.update_status(user_id, status_data.status)
+    user = await user_service.update_status(user_id, status_data.status)
 
     if not user:
         raise HTTPException(
@@ -235,20 +254,20 @@ async def update_user_status(
             detail="User not found",
         )
 
-    return UserResponse.model_validate(user)
+    return _build_user_response(user)
 
 
 @router.post("/batch-delete", response_model=BatchDeleteResponse)
 async def batch_delete_users(
     request: BatchDeleteRequest,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> BatchDeleteResponse:
     """Delete multiple users.
 
     Args:
         request: List of user IDs to delete
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
 
     Returns:
@@ -264,10 +283,9 @@ async def batch_delete_users(
             detail="Cannot delete your own account",
         )
 
-    user_service = UserService(db)
-    deleted_count = user_service.batch_delete(request.ids)
+    deleted_count = await user_service.batch_delete(request.ids)
 
-    return BatchDeleteResponse(
+    return BatchDeleteResponse.model_construct(
         message=f"Successfully deleted {deleted_count} users",
         deleted_count=deleted_count,
     )
@@ -276,14 +294,14 @@ async def batch_delete_users(
 @router.delete("/{user_id}")
 async def delete_user(
     user_id: str,
-    db: Annotated[Session, Depends(get_db)],
+    user_service: Annotated[UserService, Depends(get_user_service)],
     current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> dict[str, str]:
     """Delete user.
 
     Args:
         user_id: User ID
-        db: Database session
+        user_service: User service
         current_user: Current authenticated user
 
     Returns:
@@ -299,8 +317,7 @@ async def delete_user(
             detail="Cannot delete your own account",
         )
 
-    user_service = UserService(db)
-    deleted = user_service.delete(user_id)
+    deleted = await user_service.delete(user_id)
 
     if not deleted:
         raise HTTPException(
@@ -25,11 +25,21 @@ class Settings(BaseSettings):
 
     # API settings
     API_PREFIX: str = "/api"
+    PUBLIC_BASE_URL: str | None = None  # public origin for share links (default: request URL)
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173"]
 
     # Database settings
     DATABASE_URL: str
     DATABASE_ECHO: bool = False
+    DATABASE_POOL_SIZE: int = 20  # persistent connections per process
+    DATABASE_MAX_OVERFLOW: int = 10  # extra connections allowed under burst
+    DATABASE_POOL_TIMEOUT: int = 5  # seconds to wait for a free connection (fail fast)
+    DATABASE_POOL_WARMUP: bool = True  # open DATABASE_POOL_SIZE connections at startup
+    DATABASE_POOL_RECYCLE: int = 3600  # seconds before a connection is replaced
+    DATABASE_QUERY_CACHE_SIZE: int = 1200  # compiled SQL statements cached per engine
+    DATABASE_STATEMENT_TIMEOUT: int = 5000  # ms per statement, PostgreSQL only (0 disables)
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # per async connection (0 for PgBouncer)
+    DATABASE_READ_URL: str | None = None  # optional read replica for read-only routes
 
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -67,6 +77,13 @@ class Settings(BaseSettings):
     # Rate limiting
     THROTTLE_TTL: int = 60  # seconds
     THROTTLE_LIMIT: int = 100  # requests per TTL
+    LOGIN_MAX_CONCURRENT: int = 5  # in-flight login attempts per account
+    LOGIN_CONCURRENCY_TTL: int = 30  # seconds before a stale attempt is dropped
+
+    # Redis (optional - features that need it are skipped when unset)
+    REDIS_URL: str | None = None
+    RESPONSE_CACHE_TTL: int = 15  # seconds a cached GET response is served as fresh
+    RESPONSE_CACHE_STALE_TTL: int = 30  # further seconds it is served while being refreshed
 
 
 @lru_cache
@@ -1,24 +1,185 @@
 """Database connection and session management."""
 
-from collections.abc import Generator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
-from sqlalchemy import create_engine
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
 
 from .config import settings
 
-# Create database engine
+logger = logging.getLogger(__name__)
+
+# Async drivers used for each supported dialect
+_ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "postgres": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def _to_async_url(url: str) -> str:
+    """Rewrite a database URL to use the dialect's async driver.
+
+    Args:
+        url: Database URL as configured (e.g. postgresql://...)
+
+    Returns:
+        Equivalent URL using the async driver (e.g. postgresql+asyncpg://...)
+    """
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    driver = _ASYNC_DRIVERS.get(dialect)
+    if not sep or driver is None:
+        return url
+    if dialect == "postgres":
+        dialect = "postgresql"
+    return f"{dialect}+{driver}://{rest}"
+
+
+def _connect_args(url: str, *, is_async: bool) -> dict[str, Any]:
+    """Driver connect arguments for the statement timeout and statement cache.
+
+    The timeout is set once per connection as a server setting, so it bounds
+    runaway queries without an extra SET round-trip per request. On asyncpg,
+    each connection also keeps its prepared statements, so repeated queries
+    skip server-side parsing and planning.
+
+    Args:
+        url: Database URL
+        is_async: Whether the URL is used with the async (asyncpg) driver
+
+    Returns:
+        Keyword arguments for the DBAPI connect call
+    """
+    if not url.startswith(("postgresql", "postgres")):
+        return {}
+    args: dict[str, Any] = {}
+    timeout = settings.DATABASE_STATEMENT_TIMEOUT
+    if is_async:
+        args["prepared_statement_cache_size"] = settings.DATABASE_PREPARED_STATEMENT_CACHE_SIZE
+        if timeout:
+            args["server_settings"] = {"statement_timeout": str(timeout)}
+    elif timeout:
+        args["options"] = f"-c statement_timeout={timeout}"
+    return args
+
+
+# Create database engine (sync routes run in the threadpool and share this pool)
 engine = create_engine(
     str(settings.DATABASE_URL),
     echo=settings.DATABASE_ECHO,
     pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args=_connect_args(str(settings.DATABASE_URL), is_async=False),
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine - lets handlers release the event loop while waiting on the database.
+# Connections are pooled and pre-pinged so requests reuse warm sockets and never
+# see a connection the server has already dropped.
+async_engine = create_async_engine(
+    _to_async_url(str(settings.DATABASE_URL)),
+    echo=settings.DATABASE_ECHO,
+    pool_pre_ping=True,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+    connect_args=_connect_args(str(settings.DATABASE_URL), is_async=True),
+)
+
+# Async session factory (objects stay usable after commit, no implicit IO on access)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Read replica engine for read-only routes; falls back to the primary when unset
+read_async_engine = (
+    create_async_engine(
+        _to_async_url(settings.DATABASE_READ_URL),
+        echo=settings.DATABASE_ECHO,
+        pool_pre_ping=True,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        query_cache_size=settings.DATABASE_QUERY_CACHE_SIZE,
+        connect_args=_connect_args(settings.DATABASE_READ_URL, is_async=True),
+    )
+    if settings.DATABASE_READ_URL
+    else async_engine
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=read_async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def _fill_sync_pool(sync_engine: Engine, size: int) -> None:
+    """Open ``size`` connections at once so they all stay in the pool."""
+    connections = []
+    try:
+        for _ in range(size):
+            connections.append(sync_engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def _fill_async_pool(pool_engine: AsyncEngine, size: int) -> None:
+    """Open ``size`` connections concurrently so they all stay in the pool."""
+    results = await asyncio.gather(
+        *(pool_engine.connect().start() for _ in range(size)), return_exceptions=True
+    )
+    await asyncio.gather(
+        *(result.close() for result in results if not isinstance(result, BaseException))
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def warm_up_pools() -> None:
+    """Fill the connection pools before the first request.
+
+    Otherwise the first requests after a deploy each pay for connection setup
+    and authentication. Failures are logged rather than raised so the app still
+    starts while the database is briefly unreachable; pre-ping replaces any
+    connection that goes stale later.
+    """
+    size = settings.DATABASE_POOL_SIZE
+    async_engines = {async_engine, read_async_engine}
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(_fill_sync_pool, engine, size),
+            *(_fill_async_pool(pool_engine, size) for pool_engine in async_engines),
+        )
+    except Exception:
+        logger.warning("Database connection pool warm-up failed", exc_info=True)
+
+
 # Import Base from models for backward compatibility
 from app.models.base import Base  # noqa: E402, F401
 
@@ -36,3 +197,27 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session.
+
+    Yields:
+        Async database session
+
+    This is a dependency that can be injected into FastAPI routes.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session on the read replica.
+
+    Only use this for routes that never write; replicas may lag the primary.
+
+    Yields:
+        Async database session
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
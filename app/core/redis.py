@@ -0,0 +1,284 @@
+"""Redis client and Redis-backed helpers."""
+
+import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.requests import Request
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Redis | None = None
+
+# Atomically drop stale entries, then claim a slot if the set is below the limit
+_ACQUIRE_SLOT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - ttl)
+if redis.call('ZCARD', key) < limit then
+    redis.call('ZADD', key, now, ARGV[4])
+    redis.call('EXPIRE', key, ttl)
+    return 1
+end
+return 0
+"""
+
+# Adjust a counter only if it is already populated; a missing counter is
+# recomputed from the database on the next read instead
+_INCR_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+# Seconds a storage usage counter lives before it is recomputed from the database
+_STORAGE_USED_TTL = 3600
+
+
+def get_redis() -> Redis | None:
+    """Get the shared Redis client.
+
+    Returns:
+        Redis client, or None if REDIS_URL is not configured
+    """
+    global _redis
+    if _redis is None and settings.REDIS_URL:
+        _redis = Redis.from_url(settings.REDIS_URL)
+    return _redis
+
+
+@asynccontextmanager
+async def concurrency_slot(key: str, limit: int, ttl: int) -> AsyncIterator[bool]:
+    """Hold one of ``limit`` concurrent slots for ``key`` while the block runs.
+
+    Slots live in a sorted set scored by acquisition time, so a slot whose
+    holder died without releasing it expires after ``ttl`` seconds. When Redis
+    is not configured or unreachable the slot is always granted.
+
+    Args:
+        key: Redis key identifying the limited resource
+        limit: Maximum number of concurrent holders
+        ttl: Seconds after which an unreleased slot is considered stale
+
+    Yields:
+        True if a slot was acquired, False if the limit has been reached
+    """
+    redis = get_redis()
+    if redis is None:
+        yield True
+        return
+
+    slot_id = uuid.uuid4().hex
+    try:
+        held = bool(
+            await redis.eval(_ACQUIRE_SLOT_SCRIPT, 1, key, time.time(), ttl, limit, slot_id)
+        )
+        acquired = held
+    except RedisError:
+        logger.warning("Redis unavailable, skipping concurrency limit for %s", key)
+        held, acquired = False, True
+
+    try:
+        yield acquired
+    finally:
+        if held:
+            try:
+                await redis.zrem(key, slot_id)
+            except RedisError:
+                logger.warning("Failed to release concurrency slot for %s", key)
+
+
+def response_cache_index(scope: str, user_id: str) -> str:
+    """Name of the group of cached responses for one user and resource type.
+
+    Args:
+        scope: Resource type, e.g. "files" or "documents"
+        user_id: User the responses were rendered for
+
+    Returns:
+        Cache index name, passed to the set/invalidate helpers
+    """
+    return f"cache:{scope}:{user_id}"
+
+
+def response_cache_key(index: str, request: Request) -> str:
+    """Cache key for a GET response: the index plus path and sorted query string.
+
+    Args:
+        index: Cache index from response_cache_index
+        request: Incoming request
+
+    Returns:
+        Redis key for the cached response body
+    """
+    params = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{index}:{request.url.path}?{params}"
+
+
+async def get_cached_response(key: str) -> bytes | None:
+    """Look up a cached response body, with stale-while-revalidate semantics.
+
+    Entries are fresh for RESPONSE_CACHE_TTL seconds and may be served stale for
+    RESPONSE_CACHE_STALE_TTL more. Once stale, the first caller gets a miss and
+    recomputes the response while everyone else keeps receiving the stale copy,
+    so an expiring entry never sends a burst of identical queries to the
+    database. Redis being unset or unreachable is treated as a miss.
+
+    Args:
+        key: Cache key from response_cache_key
+
+    Returns:
+        Cached JSON body, or None if the caller should render the response
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+
+    try:
+        body, stale_at = await redis.hmget(key, "body", "stale_at")
+        # The client doesn't decode responses, so a hit is always bytes
+        if not isinstance(body, bytes):
+            return None
+        if stale_at is None or float(stale_at) > time.time():
+            return body
+        # Stale: let a single caller refresh it
+        refreshing = await redis.set(
+            f"{key}:refresh", 1, nx=True, ex=settings.RESPONSE_CACHE_STALE_TTL
+        )
+    except RedisError:
+        logger.warning("Redis unavailable, skipping response cache lookup")
+        return None
+    return None if refreshing else body
+
+
+async def set_cached_response(key: str, index: str, body: bytes) -> None:
+    """Store a rendered response body and register it under its index.
+
+    Args:
+        key: Cache key from response_cache_key
+        index: Cache index the key belongs to
+        body: JSON response body
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+
+    lifetime = settings.RESPONSE_CACHE_TTL + settings.RESPONSE_CACHE_STALE_TTL
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(
+                key, mapping={"body": body, "stale_at": time.time() + settings.RESPONSE_CACHE_TTL}
+            )
+            pipe.expire(key, lifetime)
+            pipe.delete(f"{key}:refresh")
+            pipe.sadd(f"{index}:keys", key)
+            pipe.expire(f"{index}:keys", lifetime)
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Redis unavailable, response not cached")
+
+
+async def invalidate_cached_responses(*indexes: str) -> None:
+    """Drop every cached response registered under the given indexes.
+
+    Call after committing a write that changes what those responses contain.
+
+    Args:
+        indexes: Cache indexes from response_cache_index
+    """
+    redis = get_redis()
+    if redis is None or not indexes:
+        return
+
+    key_sets = [f"{index}:keys" for index in indexes]
+    try:
+        keys = await redis.sunion(key_sets)
+        await redis.delete(*keys, *key_sets)
+    except RedisError:
+        logger.warning("Redis unavailable, cached responses not invalidated")
+
+
+def _storage_used_key(user_id: str) -> str:
+    """Redis key holding a user's used storage in bytes."""
+    return f"storage:used:{user_id}"
+
+
+async def get_storage_used(user_id: str) -> int | None:
+    """Get a user's cached storage usage.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Used bytes, or None if not cached (or Redis is unavailable)
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+
+    try:
+        used = await redis.get(_storage_used_key(user_id))
+    except RedisError:
+        logger.warning("Redis unavailable, skipping storage usage lookup")
+        return None
+    return int(used) if used is not None else None
+
+
+async def set_storage_used(user_id: str, used: int) -> None:
+    """Cache a user's storage usage as computed from the database.
+
+    Args:
+        user_id: User ID
+        used: Used bytes
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+
+    try:
+        await redis.set(_storage_used_key(user_id), used, ex=_STORAGE_USED_TTL)
+    except RedisError:
+        logger.warning("Redis unavailable, storage usage not cached")
+
+
+async def adjust_storage_used(user_id: str, delta: int) -> None:
+    """Add ``delta`` bytes to a user's cached storage usage, if it is cached.
+
+    Args:
+        user_id: User ID
+        delta: Bytes added (positive) or removed (negative)
+    """
+    redis = get_redis()
+    if redis is None or not delta:
+        return
+
+    try:
+        await redis.eval(_INCR_IF_EXISTS_SCRIPT, 1, _storage_used_key(user_id), delta)
+    except RedisError:
+        # A counter that missed an update must not be served any more
+        await reset_storage_used(user_id)
+
+
+async def reset_storage_used(user_id: str) -> None:
+    """Drop a user's cached storage usage so the next read recomputes it.
+
+    Args:
+        user_id: User ID
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+
+    try:
+        await redis.delete(_storage_used_key(user_id))
+    except RedisError:
+        logger.warning("Redis unavailable, storage usage not reset for %s", user_id)
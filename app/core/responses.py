@@ -0,0 +1,106 @@
+"""Response classes."""
+
+import hashlib
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Request, status
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively.
+
+    Args:
+        obj: Value orjson could not serialize
+
+    Returns:
+        JSON-compatible representation of the value
+
+    Raises:
+        TypeError: If the value has no known JSON representation
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize content to JSON bytes with orjson.
+
+    Produces the same output as Pydantic's ``model_dump_json`` for plain
+    payload dicts (UTC datetimes use the ``Z`` suffix), so routes can build
+    dicts instead of response models and still match the declared schema.
+
+    Args:
+        content: JSON-compatible content
+
+    Returns:
+        Encoded JSON body
+    """
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Routes return this directly with plain dicts/lists, which skips FastAPI's
+    response model validation and ``jsonable_encoder`` pass. ``response_model``
+    can still be declared on the route to document the schema in OpenAPI.
+    Datetimes, UUIDs and enums are serialized natively; UTC datetimes use the
+    ``Z`` suffix like Pydantic.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Serialize content to JSON bytes.
+
+        Args:
+            content: Response content
+
+        Returns:
+            Encoded JSON body
+        """
+        return dump_json(content)
+
+
+def etag_response(request: Request, body: bytes) -> Response:
+    """Return a pre-rendered JSON body with an ETag validator.
+
+    A matching ``If-None-Match`` header gets an empty 304 instead of the body.
+
+    Args:
+        request: Incoming request
+        body: Rendered JSON body
+
+    Returns:
+        200 response carrying the body, or 304 if the client's copy is current
+    """
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+def minimal_response(request: Request, content: Any) -> Response:
+    """Return content as JSON, or an empty 204 if the client asked for none.
+
+    Clients opt in with ``Prefer: return=minimal`` (RFC 7240); the body stays
+    the default so responses keep matching the shared API spec.
+
+    Args:
+        request: Incoming request
+        content: JSON-compatible response content
+
+    Returns:
+        204 response without a body, or a JSON response carrying the content
+    """
+    if "return=minimal" in request.headers.get("prefer", ""):
+        return Response(
+            status_code=status.HTTP_204_NO_CONTENT,
+            headers={"Preference-Applied": "return=minimal"},
+        )
+    return Response(dump_json(content), media_type="application/json")
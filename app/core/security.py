@@ -1,23 +1,62 @@
 """Security utilities for password hashing and JWT token handling."""
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import multiprocessing
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from functools import lru_cache
+from typing import Any, TypeVar
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from .config import settings
 
-# Password hashing context - matches NestJS/Java implementations (bcrypt)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context - new hashes use Argon2id (64 MiB, 3 passes, 4 lanes).
+# bcrypt hashes (seed data, NestJS/Java implementations) still verify and are
+# upgraded to Argon2id on the next successful login.
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated=["bcrypt"],
+    argon2__type="ID",
+    argon2__memory_cost=65536,
+    argon2__time_cost=3,
+    argon2__parallelism=4,
+)
 
 # Token types
 TOKEN_TYPE_ACCESS = "access"
 TOKEN_TYPE_REFRESH = "refresh"
 
+# Password hashing is CPU-bound, so it runs in worker processes: it neither blocks
+# the event loop nor serializes on the GIL. Created on first use.
+_password_pool: ProcessPoolExecutor | None = None
+_dummy_hash: str | None = None
+
+_T = TypeVar("_T")
+
+# Verified refresh token payloads, keyed by a digest so raw refresh tokens aren't
+# kept in memory. Only valid tokens are stored; ``exp`` is re-checked on every hit.
+_refresh_payloads: TTLCache[bytes, dict[str, Any]] = TTLCache(maxsize=4096, ttl=60)
+
+# HMAC algorithms signed directly with hashlib/hmac (others go through python-jose)
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt.
+    """Hash a password using Argon2id.
 
     Args:
         password: Plain text password
@@ -41,6 +80,140 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password and return a replacement hash if it uses a legacy scheme.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        Tuple of (is_valid, new_hash); new_hash is None unless the stored hash
+        should be replaced (e.g. bcrypt -> Argon2id)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _get_password_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for password hashing, creating it if needed."""
+    global _password_pool
+    if _password_pool is None:
+        # spawn: forking a process that already runs threads is unsafe
+        _password_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _password_pool
+
+
+def shutdown_password_pool() -> None:
+    """Shut down the password hashing process pool, if it was started."""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(cancel_futures=True)
+        _password_pool = None
+
+
+async def _run_in_password_pool(func: Callable[..., _T], *args: Any) -> _T:
+    """Run a password hashing function in the process pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_password_pool(), func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop.
+
+    Args:
+        password: Plain text password
+
+    Returns:
+        Hashed password
+    """
+    return await _run_in_password_pool(hash_password, password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Verify a password without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+
+    Returns:
+        Tuple of (is_valid, new_hash), see verify_and_update_password
+    """
+    return await _run_in_password_pool(verify_and_update_password, plain_password, hashed_password)
+
+
+async def verify_dummy_password(plain_password: str) -> None:
+    """Spend one password verification when no account matches.
+
+    Running the same hash work as a real verification keeps the response time of
+    "unknown email" indistinguishable from "wrong password". The dummy hash is
+    generated once, with the production scheme and cost settings.
+
+    Args:
+        plain_password: Plain text password supplied by the client
+    """
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await hash_password_async("halolight-dummy-password")
+    await _run_in_password_pool(verify_password, plain_password, _dummy_hash)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+@lru_cache(maxsize=4)
+def _jwt_header_segment(algorithm: str) -> bytes:
+    """Encoded JWT header; constant for a given algorithm."""
+    header = json.dumps({"alg": algorithm, "typ": "JWT"}, separators=(",", ":"), sort_keys=True)
+    return _b64url(header.encode("utf-8"))
+
+
+@lru_cache(maxsize=4)
+def _hmac_template(secret_key: str, algorithm: str) -> hmac.HMAC:
+    """HMAC keyed once per secret; copies skip the per-token key setup."""
+    return hmac.new(secret_key.encode("utf-8"), digestmod=_HMAC_DIGESTS[algorithm])
+
+
+def _encode_jwt(claims: dict[str, Any], secret_key: str) -> str:
+    """Encode and sign a JWT with the configured algorithm.
+
+    HMAC-signed tokens are built directly from a precomputed header and a
+    pre-keyed HMAC, producing the same compact serialization as python-jose.
+
+    Args:
+        claims: Token claims; datetime values are converted to epoch seconds
+        secret_key: Signing secret
+
+    Returns:
+        Encoded JWT token
+    """
+    algorithm = settings.JWT_ALGORITHM
+    if algorithm not in _HMAC_DIGESTS:
+        return jwt.encode(claims, secret_key, algorithm=algorithm)
+
+    payload = {
+        key: int(value.timestamp()) if isinstance(value, datetime) else value
+        for key, value in claims.items()
+    }
+    signing_input = (
+        _jwt_header_segment(algorithm)
+        + b"."
+        + _b64url(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    )
+    signer = _hmac_template(secret_key, algorithm).copy()
+    signer.update(signing_input)
+    return (signing_input + b"." + _b64url(signer.digest())).decode("ascii")
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token.
 
@@ -66,11 +239,7 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
         }
     )
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        settings.JWT_SECRET_KEY,
-        algorithm=settings.JWT_ALGORITHM,
-    )
+    encoded_jwt = _encode_jwt(to_encode, settings.JWT_SECRET_KEY)
 
     return encoded_jwt
 
@@ -103,11 +272,7 @@ def create_refresh_token(data: dict[str, Any], expires_delta: timedelta | None =
     # Use refresh secret if configured, otherwise fall back to main secret
     secret_key = settings.JWT_REFRESH_SECRET_KEY or settings.JWT_SECRET_KEY
 
-    encoded_jwt = jwt.encode(
-        to_encode,
-        secret_key,
-        algorithm=settings.JWT_ALGORITHM,
-    )
+    encoded_jwt = _encode_jwt(to_encode, secret_key)
 
     return encoded_jwt
 
@@ -161,6 +326,33 @@ def decode_refresh_token(token: str) -> dict[str, Any] | None:
         return None
 
 
+def decode_refresh_token_cached(token: str) -> dict[str, Any] | None:
+    """Decode a refresh token, reusing a previously verified payload when possible.
+
+    Signature verification dominates the cost of decoding, so verified payloads
+    are kept briefly in a bounded cache keyed by the token's digest. Expiry is
+    re-checked on every lookup so a cached payload is never returned past its
+    ``exp`` claim.
+
+    Args:
+        token: JWT refresh token string
+
+    Returns:
+        Decoded token payload or None if invalid or expired
+    """
+    key = hashlib.blake2s(token.encode("utf-8")).digest()
+    payload = _refresh_payloads.get(key)
+    if payload is None:
+        payload = decode_refresh_token(token)
+        if payload is None:
+            return None
+        _refresh_payloads[key] = payload
+    if payload.get("exp", 0) <= time.time():
+        return None
+    # Hand out a copy so callers cannot mutate the cached entry
+    return dict(payload)
+
+
 def generate_tokens(user_id: str, email: str) -> tuple[str, str, datetime]:
     """Generate access and refresh token pair.
 
@@ -1,5 +1,7 @@
 """FastAPI application entry point."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI
@@ -21,6 +23,18 @@ from app.api import (
     users,
 )
 from app.core.config import settings
+from app.core.database import warm_up_pools
+from app.core.security import shutdown_password_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up database pools on startup; release process-wide resources on shutdown."""
+    if settings.DATABASE_POOL_WARMUP:
+        await warm_up_pools()
+    yield
+    shutdown_password_pool()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -30,6 +44,7 @@ app = FastAPI(
     docs_url=f"{settings.API_PREFIX}/docs",
     redoc_url=f"{settings.API_PREFIX}/redoc",
     openapi_url=f"{settings.API_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-import uuid
+import re
+import secrets
 
 from sqlalchemy.orm import DeclarativeBase
 
@@ -17,12 +18,27 @@ def generate_cuid() -> str:
     """Generate a cuid-like identifier.
 
     Format matches Prisma's cuid() output: starts with 'c' followed by
-    25 alphanumeric characters (lowercase).
+    24 alphanumeric characters (lowercase).
 
     Returns:
         A cuid-style string identifier.
     """
-    # Generate a UUID and convert to a cuid-like format
-    # cuid format: c + 25 chars (lowercase alphanumeric)
-    uid = uuid.uuid4().hex + uuid.uuid4().hex[:7]  # 32 + 7 = 39 chars
-    return f"c{uid[:24]}"  # c + 24 chars = 25 total
+    # 12 random bytes -> 24 lowercase hex chars, from a single urandom read
+    return f"c{secrets.token_hex(12)}"  # c + 24 chars = 25 total
+
+
+_CUID_PATTERN = re.compile(r"c[a-z0-9]{24}")
+
+
+def is_cuid(value: str) -> bool:
+    """Check whether a string has the shape of a cuid (as stored by Prisma).
+
+    Lets routes answer 404 for malformed IDs without a database round-trip.
+
+    Args:
+        value: Candidate identifier
+
+    Returns:
+        True if the value is "c" followed by 24 lowercase alphanumerics
+    """
+    return _CUID_PATTERN.fullmatch(value) is not None
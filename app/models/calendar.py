@@ -67,8 +67,13 @@ class CalendarEvent(Base):
     __table_args__ = (
         Index("idx_calendar_events_owner_id", "owner_id"),
         Index("idx_calendar_events_start_at_end_at", "start_at", "end_at"),
+        # Per-owner calendar range queries ordered by start time
+        Index("idx_calendar_events_owner_id_start_at", "owner_id", "start_at"),
     )
 
+    # Fetch created_at/updated_at with RETURNING on flush instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<CalendarEvent(id={self.id}, title={self.title})>"
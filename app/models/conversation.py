@@ -102,7 +102,9 @@ class Message(Base):
     sender: Mapped[User] = relationship("User", back_populates="messages", foreign_keys=[sender_id])
 
     __table_args__ = (
-        Index("idx_messages_conversation_id", "conversation_id"),
+        # Newest messages of a conversation (history page, latest message per
+        # conversation); also serves plain conversation_id lookups
+        Index("idx_messages_conversation_id_created_at", "conversation_id", "created_at"),
         Index("idx_messages_sender_id", "sender_id"),
     )
 
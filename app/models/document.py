@@ -59,8 +59,14 @@ class Document(Base):
     shares: Mapped[list[DocumentShare]] = relationship(
         "DocumentShare", back_populates="document", cascade="all, delete-orphan"
     )
+    # Must be eager-loaded explicitly; tag rows go with the document through the
+    # ON DELETE CASCADE foreign key, so deletes never need to load them
     tags: Mapped[list[DocumentTag]] = relationship(
-        "DocumentTag", back_populates="document", cascade="all, delete-orphan"
+        "DocumentTag",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     __table_args__ = (
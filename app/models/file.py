@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -73,6 +73,9 @@ class Folder(Base):
         Index("idx_folders_owner_id", "owner_id"),
     )
 
+    # Fetch created_at/updated_at with RETURNING on flush instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
+
     def __repr__(self) -> str:
         """String representation."""
         return f"<Folder(id={self.id}, name={self.name}, path={self.path})>"
@@ -117,9 +120,37 @@ class File(Base):
     )
 
     __table_args__ = (
-        Index("idx_files_owner_id", "owner_id"),
+        # Covers size so the storage usage SUM (on a counter miss) is index-only
+        Index("idx_files_owner_id", "owner_id", postgresql_include=["size"]),
         Index("idx_files_folder_id", "folder_id"),
-    )
+        # Keyset pagination of a user's files (optionally within a folder), newest first
+        Index("idx_files_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        Index(
+            "idx_files_owner_id_folder_id_updated_at_id",
+            "owner_id",
+            "folder_id",
+            "updated_at",
+            "id",
+        ),
+        # Prefix matches on mime_type (e.g. "image/%"); text_pattern_ops makes
+        # LIKE index-friendly regardless of the database collation
+        Index(
+            "idx_files_owner_id_mime_type",
+            "owner_id",
+            "mime_type",
+            postgresql_ops={"mime_type": "text_pattern_ops"},
+        ),
+        # Substring ILIKE on mime_type; requires the pg_trgm extension
+        Index(
+            "idx_files_mime_type_trgm",
+            "mime_type",
+            postgresql_using="gin",
+            postgresql_ops={"mime_type": "gin_trgm_ops"},
+        ),
+    )
+
+    # Fetch server defaults (timestamps, is_favorite) with RETURNING on flush
+    __mapper_args__ = {"eager_defaults": True}
 
     def __repr__(self) -> str:
         """String representation."""
@@ -161,7 +192,22 @@ class FileShare(Base):
     __table_args__ = (
         Index("idx_file_shares_file_id", "file_id"),
         Index("idx_file_shares_shared_with_id", "shared_with_id"),
-        Index("idx_file_shares_share_token", "share_token"),
+        # Share link lookups only ever match active shares; the full unique
+        # constraint on share_token still guards token uniqueness
+        Index(
+            "idx_file_shares_share_token_active",
+            "share_token",
+            unique=True,
+            postgresql_where=text("is_revoked = false"),
+        ),
+        # Duplicate-share check when creating a share (active shares only)
+        Index(
+            "idx_file_shares_file_id_shared_with_id_team_id_active",
+            "file_id",
+            "shared_with_id",
+            "team_id",
+            postgresql_where=text("is_revoked = false"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -194,7 +240,11 @@ class FileAccessLog(Base):
     __table_args__ = (
         Index("idx_file_access_logs_file_id", "file_id"),
         Index("idx_file_access_logs_user_id", "user_id"),
+        # ON DELETE SET NULL lookup when file deletes cascade to their shares
+        Index("idx_file_access_logs_share_id", "share_id"),
         Index("idx_file_access_logs_accessed_at", "accessed_at"),
+        # Keyset pagination of a file's access logs, newest first
+        Index("idx_file_access_logs_file_id_accessed_at_id", "file_id", "accessed_at", "id"),
     )
 
     def __repr__(self) -> str:
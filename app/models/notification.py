@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -36,7 +36,17 @@ class Notification(Base):
     # Relationships
     user: Mapped[User] = relationship("User", back_populates="notifications")
 
-    __table_args__ = (Index("idx_notifications_user_id_read", "user_id", "read"),)
+    __table_args__ = (
+        Index("idx_notifications_user_id_read", "user_id", "read"),
+        # A user's latest notifications, newest first
+        Index("idx_notifications_user_id_created_at", "user_id", "created_at"),
+        # Unread count polled by clients; only unread rows are indexed
+        Index(
+            "idx_notifications_user_id_unread",
+            "user_id",
+            postgresql_where=text("read = false"),
+        ),
+    )
 
     def __repr__(self) -> str:
         """String representation."""
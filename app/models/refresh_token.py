@@ -21,6 +21,8 @@ class RefreshToken(Base):
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=generate_cuid)
     user_id: Mapped[str] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # SHA-256 hex digest of the refresh token; rows issued before hashing may
+    # still hold the raw JWT until their next rotation
     token: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
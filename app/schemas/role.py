@@ -31,8 +31,11 @@ class PermissionResponse(BaseModel):
 
     @classmethod
     def from_orm_model(cls, obj):
-        """Convert from ORM model where field is 'action' to response with 'name'."""
-        return cls(id=obj.id, name=obj.action, description=obj.description)
+        """Convert from ORM model where field is 'action' to response with 'name'.
+
+        Skips validation: every value comes straight from a loaded Permission.
+        """
+        return cls.model_construct(id=obj.id, name=obj.action, description=obj.description)
 
 
 class PermissionListResponse(BaseModel):
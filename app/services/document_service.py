@@ -1,17 +1,23 @@
 """Document service for business logic."""
 
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
+from typing import Any
 
-from app.models import Document, DocumentShare, DocumentTag, Tag
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models import Document, DocumentShare, DocumentTag, Tag, TeamMember, User
 from app.models.base import generate_cuid
 from app.schemas.document import DocumentCreate, DocumentUpdate
 
+# IDs per DELETE statement in batch_delete
+_BATCH_DELETE_CHUNK_SIZE = 1000
+
 
 class DocumentService:
     """Document service for managing document operations."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """Initialize document service.
 
         Args:
@@ -19,7 +25,7 @@ class DocumentService:
         """
         self.db = db
 
-    def get_by_id(self, document_id: str, with_relations: bool = True) -> Document | None:
+    async def get_by_id(self, document_id: str, with_relations: bool = True) -> Document | None:
         """Get document by ID.
 
         Args:
@@ -29,15 +35,15 @@ class DocumentService:
         Returns:
             Document or None if not found
         """
-        query = self.db.query(Document).filter(Document.id == document_id)
+        query = select(Document).where(Document.id == document_id)
         if with_relations:
             query = query.options(
                 joinedload(Document.owner),
-                joinedload(Document.tags).joinedload(DocumentTag.tag),
+                selectinload(Document.tags).joinedload(DocumentTag.tag),
             )
-        return query.first()
+        return await self.db.scalar(query)
 
-    def get_list(
+    async def get_list(
         self,
         user_id: str,
         page: int = 1,
@@ -57,52 +63,74 @@ class DocumentService:
             search: Search in title
 
         Returns:
-            Tuple of (documents, total_count)
+            Tuple of (documents, total_count); owners are not loaded, see get_owners
         """
-        query = self.db.query(Document).options(
-            joinedload(Document.owner),
-            joinedload(Document.tags).joinedload(DocumentTag.tag),
-        )
-
         # Filter by owner or shared with user
-        query = query.filter(
+        filters = [
             or_(
                 Document.owner_id == user_id,
                 Document.id.in_(
-                    self.db.query(DocumentShare.document_id).filter(
-                        DocumentShare.shared_with_id == user_id
-                    )
+                    select(DocumentShare.document_id).where(DocumentShare.shared_with_id == user_id)
                 ),
             )
-        )
+        ]
 
         # Filter by folder
         if folder_id:
-            query = query.filter(Document.folder == folder_id)
+            filters.append(Document.folder == folder_id)
 
         # Filter by tags
         if tags:
-            tag_ids = self.db.query(Tag.id).filter(Tag.name.in_(tags)).subquery()
-            query = query.filter(
+            tag_ids = select(Tag.id).where(Tag.name.in_(tags))
+            filters.append(
                 Document.id.in_(
-                    self.db.query(DocumentTag.document_id).filter(DocumentTag.tag_id.in_(tag_ids))
+                    select(DocumentTag.document_id).where(DocumentTag.tag_id.in_(tag_ids))
                 )
             )
 
         # Search in title
         if search:
-            query = query.filter(Document.title.ilike(f"%{search}%"))
+            filters.append(Document.title.ilike(f"%{search}%"))
 
         # Get total count
-        total = query.count()
+        total = await self.db.scalar(select(func.count()).select_from(Document).where(*filters))
 
         # Apply pagination
         offset = (page - 1) * limit
-        documents = query.order_by(Document.updated_at.desc()).offset(offset).limit(limit).all()
+        documents = await self.db.scalars(
+            select(Document)
+            .where(*filters)
+            .options(selectinload(Document.tags).joinedload(DocumentTag.tag))
+            .order_by(Document.updated_at.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+
+        return list(documents), total or 0
 
-        return documents, total
+    async def get_owners(self, documents: list[Document], known: User) -> dict[str, User]:
+        """Batch-load the owners of a page of documents.
 
-    def create(
+        Owners are resolved once per distinct ID rather than joined onto every
+        document row. The known user (normally the current user, who owns most
+        listed documents) is used as is, so a page of one's own documents needs
+        no query at all.
+
+        Args:
+            documents: Documents to resolve owners for
+            known: User already in hand
+
+        Returns:
+            Owners keyed by user ID
+        """
+        owners = {known.id: known}
+        missing = {document.owner_id for document in documents} - owners.keys()
+        if missing:
+            users = await self.db.scalars(select(User).where(User.id.in_(missing)))
+            owners.update((user.id, user) for user in users)
+        return owners
+
+    async def create(
         self,
         document_data: DocumentCreate,
         owner_id: str,
@@ -127,103 +155,126 @@ class DocumentService:
         )
 
         self.db.add(document)
-        self.db.flush()
+        await self.db.flush()
 
         # Add tags
         if document_data.tags:
-            self._update_tags(document.id, document_data.tags)
+            await self._update_tags(document.id, document_data.tags)
+
+        await self.db.commit()
 
-        self.db.commit()
-        self.db.refresh(document)
+        return await self.get_by_id(document.id)
 
-        return self.get_by_id(document.id)
+    async def _update_owned(
+        self, document_id: str, owner_id: str, values: dict[str, Any]
+    ) -> Document | None:
+        """Update a document owned by the user and load its tags.
 
-    def update(self, document_id: str, document_data: DocumentUpdate) -> Document | None:
+        Issues a single UPDATE ... RETURNING with the ownership check in its
+        WHERE clause instead of loading the document first.
+
+        Args:
+            document_id: Document ID
+            owner_id: ID of the user who must own the document
+            values: Column attribute values to set
+
+        Returns:
+            Updated document with tags loaded, or None if not found or not owned
+        """
+        document = await self.db.scalar(
+            update(Document)
+            .where(Document.id == document_id, Document.owner_id == owner_id)
+            .values(**values)
+            .returning(Document)
+            .options(selectinload(Document.tags).joinedload(DocumentTag.tag))
+        )
+        await self.db.commit()
+
+        return document
+
+    async def update(
+        self, document_id: str, owner_id: str, document_data: DocumentUpdate
+    ) -> Document | None:
         """Update document.
 
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
             document_data: Document update data
 
         Returns:
-            Updated document or None if not found
+            Updated document or None if not found or not owned
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        if not document:
-            return None
-
-        update_dict = document_data.model_dump(exclude_unset=True)
-        for key, value in update_dict.items():
-            if value is not None:
-                setattr(document, key, value)
+        values = {
+            key: value
+            for key, value in document_data.model_dump(exclude_unset=True).items()
+            if value is not None
+        }
 
         # Update size if content changed
-        if "content" in update_dict:
-            document.size = len(document.content.encode("utf-8"))
+        if "content" in values:
+            values["size"] = len(values["content"].encode("utf-8"))
 
-        self.db.commit()
-        self.db.refresh(document)
+        # An empty update still needs a SET clause to run the ownership check
+        values.setdefault("updated_at", func.now())
 
-        return self.get_by_id(document_id)
+        return await self._update_owned(document_id, owner_id, values)
 
-    def rename(self, document_id: str, title: str) -> Document | None:
+    async def rename(self, document_id: str, owner_id: str, title: str) -> Document | None:
         """Rename document.
 
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
             title: New title
 
         Returns:
-            Updated document or None if not found
+            Updated document or None if not found or not owned
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        if not document:
-            return None
-
-        document.title = title
-        self.db.commit()
-
-        return self.get_by_id(document_id)
+        return await self._update_owned(document_id, owner_id, {"title": title})
 
-    def move(self, document_id: str, folder_id: str | None) -> Document | None:
+    async def move(self, document_id: str, owner_id: str, folder_id: str | None) -> Document | None:
         """Move document to folder.
 
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
             folder_id: Target folder ID (None for root)
 
         Returns:
-            Updated document or None if not found
+            Updated document or None if not found or not owned
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        if not document:
-            return None
-
-        document.folder = folder_id
-        self.db.commit()
+        return await self._update_owned(document_id, owner_id, {"folder": folder_id})
 
-        return self.get_by_id(document_id)
-
-    def update_tags(self, document_id: str, tags: list[str]) -> Document | None:
+    async def update_tags(
+        self, document_id: str, owner_id: str, tags: list[str]
+    ) -> Document | None:
         """Update document tags.
 
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
             tags: List of tag names
 
         Returns:
-            Updated document or None if not found
+            Updated document or None if not found or not owned
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        if not document:
+        # Touching updated_at doubles as the ownership check
+        owned = await self.db.scalar(
+            update(Document)
+            .where(Document.id == document_id, Document.owner_id == owner_id)
+            .values(updated_at=func.now())
+            .returning(Document.id)
+        )
+        if owned is None:
             return None
 
-        self._update_tags(document_id, tags)
-        self.db.commit()
+        await self._update_tags(document_id, tags)
+        await self.db.commit()
 
-        return self.get_by_id(document_id)
+        return await self.get_by_id(document_id)
 
-    def _update_tags(self, document_id: str, tag_names: list[str]) -> None:
+    async def _update_tags(self, document_id: str, tag_names: list[str]) -> None:
         """Update tags for a document (internal helper).
 
         Args:
@@ -231,26 +282,29 @@ class DocumentService:
             tag_names: List of tag names
         """
         # Remove existing tags
-        self.db.query(DocumentTag).filter(DocumentTag.document_id == document_id).delete(
-            synchronize_session=False
+        await self.db.execute(
+            delete(DocumentTag)
+            .where(DocumentTag.document_id == document_id)
+            .execution_options(synchronize_session=False)
         )
 
         # Add new tags
         for tag_name in tag_names:
             # Get or create tag
-            tag = self.db.query(Tag).filter(Tag.name == tag_name).first()
+            tag = await self.db.scalar(select(Tag).where(Tag.name == tag_name))
             if not tag:
                 tag = Tag(id=generate_cuid(), name=tag_name)
                 self.db.add(tag)
-                self.db.flush()
+                await self.db.flush()
 
             # Create document-tag relation
             doc_tag = DocumentTag(document_id=document_id, tag_id=tag.id)
             self.db.add(doc_tag)
 
-    def share(
+    async def share(
         self,
         document_id: str,
+        owner_id: str,
         user_id: str | None = None,
         team_id: str | None = None,
         permission: str = "READ",
@@ -259,15 +313,18 @@ class DocumentService:
 
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
             user_id: User ID to share with
             team_id: Team ID to share with
             permission: Permission level
 
         Returns:
-            Created share or None if document not found
+            Created share or None if document not found or not owned
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        if not document:
+        owned = await self.db.scalar(
+            select(Document.id).where(Document.id == document_id, Document.owner_id == owner_id)
+        )
+        if owned is None:
             return None
 
         # Check if already shared - build filters dynamically
@@ -277,11 +334,11 @@ class DocumentService:
         if team_id:
             filters.append(DocumentShare.team_id == team_id)
 
-        existing = self.db.query(DocumentShare).filter(*filters).first()
+        existing = await self.db.scalar(select(DocumentShare).where(*filters))
 
         if existing:
             existing.permission = permission
-            self.db.commit()
+            await self.db.commit()
             return existing
 
         share = DocumentShare(
@@ -293,14 +350,15 @@ class DocumentService:
         )
 
         self.db.add(share)
-        self.db.commit()
-        self.db.refresh(share)
+        await self.db.commit()
+        await self.db.refresh(share)
 
         return share
 
-    def unshare(
+    async def unshare(
         self,
         document_id: str,
+        owner_id: str,
         user_id: str | None = None,
         team_id: str | None = None,
     ) -> bool:
@@ -308,43 +366,57 @@ class DocumentService:
 
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
             user_id: User ID to unshare
             team_id: Team ID to unshare
 
         Returns:
-            True if unshared, False if not found
+            True if unshared, False if the share or an owned document is not found
         """
-        query = self.db.query(DocumentShare).filter(DocumentShare.document_id == document_id)
+        stmt = delete(DocumentShare).where(
+            DocumentShare.document_id == document_id,
+            DocumentShare.document_id.in_(
+                select(Document.id).where(Document.id == document_id, Document.owner_id == owner_id)
+            ),
+        )
 
         if user_id:
-            query = query.filter(DocumentShare.shared_with_id == user_id)
+            stmt = stmt.where(DocumentShare.shared_with_id == user_id)
         if team_id:
-            query = query.filter(DocumentShare.team_id == team_id)
+            stmt = stmt.where(DocumentShare.team_id == team_id)
 
-        deleted = query.delete(synchronize_session=False)
-        self.db.commit()
+        deleted_ids = await self.db.scalars(
+            stmt.returning(DocumentShare.id).execution_options(synchronize_session=False)
+        )
+        unshared = bool(deleted_ids.all())
+        await self.db.commit()
 
-        return deleted > 0
+        return unshared
 
-    def delete(self, document_id: str) -> bool:
+    async def delete(self, document_id: str, owner_id: str) -> bool:
         """Delete document.
 
+        Tags and shares go with the document through their ON DELETE CASCADE
+        foreign keys, as in batch_delete.
+
         Args:
             document_id: Document ID
+            owner_id: ID of the user who must own the document
 
         Returns:
-            True if deleted, False if not found
+            True if deleted, False if not found or not owned
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        if not document:
-            return False
-
-        self.db.delete(document)
-        self.db.commit()
+        deleted = await self.db.scalar(
+            delete(Document)
+            .where(Document.id == document_id, Document.owner_id == owner_id)
+            .returning(Document.id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
 
-        return True
+        return deleted is not None
 
-    def batch_delete(self, document_ids: list[str], user_id: str) -> int:
+    async def batch_delete(self, document_ids: list[str], user_id: str) -> int:
         """Batch delete documents.
 
         Args:
@@ -354,29 +426,35 @@ class DocumentService:
         Returns:
             Number of deleted documents
         """
-        deleted = (
-            self.db.query(Document)
-            .filter(Document.id.in_(document_ids), Document.owner_id == user_id)
-            .delete(synchronize_session=False)
-        )
-        self.db.commit()
+        deleted = 0
+        # Chunk very large ID lists to stay well under driver bind-parameter limits
+        for start in range(0, len(document_ids), _BATCH_DELETE_CHUNK_SIZE):
+            chunk = document_ids[start : start + _BATCH_DELETE_CHUNK_SIZE]
+            # Ownership is enforced by the WHERE clause; tags and shares go with
+            # the documents through their ON DELETE CASCADE foreign keys
+            deleted_ids = await self.db.scalars(
+                delete(Document)
+                .where(Document.id.in_(chunk), Document.owner_id == user_id)
+                .returning(Document.id)
+                .execution_options(synchronize_session=False)
+            )
+            deleted += len(deleted_ids.all())
+        await self.db.commit()
 
         return deleted
 
-    def is_owner(self, document_id: str, user_id: str) -> bool:
-        """Check if user is owner of document.
+    async def get_owner_id(self, document_id: str) -> str | None:
+        """Get the owner of a document without loading it.
 
         Args:
             document_id: Document ID
-            user_id: User ID
 
         Returns:
-            True if user is owner
+            Owner user ID or None if the document does not exist
         """
-        document = self.get_by_id(document_id, with_relations=False)
-        return document is not None and document.owner_id == user_id
+        return await self.db.scalar(select(Document.owner_id).where(Document.id == document_id))
 
-    def can_access(self, document_id: str, user_id: str) -> bool:
+    async def can_access(self, document_id: str, user_id: str) -> bool:
         """Check if user can access document.
 
         Args:
@@ -386,7 +464,7 @@ class DocumentService:
         Returns:
             True if user can access
         """
-        document = self.get_by_id(document_id, with_relations=False)
+        document = await self.get_by_id(document_id, with_relations=False)
         if not document:
             return False
 
@@ -394,30 +472,24 @@ class DocumentService:
             return True
 
         # Check if shared with user directly
-        share = (
-            self.db.query(DocumentShare)
-            .filter(
+        share = await self.db.scalar(
+            select(DocumentShare.id).where(
                 DocumentShare.document_id == document_id,
                 DocumentShare.shared_with_id == user_id,
             )
-            .first()
         )
 
         if share:
             return True
 
         # Check if shared via team membership
-        from app.models import TeamMember
-
-        team_share = (
-            self.db.query(DocumentShare)
-            .filter(
+        team_share = await self.db.scalar(
+            select(DocumentShare.id).where(
                 DocumentShare.document_id == document_id,
                 DocumentShare.team_id.in_(
-                    self.db.query(TeamMember.team_id).filter(TeamMember.user_id == user_id)
+                    select(TeamMember.team_id).where(TeamMember.user_id == user_id)
                 ),
             )
-            .first()
         )
 
         return team_share is not None
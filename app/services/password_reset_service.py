@@ -7,11 +7,11 @@ import logging
 import secrets
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import update
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 from app.models import PasswordResetToken, User
 from app.models.base import generate_cuid
 
@@ -45,11 +45,11 @@ class UsedTokenError(PasswordResetError):
 class PasswordResetService:
     """Handle password reset token creation and consumption."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """Initialize the service with a database session.
 
         Args:
-            db: SQLAlchemy database session
+            db: SQLAlchemy async database session
         """
         self.db = db
 
@@ -64,7 +64,7 @@ class PasswordResetService:
         """
         return hashlib.sha256(token.encode("utf-8")).hexdigest()
 
-    def create_token(self, user: User) -> str:
+    async def create_token(self, user: User) -> str:
         """Create a reset token, store hash, and return raw token.
 
         This method invalidates any previous tokens for the user before
@@ -85,7 +85,9 @@ class PasswordResetService:
 
         try:
             # Invalidate previous tokens for this user
-            self.db.query(PasswordResetToken).filter(PasswordResetToken.user_id == user.id).delete()
+            await self.db.execute(
+                delete(PasswordResetToken).where(PasswordResetToken.user_id == user.id)
+            )
 
             # Create new token record
             record = PasswordResetToken(
@@ -95,15 +97,15 @@ class PasswordResetService:
                 expires_at=expires_at,
             )
             self.db.add(record)
-            self.db.commit()
+            await self.db.commit()
 
             logger.info("Created password reset token for user %s", user.id)
             return raw_token
         except Exception:
-            self.db.rollback()
+            await self.db.rollback()
             raise
 
-    def reset_password(self, token: str, new_password: str) -> User:
+    async def reset_password(self, token: str, new_password: str) -> User:
         """Validate token and update the user's password atomically.
 
         Uses atomic update to ensure the token can only be used once,
@@ -128,7 +130,7 @@ class PasswordResetService:
         try:
             # Atomic update: mark token as used only if not already used and not expired
             # This prevents race conditions where two concurrent requests both pass validation
-            result = self.db.execute(
+            result = await self.db.execute(
                 update(PasswordResetToken)
                 .where(PasswordResetToken.token_hash == token_hash)
                 .where(PasswordResetToken.used_at.is_(None))
@@ -140,10 +142,8 @@ class PasswordResetService:
 
             if not row:
                 # Token not found, already used, or expired - need to determine which
-                record = (
-                    self.db.query(PasswordResetToken)
-                    .filter(PasswordResetToken.token_hash == token_hash)
-                    .first()
+                record = await self.db.scalar(
+                    select(PasswordResetToken).where(PasswordResetToken.token_hash == token_hash)
                 )
 
                 if not record:
@@ -168,26 +168,26 @@ class PasswordResetService:
             user_id = row[0]
 
             # Get user and update password
-            user = self.db.query(User).filter(User.id == user_id).first()
+            user = await self.db.get(User, user_id)
             if not user:
-                self.db.rollback()
+                await self.db.rollback()
                 raise ValueError("User not found for token")
 
             # Update password
-            user.password = hash_password(new_password)
-            self.db.commit()
+            user.password = await hash_password_async(new_password)
+            await self.db.commit()
 
             logger.info("Password reset completed for user %s", user.id)
             return user
 
         except (InvalidTokenError, UsedTokenError, ExpiredTokenError, ValueError):
-            self.db.rollback()
+            await self.db.rollback()
             raise
         except Exception:
-            self.db.rollback()
+            await self.db.rollback()
             raise
 
-    def verify_token(self, token: str) -> User:
+    async def verify_token(self, token: str) -> User:
         """Verify a reset token and return the associated user.
 
         Note: This does NOT consume the token, use reset_password for that.
@@ -205,10 +205,8 @@ class PasswordResetService:
             ValueError: If user not found
         """
         token_hash = self._hash_token(token)
-        record = (
-            self.db.query(PasswordResetToken)
-            .filter(PasswordResetToken.token_hash == token_hash)
-            .first()
+        record = await self.db.scalar(
+            select(PasswordResetToken).where(PasswordResetToken.token_hash == token_hash)
         )
 
         if not record:
@@ -221,13 +219,13 @@ class PasswordResetService:
         if record.is_expired(now):
             raise ExpiredTokenError("Reset token has expired")
 
-        user = self.db.query(User).filter(User.id == record.user_id).first()
+        user = await self.db.get(User, record.user_id)
         if not user:
             raise ValueError("User not found for token")
 
         return user
 
-    def cleanup_expired_tokens(self) -> int:
+    async def cleanup_expired_tokens(self) -> int:
         """Remove all expired tokens from the database.
 
         Returns:
@@ -235,14 +233,15 @@ class PasswordResetService:
         """
         now = datetime.now(UTC)
         try:
-            count = (
-                self.db.query(PasswordResetToken)
-                .filter(PasswordResetToken.expires_at < now)
-                .delete()
+            deleted_ids = await self.db.scalars(
+                delete(PasswordResetToken)
+                .where(PasswordResetToken.expires_at < now)
+                .returning(PasswordResetToken.id)
             )
-            self.db.commit()
+            count = len(deleted_ids.all())
+            await self.db.commit()
             logger.info("Cleaned up %d expired password reset tokens", count)
             return count
         except Exception:
-            self.db.rollback()
+            await self.db.rollback()
             raise
@@ -1,17 +1,28 @@
 """Role and Permission services for business logic."""
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import ScalarSelect, delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.models import Permission, Role, RolePermission, UserRole
 from app.models.base import generate_cuid
 from app.schemas.role import PermissionCreate, RoleCreate, RoleUpdate
 
 
+def _user_count() -> ScalarSelect[int]:
+    """Number of users with the role of the enclosing query's row."""
+    return (
+        select(func.count(UserRole.user_id))
+        .where(UserRole.role_id == Role.id)
+        .correlate(Role)
+        .scalar_subquery()
+    )
+
+
 class PermissionService:
     """Permission service for managing permission operations."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """Initialize permission service.
 
         Args:
@@ -19,7 +30,7 @@ class PermissionService:
         """
         self.db = db
 
-    def get_by_id(self, permission_id: str) -> Permission | None:
+    async def get_by_id(self, permission_id: str) -> Permission | None:
         """Get permission by ID.
 
         Args:
@@ -28,9 +39,9 @@ class PermissionService:
         Returns:
             Permission or None if not found
         """
-        return self.db.query(Permission).filter(Permission.id == permission_id).first()
+        return await self.db.get(Permission, permission_id)
 
-    def get_by_action(self, action: str) -> Permission | None:
+    async def get_by_action(self, action: str) -> Permission | None:
         """Get permission by action name.
 
         Args:
@@ -39,17 +50,17 @@ class PermissionService:
         Returns:
             Permission or None if not found
         """
-        return self.db.query(Permission).filter(Permission.action == action).first()
+        return await self.db.scalar(select(Permission).where(Permission.action == action))
 
-    def get_all(self) -> list[Permission]:
+    async def get_all(self) -> list[Permission]:
         """Get all permissions.
 
         Returns:
             List of all permissions
         """
-        return self.db.query(Permission).order_by(Permission.action).all()
+        return list(await self.db.scalars(select(Permission).order_by(Permission.action)))
 
-    def create(self, permission_data: PermissionCreate) -> Permission:
+    async def create(self, permission_data: PermissionCreate) -> Permission:
         """Create a new permission.
 
         Args:
@@ -61,7 +72,7 @@ class PermissionService:
         Raises:
             ValueError: If permission with action already exists
         """
-        existing = self.get_by_action(permission_data.name)
+        existing = await self.get_by_action(permission_data.name)
         if existing:
             raise ValueError(f"Permission '{permission_data.name}' already exists")
 
@@ -72,12 +83,12 @@ class PermissionService:
         )
 
         self.db.add(permission)
-        self.db.commit()
-        self.db.refresh(permission)
+        await self.db.commit()
+        await self.db.refresh(permission)
 
         return permission
 
-    def delete(self, permission_id: str) -> bool:
+    async def delete(self, permission_id: str) -> bool:
         """Delete permission.
 
         Args:
@@ -86,12 +97,12 @@ class PermissionService:
         Returns:
             True if deleted, False if not found
         """
-        permission = self.get_by_id(permission_id)
+        permission = await self.get_by_id(permission_id)
         if not permission:
             return False
 
-        self.db.delete(permission)
-        self.db.commit()
+        await self.db.delete(permission)
+        await self.db.commit()
 
         return True
 
@@ -99,7 +110,7 @@ class PermissionService:
 class RoleService:
     """Role service for managing role operations."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """Initialize role service.
 
         Args:
@@ -107,7 +118,7 @@ class RoleService:
         """
         self.db = db
 
-    def get_by_id(self, role_id: str, with_permissions: bool = False) -> Role | None:
+    async def get_by_id(self, role_id: str, with_permissions: bool = False) -> Role | None:
         """Get role by ID.
 
         Args:
@@ -117,14 +128,14 @@ class RoleService:
         Returns:
             Role or None if not found
         """
-        query = self.db.query(Role).filter(Role.id == role_id)
+        query = select(Role).where(Role.id == role_id)
         if with_permissions:
             query = query.options(
-                joinedload(Role.permissions).joinedload(RolePermission.permission)
+                selectinload(Role.permissions).selectinload(RolePermission.permission)
             )
-        return query.first()
+        return await self.db.scalar(query)
 
-    def get_by_name(self, name: str) -> Role | None:
+    async def get_by_name(self, name: str) -> Role | None:
         """Get role by name.
 
         Args:
@@ -133,9 +144,9 @@ class RoleService:
         Returns:
             Role or None if not found
         """
-        return self.db.query(Role).filter(Role.name == name).first()
+        return await self.db.scalar(select(Role).where(Role.name == name))
 
-    def get_all(self, with_permissions: bool = True) -> list[Role]:
+    async def get_all(self, with_permissions: bool = True) -> list[Role]:
         """Get all roles.
 
         Args:
@@ -144,14 +155,48 @@ class RoleService:
         Returns:
             List of all roles
         """
-        query = self.db.query(Role)
+        query = select(Role)
         if with_permissions:
             query = query.options(
-                joinedload(Role.permissions).joinedload(RolePermission.permission)
+                selectinload(Role.permissions).selectinload(RolePermission.permission)
+            )
+        return list(await self.db.scalars(query.order_by(Role.name)))
+
+    async def get_by_id_with_user_count(self, role_id: str) -> tuple[Role, int] | None:
+        """Get role by ID with its permissions and user count in one query.
+
+        Args:
+            role_id: Role ID
+
+        Returns:
+            Tuple of (role, user_count) or None if not found
+        """
+        row = (
+            await self.db.execute(
+                select(Role, _user_count())
+                .where(Role.id == role_id)
+                .options(selectinload(Role.permissions).selectinload(RolePermission.permission))
             )
-        return query.order_by(Role.name).all()
+        ).first()
+        return (row[0], row[1]) if row else None
+
+    async def get_all_with_user_counts(self) -> list[tuple[Role, int]]:
+        """Get all roles with their permissions and user counts.
+
+        The counts come from a correlated subquery, so the number of queries
+        doesn't grow with the number of roles.
 
-    def get_user_count(self, role_id: str) -> int:
+        Returns:
+            List of (role, user_count) tuples ordered by role name
+        """
+        rows = await self.db.execute(
+            select(Role, _user_count())
+            .options(selectinload(Role.permissions).selectinload(RolePermission.permission))
+            .order_by(Role.name)
+        )
+        return [(role, user_count) for role, user_count in rows]
+
+    async def get_user_count(self, role_id: str) -> int:
         """Get count of users with this role.
 
         Args:
@@ -161,11 +206,13 @@ class RoleService:
             Number of users with this role
         """
         return (
-            self.db.query(func.count(UserRole.user_id)).filter(UserRole.role_id == role_id).scalar()
+            await self.db.scalar(
+                select(func.count(UserRole.user_id)).where(UserRole.role_id == role_id)
+            )
             or 0
         )
 
-    def create(self, role_data: RoleCreate) -> Role:
+    async def create(self, role_data: RoleCreate) -> Role:
         """Create a new role.
 
         Args:
@@ -177,7 +224,7 @@ class RoleService:
         Raises:
             ValueError: If role with name already exists
         """
-        existing = self.get_by_name(role_data.name)
+        existing = await self.get_by_name(role_data.name)
         if existing:
             raise ValueError(f"Role '{role_data.name}' already exists")
 
@@ -189,12 +236,12 @@ class RoleService:
         )
 
         self.db.add(role)
-        self.db.commit()
-        self.db.refresh(role)
+        await self.db.commit()
+        await self.db.refresh(role)
 
         return role
 
-    def update(self, role_id: str, role_data: RoleUpdate) -> Role | None:
+    async def update(self, role_id: str, role_data: RoleUpdate) -> Role | None:
         """Update role.
 
         Args:
@@ -204,7 +251,7 @@ class RoleService:
         Returns:
             Updated role or None if not found
         """
-        role = self.get_by_id(role_id)
+        role = await self.get_by_id(role_id)
         if not role:
             return None
 
@@ -213,12 +260,12 @@ class RoleService:
             if value is not None:
                 setattr(role, key, value)
 
-        self.db.commit()
-        self.db.refresh(role)
+        await self.db.commit()
+        await self.db.refresh(role)
 
         return role
 
-    def delete(self, role_id: str) -> bool:
+    async def delete(self, role_id: str) -> bool:
         """Delete role.
 
         Args:
@@ -227,16 +274,16 @@ class RoleService:
         Returns:
             True if deleted, False if not found
         """
-        role = self.get_by_id(role_id)
+        role = await self.get_by_id(role_id)
         if not role:
             return False
 
-        self.db.delete(role)
-        self.db.commit()
+        await self.db.delete(role)
+        await self.db.commit()
 
         return True
 
-    def assign_permissions(self, role_id: str, permission_ids: list[str]) -> Role | None:
+    async def assign_permissions(self, role_id: str, permission_ids: list[str]) -> Role | None:
         """Assign permissions to a role (replaces existing).
 
         Args:
@@ -246,26 +293,24 @@ class RoleService:
         Returns:
             Updated role with permissions or None if role not found
         """
-        role = self.get_by_id(role_id, with_permissions=True)
+        role = await self.get_by_id(role_id)
         if not role:
             return None
 
         # Remove existing role permissions
-        self.db.query(RolePermission).filter(RolePermission.role_id == role_id).delete(
-            synchronize_session=False
-        )
+        await self.db.execute(delete(RolePermission).where(RolePermission.role_id == role_id))
 
         # Add new permissions
         for perm_id in permission_ids:
             role_permission = RolePermission(role_id=role_id, permission_id=perm_id)
             self.db.add(role_permission)
 
-        self.db.commit()
+        await self.db.commit()
 
         # Refresh to get updated permissions
-        return self.get_by_id(role_id, with_permissions=True)
+        return await self.get_by_id(role_id, with_permissions=True)
 
-    def get_role_permissions(self, role_id: str) -> list[Permission]:
+    async def get_role_permissions(self, role_id: str) -> list[Permission]:
         """Get all permissions for a role.
 
         Args:
@@ -274,7 +319,7 @@ class RoleService:
         Returns:
             List of permissions
         """
-        role = self.get_by_id(role_id, with_permissions=True)
+        role = await self.get_by_id(role_id, with_permissions=True)
         if not role:
             return []
 
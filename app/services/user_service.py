@@ -1,39 +1,122 @@
 """User service for business logic."""
 
+import hashlib
+import time
 from datetime import UTC, datetime
-from math import ceil
-
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload
-
-from app.core.security import hash_password, verify_password
-from app.models import RefreshToken, Role, RolePermission, User, UserRole, UserStatus
+from typing import Any
+
+from cachetools import TTLCache
+from sqlalchemy import ColumnElement, delete, func, inspect, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, make_transient_to_detached, selectinload
+
+from app.core.security import hash_password_async, verify_and_update_password_async
+from app.models import (
+    Permission,
+    RefreshToken,
+    Role,
+    RolePermission,
+    TeamMember,
+    User,
+    UserRole,
+    UserStatus,
+)
 from app.models.base import generate_cuid
 from app.schemas.user import RegisterRequest, UserCreate, UserUpdate
 
+# Access token -> (user ID, user column values, token exp) for authenticating
+# requests without a decode or query. Keyed by a digest so raw tokens aren't kept
+# in memory; only touched from the event loop, so no lock is needed. Values are an
+# immutable snapshot: each hit builds its own User, so requests never share an
+# instance (or one still attached to another request's session).
+_user_by_token: TTLCache[bytes, tuple[str, tuple[Any, ...], float]] = TTLCache(
+    maxsize=10_000, ttl=60
+)
+
+# User column attributes, in snapshot order
+_USER_COLUMNS: tuple[str, ...] = tuple(attr.key for attr in inspect(User).column_attrs)
+
+
+def _token_key(token: str) -> bytes:
+    """Cache key for an access token."""
+    return hashlib.blake2s(token.encode("utf-8")).digest()
+
+
+def get_cached_token_user(token: str) -> User | None:
+    """Get the user previously authenticated with an access token.
+
+    Args:
+        token: Raw access token
+
+    Returns:
+        A new detached User built from the cached column values, or None on a
+        miss or once the token has expired
+    """
+    entry = _user_by_token.get(_token_key(token))
+    if entry is None:
+        return None
+    _, values, expires_at = entry
+    if expires_at <= time.time():
+        return None
+    user = User(**dict(zip(_USER_COLUMNS, values, strict=True)))
+    # Detached with its identity key, as if loaded by a now-closed session
+    make_transient_to_detached(user)
+    return user
+
+
+def cache_token_user(token: str, user: User, expires_at: float) -> None:
+    """Remember the user an access token authenticated.
+
+    Only the user's column values are kept; the instance itself stays with the
+    request that loaded it.
+
+    Args:
+        token: Raw access token
+        user: Authenticated user (attributes must already be loaded)
+        expires_at: Token ``exp`` claim (epoch seconds)
+    """
+    values = tuple(getattr(user, key) for key in _USER_COLUMNS)
+    _user_by_token[_token_key(token)] = (user.id, values, expires_at)
+
+
+def invalidate_user_cache(user_id: str) -> None:
+    """Drop every cached access token entry for a user.
+
+    Called when the user's data or status changes so the next request reloads it.
+
+    Args:
+        user_id: User ID
+    """
+    for key, (cached_user_id, _, _) in list(_user_by_token.items()):
+        if cached_user_id == user_id:
+            _user_by_token.pop(key, None)
+
 
 class UserService:
     """User service for managing user operations."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """Initialize user service.
 
         Args:
-            db: Database session
+            db: Async database session
         """
         self.db = db
 
-    def get_by_id(self, user_id: str, with_roles: bool = False) -> User | None:
+    async def get_by_id(
+        self, user_id: str, with_roles: bool = False, with_teams: bool = False
+    ) -> User | None:
         """Get user by ID.
 
         Args:
             user_id: User ID
             with_roles: Whether to eager load roles
+            with_teams: Whether to eager load team memberships
 
         Returns:
             User or None if not found
         """
-        query = self.db.query(User).filter(User.id == user_id)
+        query = select(User).where(User.id == user_id)
         if with_roles:
             query = query.options(
                 joinedload(User.roles)
@@ -41,9 +124,59 @@ class UserService:
                 .joinedload(Role.permissions)
                 .joinedload(RolePermission.permission)
             )
-        return query.first()
+        if with_teams:
+            query = query.options(
+                selectinload(User.teams).joinedload(TeamMember.team),
+                selectinload(User.teams).joinedload(TeamMember.role),
+            )
+        result = await self.db.execute(query)
+        return result.unique().scalars().first()
+
+    async def get_roles_with_permissions(
+        self, user_id: str
+    ) -> list[tuple[str, str, str, list[str]]]:
+        """Get a user's roles with their permission actions in a single query.
 
-    def get_by_email(self, email: str) -> User | None:
+        Args:
+            user_id: User ID
+
+        Returns:
+            List of (role_id, name, label, permission_actions) tuples
+        """
+        actions = func.array_agg(Permission.action).filter(Permission.action.is_not(None))
+        result = await self.db.execute(
+            select(Role.id, Role.name, Role.label, actions)
+            .join(UserRole, UserRole.role_id == Role.id)
+            .outerjoin(RolePermission, RolePermission.role_id == Role.id)
+            .outerjoin(Permission, Permission.id == RolePermission.permission_id)
+            .where(UserRole.user_id == user_id)
+            .group_by(Role.id, Role.name, Role.label)
+            .order_by(Role.name)
+        )
+        return [
+            (role_id, name, label, list(permissions or []))
+            for role_id, name, label, permissions in result.all()
+        ]
+
+    async def get_permission_actions(self, user_id: str) -> set[str]:
+        """Get the permission actions granted to a user through their roles.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Set of permission action strings (e.g. "users:read", "users:*", "*")
+        """
+        result = await self.db.scalars(
+            select(Permission.action)
+            .distinct()
+            .join(RolePermission, RolePermission.permission_id == Permission.id)
+            .join(UserRole, UserRole.role_id == RolePermission.role_id)
+            .where(UserRole.user_id == user_id)
+        )
+        return set(result.all())
+
+    async def get_by_email(self, email: str) -> User | None:
         """Get user by email.
 
         Args:
@@ -52,9 +185,10 @@ class UserService:
         Returns:
             User or None if not found
         """
-        return self.db.query(User).filter(User.email == email).first()
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
 
-    def get_by_username(self, username: str) -> User | None:
+    async def get_by_username(self, username: str) -> User | None:
         """Get user by username.
 
         Args:
@@ -63,9 +197,10 @@ class UserService:
         Returns:
             User or None if not found
         """
-        return self.db.query(User).filter(User.username == username).first()
+        result = await self.db.execute(select(User).where(User.username == username))
+        return result.scalars().first()
 
-    def get_all(
+    async def get_all(
         self,
         page: int = 1,
         limit: int = 10,
@@ -85,12 +220,12 @@ class UserService:
         Returns:
             Tuple of (list of users, total count)
         """
-        query = self.db.query(User)
+        query = select(User)
 
         # Search filter
         if search:
             search_pattern = f"%{search}%"
-            query = query.filter(
+            query = query.where(
                 or_(
                     User.name.ilike(search_pattern),
                     User.username.ilike(search_pattern),
@@ -100,22 +235,23 @@ class UserService:
 
         # Status filter
         if status and status.lower() != "all":
-            query = query.filter(User.status == status.upper())
+            query = query.where(User.status == status.upper())
 
         # Role filter (requires join)
         if role and role.lower() != "all":
-            query = query.join(User.roles).join(UserRole.role).filter(Role.name == role)
+            query = query.join(User.roles).join(UserRole.role).where(Role.name == role)
 
         # Get total count before pagination
-        total = query.count()
+        total = await self.db.scalar(select(func.count()).select_from(query.subquery())) or 0
 
         # Apply pagination
         skip = (page - 1) * limit
-        users = query.offset(skip).limit(limit).all()
+        result = await self.db.execute(query.offset(skip).limit(limit))
+        users = list(result.scalars().all())
 
         return users, total
 
-    def create(
+    async def create(
         self,
         user_data: UserCreate | RegisterRequest,
         default_role_id: str | None = None,
@@ -133,7 +269,7 @@ class UserService:
             ValueError: If user with email/username already exists
         """
         # Check if email exists
-        existing_user = self.get_by_email(user_data.email)
+        existing_user = await self.get_by_email(user_data.email)
         if existing_user:
             raise ValueError("User with this email already exists")
 
@@ -145,19 +281,19 @@ class UserService:
             # Ensure uniqueness by appending random suffix if needed
             base_username = username
             counter = 1
-            while self.get_by_username(username):
+            while await self.get_by_username(username):
                 username = f"{base_username}{counter}"
                 counter += 1
 
         # Check if username exists
-        if self.get_by_username(username):
+        if await self.get_by_username(username):
             raise ValueError("User with this username already exists")
 
         # Generate cuid
         user_id = generate_cuid()
 
         # Hash password
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
 
         # Create user
         user = User(
@@ -172,19 +308,19 @@ class UserService:
         )
 
         self.db.add(user)
-        self.db.flush()  # Flush to get the ID before adding role
+        await self.db.flush()  # Flush to get the ID before adding role
 
         # Assign default role if provided
         if default_role_id:
             user_role = UserRole(user_id=user.id, role_id=default_role_id)
             self.db.add(user_role)
 
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
 
         return user
 
-    def update(self, user_id: str, user_data: UserUpdate) -> User | None:
+    async def update(self, user_id: str, user_data: UserUpdate) -> User | None:
         """Update user.
 
         Args:
@@ -194,27 +330,28 @@ class UserService:
         Returns:
             Updated user or None if not found
         """
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if not user:
             return None
+        invalidate_user_cache(user_id)
 
         # Update fields
         update_dict = user_data.model_dump(exclude_unset=True)
 
         # Hash password if provided
         if "password" in update_dict and update_dict["password"]:
-            update_dict["password"] = hash_password(update_dict["password"])
+            update_dict["password"] = await hash_password_async(update_dict["password"])
 
         for key, value in update_dict.items():
             if value is not None:
                 setattr(user, key, value)
 
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
 
         return user
 
-    def update_status(self, user_id: str, status: UserStatus) -> User | None:
+    async def update_status(self, user_id: str, status: UserStatus) -> User | None:
         """Update user status.
 
         Args:
@@ -224,28 +361,29 @@ class UserService:
         Returns:
             Updated user or None if not found
         """
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if not user:
             return None
+        invalidate_user_cache(user_id)
 
         user.status = status
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        await self.db.refresh(user)
 
         return user
 
-    def update_last_login(self, user_id: str) -> None:
+    async def update_last_login(self, user_id: str) -> None:
         """Update user's last login timestamp.
 
         Args:
             user_id: User ID
         """
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if user:
             user.last_login_at = datetime.now(UTC)
-            self.db.commit()
+            await self.db.commit()
 
-    def delete(self, user_id: str) -> bool:
+    async def delete(self, user_id: str) -> bool:
         """Delete user.
 
         Args:
@@ -254,16 +392,17 @@ class UserService:
         Returns:
             True if deleted, False if not found
         """
-        user = self.get_by_id(user_id)
+        user = await self.get_by_id(user_id)
         if not user:
             return False
+        invalidate_user_cache(user_id)
 
-        self.db.delete(user)
-        self.db.commit()
+        await self.db.delete(user)
+        await self.db.commit()
 
         return True
 
-    def batch_delete(self, user_ids: list[str]) -> int:
+    async def batch_delete(self, user_ids: list[str]) -> int:
         """Delete multiple users.
 
         Args:
@@ -272,15 +411,24 @@ class UserService:
         Returns:
             Number of users deleted
         """
-        deleted_count = (
-            self.db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+        deleted_ids = await self.db.scalars(
+            delete(User)
+            .where(User.id.in_(user_ids))
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
         )
-        self.db.commit()
-        return deleted_count
+        deleted = len(deleted_ids.all())
+        await self.db.commit()
+        for user_id in user_ids:
+            invalidate_user_cache(user_id)
+        return deleted
 
-    def verify_password(self, user: User, password: str) -> bool:
+    async def verify_password(self, user: User, password: str) -> bool:
         """Verify user password.
 
+        Legacy (bcrypt) hashes are rehashed with Argon2id on success; the new
+        hash is written with the session's next commit.
+
         Args:
             user: User object
             password: Plain text password
@@ -288,7 +436,10 @@ class UserService:
         Returns:
             True if password is correct, False otherwise
         """
-        return verify_password(password, user.password)
+        valid, new_hash = await verify_and_update_password_async(password, user.password)
+        if valid and new_hash:
+            user.password = new_hash
+        return valid
 
     def calculate_pagination(self, total: int, page: int, limit: int) -> dict[str, int]:
         """Calculate pagination metadata.
@@ -301,7 +452,7 @@ class UserService:
         Returns:
             Dictionary with pagination metadata
         """
-        total_pages = ceil(total / limit) if limit > 0 else 0
+        total_pages = (total + limit - 1) // limit if limit > 0 else 0
         return {
             "total": total,
             "page": page,
@@ -313,15 +464,44 @@ class UserService:
 class RefreshTokenService:
     """Service for managing refresh tokens."""
 
-    def __init__(self, db: Session) -> None:
+    def __init__(self, db: AsyncSession) -> None:
         """Initialize refresh token service.
 
         Args:
-            db: Database session
+            db: Async database session
         """
         self.db = db
 
-    def create(self, user_id: str, token: str, expires_at: datetime) -> RefreshToken:
+    def _hash_token(self, token: str) -> str:
+        """Hash the token using SHA-256.
+
+        Only the digest is stored, so lookups compare a fixed 64-character key
+        instead of the full JWT and raw tokens are never kept at rest.
+
+        Args:
+            token: Raw refresh token string
+
+        Returns:
+            Hexadecimal hash of the token
+        """
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _token_match(self, token: str) -> ColumnElement[bool]:
+        """Build the lookup condition for a refresh token.
+
+        Rows written before tokens were hashed still hold the raw JWT, so both
+        the digest and the raw value are matched; ``rotate`` replaces a raw row
+        with the digest the next time that session refreshes.
+
+        Args:
+            token: Raw refresh token string
+
+        Returns:
+            SQL condition matching the stored token
+        """
+        return RefreshToken.token.in_((self._hash_token(token), token))
+
+    async def create(self, user_id: str, token: str, expires_at: datetime) -> RefreshToken:
         """Create a new refresh token.
 
         Args:
@@ -335,17 +515,17 @@ class RefreshTokenService:
         refresh_token = RefreshToken(
             id=generate_cuid(),
             user_id=user_id,
-            token=token,
+            token=self._hash_token(token),
             expires_at=expires_at,
         )
 
         self.db.add(refresh_token)
-        self.db.commit()
-        self.db.refresh(refresh_token)
+        await self.db.commit()
+        await self.db.refresh(refresh_token)
 
         return refresh_token
 
-    def get_by_token(self, token: str) -> RefreshToken | None:
+    async def get_by_token(self, token: str) -> RefreshToken | None:
         """Get refresh token by token string.
 
         Args:
@@ -354,9 +534,27 @@ class RefreshTokenService:
         Returns:
             RefreshToken or None if not found
         """
-        return self.db.query(RefreshToken).filter(RefreshToken.token == token).first()
+        result = await self.db.execute(select(RefreshToken).where(self._token_match(token)))
+        return result.scalars().first()
+
+    async def get_with_user(self, token: str) -> tuple[RefreshToken, User] | None:
+        """Get refresh token and its user in a single query.
+
+        Args:
+            token: Refresh token string
+
+        Returns:
+            Tuple of (RefreshToken, User) or None if not found
+        """
+        result = await self.db.execute(
+            select(RefreshToken, User)
+            .join(User, User.id == RefreshToken.user_id)
+            .where(self._token_match(token))
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else None
 
-    def delete(self, token: str) -> bool:
+    async def delete(self, token: str) -> bool:
         """Delete refresh token.
 
         Args:
@@ -365,16 +563,17 @@ class RefreshTokenService:
         Returns:
             True if deleted, False if not found
         """
-        refresh_token = self.get_by_token(token)
-        if not refresh_token:
-            return False
-
-        self.db.delete(refresh_token)
-        self.db.commit()
+        deleted = await self.db.scalar(
+            delete(RefreshToken)
+            .where(self._token_match(token))
+            .returning(RefreshToken.id)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
 
-        return True
+        return deleted is not None
 
-    def delete_all_for_user(self, user_id: str) -> int:
+    async def delete_all_for_user(self, user_id: str) -> int:
         """Delete all refresh tokens for a user.
 
         Args:
@@ -383,13 +582,15 @@ class RefreshTokenService:
         Returns:
             Number of tokens deleted
         """
-        deleted_count = (
-            self.db.query(RefreshToken)
-            .filter(RefreshToken.user_id == user_id)
-            .delete(synchronize_session=False)
+        deleted_ids = await self.db.scalars(
+            delete(RefreshToken)
+            .where(RefreshToken.user_id == user_id)
+            .returning(RefreshToken.id)
+            .execution_options(synchronize_session=False)
         )
-        self.db.commit()
-        return deleted_count
+        deleted = len(deleted_ids.all())
+        await self.db.commit()
+        return deleted
 
     def is_valid(self, refresh_token: RefreshToken) -> bool:
         """Check if refresh token is valid (not expired).
@@ -402,10 +603,13 @@ class RefreshTokenService:
         """
         return refresh_token.expires_at > datetime.now(UTC)
 
-    def rotate(
+    async def rotate(
         self, old_token: str, user_id: str, new_token: str, expires_at: datetime
     ) -> RefreshToken | None:
-        """Rotate refresh token (delete old, create new).
+        """Rotate refresh token (replace old with new in place).
+
+        The stored row is swapped to the new token with a single UPDATE, so the
+        old token stops working in the same statement that issues the new one.
 
         Args:
             old_token: Old refresh token string
@@ -416,9 +620,20 @@ class RefreshTokenService:
         Returns:
             New RefreshToken or None if old token not found
         """
-        # Delete old token
-        if not self.delete(old_token):
-            return None
+        result = await self.db.scalars(
+            update(RefreshToken)
+            .where(
+                self._token_match(old_token),
+                RefreshToken.user_id == user_id,
+            )
+            .values(
+                token=self._hash_token(new_token),
+                expires_at=expires_at,
+                created_at=func.now(),
+            )
+            .returning(RefreshToken)
+        )
+        refresh_token = result.first()
+        await self.db.commit()
 
-        # Create new token
-        return self.create(user_id, new_token, expires_at)
+        return refresh_token
@@ -0,0 +1,145 @@
+"""Calendar route tests."""
+
+from collections.abc import Generator
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api.deps import get_current_active_user
+from app.core.database import get_db
+from app.main import app
+from app.models import CalendarEvent, EventAttendee, User
+from app.models.base import Base
+
+
+@pytest.fixture
+def db() -> Generator[Session, None, None]:
+    """Create an in-memory database with the calendar tables."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        engine,
+        tables=[User.__table__, CalendarEvent.__table__, EventAttendee.__table__],
+    )
+    session = sessionmaker(bind=engine, autoflush=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def owner(db: Session) -> User:
+    """Create the user the requests are made as, with a second user to invite."""
+    user = User(
+        id="cowner000000000000000000001",
+        email="owner@example.com",
+        username="owner",
+        password="x",
+        name="Owner",
+        status="ACTIVE",
+    )
+    guest = User(
+        id="cguest000000000000000000001",
+        email="guest@example.com",
+        username="guest",
+        password="x",
+        name="Guest",
+        status="ACTIVE",
+    )
+    db.add_all([user, guest])
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client(db: Session, owner: User) -> Generator[TestClient, None, None]:
+    """Create a test client bound to the in-memory database and owner."""
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: owner
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+def _add_event(db: Session, event_id: str, start: datetime, end: datetime) -> None:
+    db.add(
+        CalendarEvent(
+            id=event_id,
+            title=event_id,
+            start_at=start,
+            end_at=end,
+            type="meeting",
+            all_day=False,
+            owner_id="cowner000000000000000000001",
+        )
+    )
+
+
+def test_list_events_filters_orders_and_includes_attendees(client: TestClient, db: Session) -> None:
+    """Test events are listed in start order, range-filtered, with attendees."""
+    _add_event(db, "late", datetime(2024, 1, 3, 9), datetime(2024, 1, 3, 10))
+    _add_event(db, "early", datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10))
+    _add_event(db, "outside", datetime(2024, 2, 1, 9), datetime(2024, 2, 1, 10))
+    db.add(EventAttendee(event_id="early", user_id="cguest000000000000000000001", status="PENDING"))
+    db.commit()
+
+    response = client.get(
+        "/api/calendar/events",
+        params={"start": "2024-01-01T00:00:00", "end": "2024-01-31T00:00:00"},
+    )
+
+    assert response.status_code == 200
+    events = response.json()["data"]
+    assert [event["id"] for event in events] == ["early", "late"]
+    assert events[0]["isAllDay"] is False
+    assert events[0]["organizer"]["id"] == "cowner000000000000000000001"
+    assert events[0]["attendees"] == [
+        {
+            "id": "cguest000000000000000000001",
+            "user": {
+                "id": "cguest000000000000000000001",
+                "email": "guest@example.com",
+                "name": "Guest",
+                "avatar": None,
+            },
+            "status": "PENDING",
+        }
+    ]
+    assert events[1]["attendees"] == []
+
+
+def test_list_events_empty(client: TestClient) -> None:
+    """Test a calendar without events returns an empty list."""
+    response = client.get("/api/calendar/events")
+    assert response.status_code == 200
+    assert response.json() == {"data": []}
+
+
+def test_update_and_reschedule_event(client: TestClient, db: Session) -> None:
+    """Test update and reschedule write the mapped columns of owned events."""
+    _add_event(db, "event", datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 10))
+    db.commit()
+
+    response = client.put("/api/calendar/events/event", json={"title": "Renamed", "isAllDay": True})
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.json()["isAllDay"] is True
+
+    response = client.patch(
+        "/api/calendar/events/event/reschedule",
+        json={"startTime": "2024-01-02T09:00:00", "endTime": "2024-01-02T11:00:00"},
+    )
+    assert response.status_code == 200
+    assert response.json()["startTime"].startswith("2024-01-02T09:00:00")
+    assert response.json()["endTime"].startswith("2024-01-02T11:00:00")
+
+    response = client.put("/api/calendar/events/missing", json={"title": "x"})
+    assert response.status_code == 404
@@ -0,0 +1,32 @@
+"""File route helper tests."""
+
+import base64
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.files import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip() -> None:
+    """Test a cursor decodes back to the sort key it was built from."""
+    updated_at = datetime(2024, 5, 1, 12, 30, 45, 123456, tzinfo=UTC)
+    cursor = _encode_cursor(updated_at, "cfile0000000000000000000001")
+    assert _decode_cursor(cursor) == (updated_at, "cfile0000000000000000000001")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"no-separator").decode(),
+        base64.urlsafe_b64encode(b"not-a-date|cfile0000000000000000000001").decode(),
+        base64.urlsafe_b64encode(b"\xff\xfe|x").decode(),
+    ],
+)
+def test_decode_cursor_rejects_malformed_cursor(cursor: str) -> None:
+    """Test malformed cursors are rejected with a 400."""
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,34 @@
+"""Folder tree tests."""
+
+from app.api.folders import FolderTreeNode, _build_folder_tree
+from app.models import Folder
+
+
+def _folder(folder_id: str, parent_id: str | None = None) -> Folder:
+    return Folder(id=folder_id, name=folder_id, parent_id=parent_id)
+
+
+def _shape(nodes: list[FolderTreeNode]) -> list[tuple[str, list]]:
+    return [(node.id, _shape(node.children)) for node in nodes]
+
+
+def test_build_folder_tree_nests_children_in_input_order() -> None:
+    """Test nesting at any depth, with children listed before their parents."""
+    folders = [
+        _folder("a1", "a"),
+        _folder("a"),
+        _folder("a2", "a"),
+        _folder("a1x", "a1"),
+        _folder("b"),
+    ]
+    assert _shape(_build_folder_tree(folders)) == [
+        ("a", [("a1", [("a1x", [])]), ("a2", [])]),
+        ("b", []),
+    ]
+
+
+def test_build_folder_tree_drops_folders_with_missing_parents() -> None:
+    """Test folders whose parent isn't in the list are left out with their subtree."""
+    folders = [_folder("root"), _folder("orphan", "gone"), _folder("child", "orphan")]
+    assert _shape(_build_folder_tree(folders)) == [("root", [])]
+    assert _build_folder_tree([]) == []
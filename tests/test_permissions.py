@@ -0,0 +1,19 @@
+"""Permission matching tests."""
+
+from app.api.deps import PermissionSet, has_permission
+
+
+def test_permission_set_matches_exact_and_wildcards() -> None:
+    """Test exact, resource wildcard and full wildcard permissions."""
+    permissions = PermissionSet({"users:read", "documents:*"})
+    assert permissions.allows("users:read")
+    assert not permissions.allows("users:delete")
+    assert permissions.allows("documents:delete")
+    assert not permissions.allows("documents")
+    assert PermissionSet({"*"}).allows("anything:at-all")
+
+
+def test_has_permission_accepts_plain_sets() -> None:
+    """Test has_permission keeps working with a plain set of strings."""
+    assert has_permission({"users:*"}, "users:update")
+    assert not has_permission(set(), "users:read")
@@ -0,0 +1,42 @@
+"""Response construction tests."""
+
+from datetime import UTC, datetime
+
+from app.api.roles import _build_role_response
+from app.models import Permission, Role, RolePermission
+from app.schemas.role import PermissionResponse, RoleWithPermissionsResponse
+
+
+def test_permission_response_from_orm_model_matches_validation() -> None:
+    """Test the unvalidated permission response matches a validated one."""
+    permission = Permission(id="cpermission0000000000000001", action="users:read")
+    response = PermissionResponse.from_orm_model(permission)
+    validated = PermissionResponse(id=permission.id, name="users:read", description=None)
+    assert response.model_dump_json() == validated.model_dump_json()
+
+
+def test_build_role_response_matches_validation() -> None:
+    """Test the unvalidated role response serializes like a validated one."""
+    permission = Permission(id="cpermission0000000000000001", action="users:read")
+    role = Role(
+        id="crole00000000000000000001",
+        name="admin",
+        label="Admin",
+        description=None,
+        created_at=datetime(2024, 1, 1, tzinfo=UTC),
+    )
+    role.permissions.append(RolePermission(role_id=role.id, permission=permission))
+
+    response = _build_role_response(role, user_count=3)
+    validated = RoleWithPermissionsResponse.model_validate(
+        {
+            "id": role.id,
+            "name": "admin",
+            "label": "Admin",
+            "description": None,
+            "created_at": role.created_at,
+            "permissions": [{"id": permission.id, "name": "users:read", "description": None}],
+            "userCount": 3,
+        }
+    )
+    assert response.model_dump_json() == validated.model_dump_json()
@@ -0,0 +1,50 @@
+"""Security utility tests."""
+
+from datetime import UTC, datetime, timedelta
+
+from jose import jwt
+
+from app.core.config import settings
+from app.core.security import (
+    _encode_jwt,
+    _refresh_payloads,
+    create_refresh_token,
+    decode_refresh_token_cached,
+    hash_password,
+    verify_and_update_password,
+)
+
+
+def test_hash_password_uses_argon2id() -> None:
+    """Test new hashes are Argon2id and verify without needing an update."""
+    hashed = hash_password("s3cret-password")
+    assert hashed.startswith("$argon2id$")
+    assert verify_and_update_password("s3cret-password", hashed) == (True, None)
+    assert verify_and_update_password("wrong-password", hashed) == (False, None)
+
+
+def test_decode_refresh_token_cached_returns_payload() -> None:
+    """Test a valid refresh token decodes to its claims on repeated calls."""
+    token = create_refresh_token({"sub": "user-1"})
+    first = decode_refresh_token_cached(token)
+    second = decode_refresh_token_cached(token)
+    assert first is not None and second is not None
+    assert first == second and first is not second
+    assert first["sub"] == "user-1"
+
+    first["sub"] = "tampered"
+    assert decode_refresh_token_cached(token) == second
+    assert token not in _refresh_payloads
+
+
+def test_decode_refresh_token_cached_rejects_expired() -> None:
+    """Test an expired refresh token is rejected."""
+    token = create_refresh_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-1))
+    assert decode_refresh_token_cached(token) is None
+
+
+def test_encode_jwt_matches_jose() -> None:
+    """Test the HMAC fast path produces the same token as python-jose."""
+    claims = {"sub": "user-1", "exp": datetime(2030, 1, 1, tzinfo=UTC), "type": "access"}
+    expected = jwt.encode(claims, "secret", algorithm=settings.JWT_ALGORITHM)
+    assert _encode_jwt(claims, "secret") == expected
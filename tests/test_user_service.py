@@ -0,0 +1,59 @@
+"""User service cache tests."""
+
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import RefreshToken, User
+from app.models.base import Base
+from app.services.user_service import (
+    RefreshTokenService,
+    cache_token_user,
+    get_cached_token_user,
+    invalidate_user_cache,
+)
+
+
+def test_cached_token_user_is_a_new_detached_instance_per_hit() -> None:
+    """Test cache hits never hand out the cached or a shared User instance."""
+    user = User(id="cuser0000000000000000000001", email="a@example.com", name="A")
+    cache_token_user("token", user, time.time() + 60)
+    user.name = "changed after caching"
+
+    first = get_cached_token_user("token")
+    second = get_cached_token_user("token")
+
+    assert first is not None and second is not None
+    assert first is not user and first is not second
+    assert (first.id, first.email, first.name) == (user.id, "a@example.com", "A")
+    assert inspect(first).detached
+
+    invalidate_user_cache(user.id)
+    assert get_cached_token_user("token") is None
+
+
+async def test_refresh_token_stored_raw_is_found_and_rotated_to_digest() -> None:
+    """Test a token row written before hashing still works and is upgraded on rotation."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all, tables=[User.__table__, RefreshToken.__table__]
+        )
+    expires_at = datetime.now(UTC) + timedelta(days=1)
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        db.add(User(id="u1", email="a@example.com", username="a", password="x", name="A"))
+        db.add(RefreshToken(id="t1", user_id="u1", token="legacy-raw", expires_at=expires_at))
+        await db.commit()
+        service = RefreshTokenService(db)
+
+        row = await service.get_with_user("legacy-raw")
+        assert row is not None and row[0].id == "t1"
+
+        assert await service.rotate("legacy-raw", "u1", "fresh", expires_at) is not None
+        stored = await db.scalar(select(RefreshToken.token).where(RefreshToken.id == "t1"))
+        assert stored == service._hash_token("fresh")
+        assert await service.get_by_token("legacy-raw") is None
+        assert await service.get_by_token("fresh") is not None
+    await engine.dispose()